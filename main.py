@@ -3,13 +3,12 @@ from asyncio.exceptions import CancelledError
 from contextlib import suppress
 from sys import argv
 
-from source import Settings
-from source import XHS
-from source import XHSDownloader
-from source import cli
+# 各运行模式仅导入所需模块，减少启动耗时
 
 
 async def app():
+    from source import XHSDownloader
+
     async with XHSDownloader() as xhs:
         await xhs.run_async()
 
@@ -19,6 +18,8 @@ async def api_server(
     port=5556,
     log_level="info",
 ):
+    from source import XHS, Settings
+
     async with XHS(**Settings().run()) as xhs:
         await xhs.run_api_server(
             host,
@@ -33,6 +34,8 @@ async def mcp_server(
     port=5556,
     log_level="INFO",
 ):
+    from source import XHS, Settings
+
     async with XHS(**Settings().run()) as xhs:
         await xhs.run_mcp_server(
             transport=transport,
@@ -56,4 +59,6 @@ if __name__ == "__main__":
             run(mcp_server())
             # run(mcp_server("stdio"))
         else:
+            from source import cli
+
             cli()
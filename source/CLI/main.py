@@ -42,6 +42,8 @@ class CLI:
         self.ctx = ctx
         self.url = ctx.params.pop("url")
         self.index = self.__format_index(ctx.params.pop("index"))
+        self.batch = ctx.params.pop("batch_file")
+        self.prune = ctx.params.pop("prune_folders")
         self.path = ctx.params.pop("settings")
         self.update = ctx.params.pop("update_settings")
         self.settings = Settings(self.__check_settings_path())
@@ -62,6 +64,10 @@ class CLI:
     async def run(self):
         if self.url:
             await self.APP.extract_cli(self.url, index=self.index)
+        if self.batch:
+            await self.APP.extract_batch(Root(self.batch), index=self.index)
+        if self.prune:
+            self.APP.manager.sweep_directories()
         self.__update_settings()
 
     def __update_settings(self):
@@ -126,6 +132,17 @@ class CLI:
 
         options = (
             ("--url", "-u", "str", _("小红书作品链接，多个链接使用空格分隔")),
+            (
+                "--batch_file",
+                "-bf",
+                "str",
+                fill(
+                    _(
+                        "从文本文件逐行读取作品链接并下载，处理进度保存至同目录的 .journal.db 文件，中断后再次运行将从中断位置继续"
+                    ),
+                    width=55,
+                ),
+            ),
             (
                 "--index",
                 "-i",
@@ -142,7 +159,7 @@ class CLI:
             ("--name_format", "-nf", "str", _("作品文件名称格式")),
             ("--user_agent", "-ua", "str", "User-Agent"),
             ("--cookie", "-ck", "str", _("小红书网页版 Cookie，无需登录")),
-            ("--proxy", "-p", "str", _("网络代理")),
+            ("--proxy", "-p", "str", _("网络代理，多个代理使用空格分隔")),
             ("--timeout", "-t", "int", _("请求数据超时限制，单位：秒")),
             (
                 "--chunk",
@@ -205,6 +222,17 @@ class CLI:
                 ),
             ),
             ("--update_settings", "-us", "flag", _("是否更新配置文件")),
+            (
+                "--prune_folders",
+                "-pf",
+                "flag",
+                fill(
+                    _(
+                        "遍历数据文件夹并删除全部空文件夹，文件数量较多时耗时较长；默认仅清理本次运行期间使用过的文件夹"
+                    ),
+                    width=55,
+                ),
+            ),
             ("--help", "-h", "flag", _("查看详细参数说明")),
             ("--version", "-v", "flag", _("查看 XHS-Downloader 版本")),
         )
@@ -227,6 +255,11 @@ class CLI:
     "--url",
     "-u",
 )
+@option(
+    "--batch_file",
+    "-bf",
+    type=Path(exists=True, dir_okay=False),
+)
 @option(
     "--index",
     "-i",
@@ -331,6 +364,11 @@ class CLI:
     type=bool,
     is_flag=True,
 )
+@option(
+    "--prune_folders",
+    "-pf",
+    is_flag=True,
+)
 @option(
     "-h",
     "--help",
@@ -72,7 +72,6 @@ class XHSDownloader(App):
 
     async def refresh_screen(self):
         await self.action_back()
-        await self.close_database()
         await self.APP.close()
         self.__initialization()
         await self.__aenter__()
@@ -117,9 +116,3 @@ class XHSDownloader(App):
             ),
             callback=self.update_result,
         )
-
-    async def close_database(self):
-        await self.APP.id_recorder.cursor.close()
-        await self.APP.id_recorder.database.close()
-        await self.APP.data_recorder.cursor.close()
-        await self.APP.data_recorder.database.close()
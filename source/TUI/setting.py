@@ -79,7 +79,7 @@ class Setting(Screen):
                 classes="params",
             ),
             Input(
-                self.data["proxy"],
+                self.__proxy_text(),
                 placeholder=_("不使用代理"),
                 valid_empty=True,
                 id="proxy",
@@ -217,20 +217,42 @@ class Setting(Screen):
             return _("小红书网页版 Cookie，无需登录，参数已设置")
         return _("小红书网页版 Cookie，无需登录，参数未设置")
 
+    def __proxy_text(self) -> str:
+        """多个代理以空格分隔显示"""
+        match proxy := self.data["proxy"]:
+            case str():
+                return proxy
+            case list() | tuple():
+                return " ".join(i for i in proxy if isinstance(i, str))
+            case dict():
+                return " ".join(i for i in proxy.values() if isinstance(i, str))
+        return ""
+
+    def __proxy_value(self) -> str | list | dict | None:
+        """未修改时保留原设置，原设置为多个代理时以列表格式保存"""
+        if not (value := self.query_one("#proxy").value.strip()):
+            return None
+        if value == self.__proxy_text():
+            return self.data["proxy"]
+        if isinstance(self.data["proxy"], (list, tuple, dict)):
+            return value.split()
+        return value
+
     def on_mount(self) -> None:
         self.title = _("程序设置")
 
     @on(Button.Pressed, "#save")
     def save_settings(self):
         self.dismiss(
-            {
+            self.data
+            | {
                 "mapping_data": self.data.get("mapping_data", {}),
                 "work_path": self.query_one("#work_path").value,
                 "folder_name": self.query_one("#folder_name").value,
                 "name_format": self.query_one("#name_format").value,
                 "user_agent": self.query_one("#user_agent").value,
                 "cookie": self.query_one("#cookie").value or self.data["cookie"],
-                "proxy": self.query_one("#proxy").value or None,
+                "proxy": self.__proxy_value(),
                 "timeout": int(self.query_one("#timeout").value),
                 "chunk": int(self.query_one("#chunk").value),
                 "max_retry": int(self.query_one("#max_retry").value),
@@ -1,7 +1,11 @@
-from .CLI import cli
-from .TUI import XHSDownloader
-from .application import XHS
-from .module import Settings
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .CLI import cli
+    from .TUI import XHSDownloader
+    from .application import XHS
+    from .module import Settings
 
 __all__ = [
     "XHS",
@@ -9,3 +13,19 @@ __all__ = [
     "cli",
     "Settings",
 ]
+
+# 按需导入各入口，避免命令行、API 与 MCP 模式加载未使用的前端依赖
+__MODULES = {
+    "XHS": ".application",
+    "XHSDownloader": ".TUI",
+    "cli": ".CLI",
+    "Settings": ".module",
+}
+
+
+def __getattr__(name: str):
+    if module := __MODULES.get(name):
+        value = getattr(import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
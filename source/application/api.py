@@ -0,0 +1,360 @@
+from os import getenv
+from textwrap import dedent
+from typing import TYPE_CHECKING, Annotated, AsyncIterator
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import RedirectResponse, StreamingResponse
+from pydantic import Field
+from uvicorn import Config, Server
+
+from ..module import (
+    __VERSION__,
+    REPOSITORY,
+    BatchData,
+    BatchParams,
+    ExtractData,
+    ExtractParams,
+    JobData,
+)
+from ..translation import _
+from .jobs import JobManager
+
+if TYPE_CHECKING:
+    from .app import XHS
+
+__all__ = ["APIServer"]
+
+
+class APIServer:
+    """Web API 服务，仅在 API 模式下导入 FastAPI 与 uvicorn"""
+
+    def __init__(self, core: "XHS"):
+        self.core = core
+        if not core.jobs:
+            core.jobs = JobManager(core)
+
+    async def run(
+        self,
+        host="0.0.0.0",
+        port=5556,
+        log_level="info",
+    ):
+        api = FastAPI(
+            debug=self.core.VERSION_BETA,
+            title="XHS-Downloader",
+            version=__VERSION__,
+        )
+        self.setup_routes(api)
+        config = Config(
+            api,
+            host=host,
+            port=port,
+            log_level=log_level,
+        )
+        server = Server(config)
+        await server.serve()
+
+    def setup_routes(
+        self,
+        server: FastAPI,
+    ):
+        @server.get(
+            "/",
+            summary=_("跳转至项目 GitHub 仓库"),
+            description=_("重定向至项目 GitHub 仓库主页"),
+            tags=["API"],
+        )
+        async def index():
+            return RedirectResponse(url=REPOSITORY)
+
+        @server.post(
+            "/xhs/detail",
+            summary=_("获取作品数据及下载地址"),
+            description=_(
+                dedent("""
+                **参数**:
+
+                - **url**: 小红书作品链接，自动提取，不支持多链接；必需参数
+                - **download**: 是否下载作品文件；设置为 true 将会耗费更多时间；可选参数
+                - **index**: 下载指定序号的图片文件，仅对图文作品生效；download 参数设置为 false 时不生效；可选参数
+                - **cookie**: 请求数据时使用的 Cookie；可选参数
+                - **proxy**: 请求数据时使用的代理；可选参数
+                - **skip**: 是否跳过存在下载记录的作品；设置为 true 将不会返回存在下载记录的作品数据；可选参数
+                """)
+            ),
+            tags=["API"],
+            response_model=ExtractData,
+        )
+        async def handle(extract: ExtractParams):
+            import time
+            from .request_logger import log_request
+
+            start_time = time.time()
+            data = None
+            error_msg = None
+            # 记录原始 URL 用于调试
+            original_url = extract.url
+            url = await self.core.extract_links(
+                extract.url,
+            )
+            if not url:
+                # 提供更详细的错误信息
+                msg = _("提取小红书作品链接失败: {0}").format(
+                    original_url[:100] if original_url else "URL为空"
+                )
+                error_msg = (
+                    f"提取链接失败: {original_url[:100] if original_url else 'URL为空'}"
+                )
+            else:
+                try:
+                    result = await self.core._deal_extract(
+                        url[0],
+                        extract.download,
+                        extract.index,
+                        not extract.skip,
+                        extract.cookie,
+                        extract.proxy,
+                    )
+                    if (
+                        result
+                        and isinstance(result, dict)
+                        and result.get("error") == "404"
+                    ):
+                        # 明确返回404错误信息
+                        msg = result.get("message", _("笔记不存在或已被删除（404）"))
+                        data = None
+                        error_msg = "404 - 笔记不存在"
+                    elif result:
+                        msg = _("获取小红书作品数据成功")
+                        data = result
+                    else:
+                        msg = _("获取小红书作品数据失败")
+                        error_msg = "获取数据失败"
+                except Exception as e:
+                    msg = _("获取小红书作品数据失败")
+                    error_msg = str(e)
+                    raise
+
+            duration_ms = (time.time() - start_time) * 1000
+
+            # 记录日志
+            log_request(
+                endpoint="/xhs/detail",
+                request_data={
+                    "url": extract.url,
+                    "download": extract.download,
+                    "index": extract.index,
+                    "skip": extract.skip,
+                    "has_cookie": bool(extract.cookie),
+                    "has_proxy": bool(extract.proxy),
+                },
+                response_data={
+                    "message": msg,
+                    "has_data": data is not None,
+                    "data_keys": list(data.keys()) if isinstance(data, dict) else None,
+                }
+                if data
+                else None,
+                error=error_msg,
+                duration_ms=duration_ms,
+            )
+
+            return ExtractData(message=msg, params=extract, data=data)
+
+        @server.post(
+            "/xhs/stream",
+            summary=_("流式获取多个作品数据及下载地址"),
+            description=_(
+                dedent("""
+                **参数**:
+
+                - **url**: 小红书作品链接，自动提取，支持多链接；必需参数
+                - **download**: 是否下载作品文件；可选参数
+                - **index**: 下载指定序号的图片文件，仅对图文作品生效；download 参数设置为 false 时不生效；可选参数
+                - **cookie**: 请求数据时使用的 Cookie；可选参数
+                - **proxy**: 请求数据时使用的代理；可选参数
+                - **skip**: 是否跳过存在下载记录的作品；可选参数
+
+                每个作品处理完成后立即返回一条 ExtractData 数据，按处理完成顺序返回；
+                请求头 Accept 包含 text/event-stream 时返回 Server-Sent Events，否则返回 NDJSON
+                """)
+            ),
+            tags=["API"],
+        )
+        async def stream(extract: ExtractParams, request: Request):
+            sse = "text/event-stream" in request.headers.get("accept", "")
+            return StreamingResponse(
+                self.__stream_extract(extract, sse),
+                media_type="text/event-stream" if sse else "application/x-ndjson",
+            )
+
+        @server.post(
+            "/xhs/batch",
+            summary=_("创建批量处理任务"),
+            description=_(
+                dedent("""
+                **参数**:
+
+                - **urls**: 小红书作品链接列表，每项自动提取链接，支持多链接；必需参数
+                - **download**: 是否下载作品文件；可选参数
+                - **index**: 下载指定序号的图片文件，仅对图文作品生效；download 参数设置为 false 时不生效；可选参数
+                - **cookie**: 请求数据时使用的 Cookie；可选参数
+                - **proxy**: 请求数据时使用的代理；可选参数
+                - **skip**: 是否跳过存在下载记录的作品；可选参数
+
+                任务在后台处理，立即返回任务 ID，通过 /xhs/jobs/{job_id} 查询处理进度与结果
+                """)
+            ),
+            tags=["API"],
+            response_model=BatchData,
+        )
+        async def batch(params: BatchParams):
+            if job := self.core.jobs.submit(params):
+                return BatchData(
+                    message=_("批量处理任务创建成功"),
+                    params=params,
+                    data=job.dump(False),
+                )
+            return BatchData(
+                message=_("提取小红书作品链接失败"),
+                params=params,
+                data=None,
+            )
+
+        @server.get(
+            "/xhs/jobs/{job_id}",
+            summary=_("查询批量处理任务"),
+            description=_("返回任务状态、各状态作品数量与每个作品的处理结果"),
+            tags=["API"],
+            response_model=JobData,
+        )
+        async def get_job(job_id: str):
+            if job := self.core.jobs.get(job_id):
+                return job.dump()
+            raise HTTPException(status_code=404, detail=_("任务不存在"))
+
+        @server.post(
+            "/xhs/jobs/{job_id}/cancel",
+            summary=_("取消批量处理任务"),
+            description=_(
+                "取消尚未处理的作品并中断正在处理的作品，已完成的结果会被保留"
+            ),
+            tags=["API"],
+            response_model=JobData,
+        )
+        async def cancel_job(job_id: str):
+            if job := self.core.jobs.cancel(job_id):
+                return job.dump(False)
+            raise HTTPException(status_code=404, detail=_("任务不存在"))
+
+        @server.get(
+            "/xhs/cache",
+            summary=_("查询作品详情缓存统计"),
+            description=_("返回作品详情缓存的命中次数、未命中次数与内存缓存数量"),
+            tags=["API"],
+        )
+        async def cache_statistics():
+            return self.core.detail_cache.statistics()
+
+        @server.get(
+            "/xhs/proxy",
+            summary=_("查询代理状态"),
+            description=_("返回代理池中各代理的状态、延迟、错误率与最近一次测试结果"),
+            tags=["API"],
+        )
+        async def proxy_state():
+            return self.core.manager.proxy_statistics()
+
+        @server.get(
+            "/xhs/cookie",
+            summary=_("查询 Cookie 状态"),
+            description=_(
+                "返回 Cookie 池中各 Cookie 的摘要、状态、连续失败次数与请求次数"
+            ),
+            tags=["API"],
+        )
+        async def cookie_state():
+            return self.core.manager.cookie_pool.statistics()
+
+        @server.get(
+            "/internal-logs",
+            summary=_("获取请求日志"),
+            description=_("获取API请求日志记录"),
+            tags=["API"],
+        )
+        async def get_logs(
+            request: Request,
+            limit: Annotated[int, Field(default=50, ge=1, le=100)] = 50,
+            offset: Annotated[int, Field(default=0, ge=0)] = 0,
+        ):
+            # 检查内部调用密钥（用于绕过 Vercel 预览部署的身份验证）
+            # 如果未配置密钥，则允许所有请求（向后兼容）
+            internal_key = getenv("XHS_INTERNAL_API_KEY", "")
+            if internal_key:
+                auth_header = request.headers.get("x-internal-api-key", "")
+                if auth_header != internal_key:
+                    raise HTTPException(
+                        status_code=403, detail="Invalid internal API key"
+                    )
+
+            from .request_logger import get_logs
+
+            logs, total = get_logs(limit=limit, offset=offset)
+            return {
+                "items": logs,
+                "total": total,
+                "limit": limit,
+                "offset": offset,
+            }
+
+        @server.delete(
+            "/internal-logs",
+            summary=_("清空请求日志"),
+            description=_("清空所有API请求日志记录"),
+            tags=["API"],
+        )
+        async def clear_logs(request: Request):
+            # 检查内部调用密钥
+            internal_key = getenv("XHS_INTERNAL_API_KEY", "")
+            if internal_key:
+                auth_header = request.headers.get("x-internal-api-key", "")
+                if auth_header != internal_key:
+                    raise HTTPException(
+                        status_code=403, detail="Invalid internal API key"
+                    )
+
+            from .request_logger import clear_logs
+
+            success = clear_logs()
+            return {
+                "success": success,
+                "message": _("日志已清空") if success else _("清空日志失败"),
+            }
+
+    async def __stream_extract(
+        self,
+        extract: ExtractParams,
+        sse: bool,
+    ) -> AsyncIterator[str]:
+        async for result in self.core.extract_stream(
+            extract.url,
+            extract.download,
+            extract.index,
+            not extract.skip,
+            extract.cookie,
+            extract.proxy,
+        ):
+            if "作品ID" in result:
+                item = ExtractData(
+                    message=_("获取小红书作品数据成功"),
+                    params=extract,
+                    data=result,
+                )
+            else:
+                item = ExtractData(
+                    message=result.get("message") or _("获取小红书作品数据失败"),
+                    params=extract,
+                    data=None,
+                )
+            item = item.model_dump_json()
+            yield f"data: {item}\n\n" if sse else f"{item}\n"
@@ -2,6 +2,7 @@ from asyncio import (
     Event,
     Queue,
     QueueEmpty,
+    Semaphore,
     create_task,
     gather,
     sleep,
@@ -10,56 +11,52 @@ from asyncio import (
 )
 from contextlib import suppress
 from datetime import datetime
-from re import compile
+from pathlib import Path
 from urllib.parse import urlparse
-from textwrap import dedent
-from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse
-from fastmcp import FastMCP
-from typing import Annotated
-from pydantic import Field
 from types import SimpleNamespace
-from pyperclip import copy, paste
-from uvicorn import Config, Server
-from typing import Callable
+from typing import TYPE_CHECKING, AsyncIterator, Callable
 
 from ..expansion import (
     BrowserCookie,
     Cleaner,
     Converter,
+    Link,
+    LinkClassifier,
     Namespace,
     beautify_string,
 )
 from ..module import (
-    __VERSION__,
     ERROR,
     MASTER,
-    REPOSITORY,
     ROOT,
     VERSION_BETA,
     VERSION_MAJOR,
     VERSION_MINOR,
     WARNING,
     DataRecorder,
-    ExtractData,
-    ExtractParams,
     IDRecorder,
     Manager,
     MapRecorder,
     logging,
     # sleep_time,
-    ScriptServer,
     INFO,
 )
 from ..translation import _, switch_language
 
-from ..module import Mapping
+from ..module import DetailCache, Mapping, SingleFlight
 from .download import Download
 from .explore import Explore
 from .image import Image
+from .pipeline import Pipeline
 from .request import Html
+from .resolver import ShortLinkResolver
 from .video import Video
-from rich import print
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+    from ..module import BatchJournal
+    from .jobs import JobManager
 
 __all__ = ["XHS"]
 
@@ -85,8 +82,10 @@ def data_cache(function):
 class Print:
     def __init__(
         self,
-        func: Callable = print,
+        func: Callable = None,
     ):
+        if func is None:
+            from rich import print as func
         self.func = func
 
     def __call__(
@@ -99,15 +98,6 @@ class XHS:
     VERSION_MAJOR = VERSION_MAJOR
     VERSION_MINOR = VERSION_MINOR
     VERSION_BETA = VERSION_BETA
-    # 更新正则表达式以更好地匹配包含查询参数的 URL
-    # \S+ 会匹配所有非空白字符，包括查询参数
-    LINK = compile(r"(?:https?://)?www\.xiaohongshu\.com/explore/[^\s]+")
-    USER = compile(r"(?:https?://)?www\.xiaohongshu\.com/user/profile/[a-z0-9]+/[^\s]+")
-    SHARE = compile(r"(?:https?://)?www\.xiaohongshu\.com/discovery/item/[^\s]+")
-    SHORT = compile(r"(?:https?://)?xhslink\.com/[^\s\"<>\\^`{|}，。；！？、【】《》]+")
-    # 更新 ID 提取正则，支持包含查询参数的 URL
-    ID = compile(r"(?:explore|item)/([^/?\s]+)")
-    ID_USER = compile(r"user/profile/[a-z0-9]+/([^/?\s]+)")
     __INSTANCE = None
     CLEANER = Cleaner()
 
@@ -123,7 +113,7 @@ class XHS:
         folder_name="Download",
         name_format="发布时间 作者昵称 作品标题",
         user_agent: str = None,
-        cookie: str = "",
+        cookie: str | list[str] = "",
         proxy: str | dict = None,
         timeout=10,
         chunk=1024 * 1024,
@@ -138,10 +128,18 @@ class XHS:
         author_archive=False,
         write_mtime=False,
         language="zh_CN",
-        read_cookie: int | str = None,
+        read_cookie: int | str | list = None,
         script_server: bool = False,
         script_host="0.0.0.0",
         script_port=5558,
+        pipeline_workers: dict = None,
+        extra_fields: dict = None,
+        download_concurrency: dict = None,
+        segment_download: dict = None,
+        rate_limit: dict = None,
+        detail_cache: dict = None,
+        proxy_check: int = 300,
+        cookie_pool: dict = None,
         **kwargs,
     ):
         switch_language(language)
@@ -153,7 +151,7 @@ class XHS:
             name_format,
             chunk,
             user_agent,
-            self.read_browser_cookie(read_cookie) or cookie,
+            self.merge_cookie(read_cookie, cookie),
             proxy,
             timeout,
             max_retry,
@@ -167,6 +165,14 @@ class XHS:
             author_archive,
             write_mtime,
             script_server,
+            pipeline_workers,
+            extra_fields,
+            download_concurrency,
+            segment_download,
+            rate_limit,
+            detail_cache,
+            proxy_check,
+            cookie_pool,
             self.CLEANER,
             self.print,
         )
@@ -176,13 +182,19 @@ class XHS:
         )
         self.mapping = Mapping(self.manager, self.map_recorder)
         self.html = Html(self.manager)
+        self.resolver = ShortLinkResolver(self.manager)
         self.image = Image()
         self.video = Video()
-        self.explore = Explore()
+        self.explore = Explore(self.manager.extra_fields)
+        self.pipeline = Pipeline(self, self.manager.pipeline_workers)
+        # 批量处理任务仅在 API 模式下创建
+        self.jobs: "JobManager | None" = None
         self.convert = Converter()
         self.download = Download(self.manager)
         self.id_recorder = IDRecorder(self.manager)
         self.data_recorder = DataRecorder(self.manager)
+        self.detail_cache = DetailCache(self.manager)
+        self.flight = SingleFlight()
         self.clipboard_cache: str = ""
         self.queue = Queue()
         self.event = Event()
@@ -203,40 +215,79 @@ class XHS:
             None,
         ]
 
-    async def __download_files(
+    async def _download_files(
         self,
         container: dict,
         download: bool,
         index,
         count: SimpleNamespace,
-    ):
+    ) -> tuple[bool, bool]:
+        """同一作品相同参数的并发下载任务只执行一次
+
+        返回 (下载是否成功, 是否由当前调用方负责记录)，加入其他调用方下载任务时同样返回共享的下载结果
+        """
+        leader = False
+
+        async def function():
+            nonlocal leader
+            leader = True
+            return await self.__download_files(container, download, index)
+
+        result = await self.flight.run(
+            (
+                container["作品ID"],
+                download,
+                tuple(index) if index else None,
+            ),
+            function,
+        )
+        # 共享的下载结果计入每个调用方各自的统计数据
+        if result:
+            setattr(count, result, getattr(count, result) + 1)
+        return result == "success", leader
+
+    async def __download_files(
+        self,
+        container: dict,
+        download: bool,
+        index,
+    ) -> str | None:
+        """返回需要更新的统计字段名称"""
         name = self.__naming_rules(container)
         if (u := container["下载地址"]) and download:
             if await self.skip_download(i := container["作品ID"]):
                 self.logging(_("作品 {0} 存在下载记录，跳过下载").format(i))
-                count.skip += 1
-            else:
-                __, result = await self.download.run(
-                    u,
-                    container["动图地址"],
-                    index,
-                    container["作者ID"]
-                    + "_"
-                    + self.CLEANER.filter_name(container["作者昵称"]),
-                    name,
-                    container["作品类型"],
-                    container["时间戳"],
-                )
-                if result:
-                    count.success += 1
-                    await self.__add_record(
-                        i,
-                    )
-                else:
-                    count.fail += 1
+                return "skip"
+            __, result = await self.download.run(
+                u,
+                container["动图地址"],
+                index,
+                container["作者ID"]
+                + "_"
+                + self.CLEANER.filter_name(container["作者昵称"]),
+                name,
+                container["作品类型"],
+                container["时间戳"],
+            )
+            return "success" if result else "fail"
         elif not u:
             self.logging(_("提取作品文件下载地址失败"), ERROR)
-            count.fail += 1
+            return "fail"
+        return None
+
+    async def _record_files(
+        self,
+        container: dict,
+        downloaded: bool,
+        leader: bool = True,
+    ) -> None:
+        if not leader:
+            # 其他调用方已处理相同的下载任务并负责记录
+            return
+        if downloaded:
+            await self.__add_record(
+                container["作品ID"],
+            )
         await self.save_data(container)
 
     @data_cache
@@ -263,11 +314,7 @@ class XHS:
         index: list | tuple = None,
         data=True,
     ) -> list[dict]:
-        if not (
-            urls := await self.extract_links(
-                url,
-            )
-        ):
+        if not (urls := self.split_links(url)):
             self.logging(_("提取小红书作品链接失败"), WARNING)
             return []
         statistics = SimpleNamespace(
@@ -277,21 +324,52 @@ class XHS:
             skip=0,
         )
         self.logging(_("共 {0} 个小红书作品待处理...").format(statistics.all))
-        result = [
-            await self.__deal_extract(
-                i,
-                download,
-                index,
-                data,
-                count=statistics,
-            )
-            for i in urls
-        ]
+        result = await self.pipeline.run(
+            urls,
+            download,
+            index,
+            data,
+            statistics,
+        )
         self.show_statistics(
             statistics,
         )
         return result
 
+    async def extract_stream(
+        self,
+        url: str,
+        download=False,
+        index: list | tuple = None,
+        data=True,
+        cookie: str = None,
+        proxy: str = None,
+    ) -> AsyncIterator[dict]:
+        """按处理完成顺序逐个返回作品数据"""
+        if not (urls := self.split_links(url)):
+            self.logging(_("提取小红书作品链接失败"), WARNING)
+            return
+        statistics = SimpleNamespace(
+            all=len(urls),
+            success=0,
+            fail=0,
+            skip=0,
+        )
+        self.logging(_("共 {0} 个小红书作品待处理...").format(statistics.all))
+        async for __, result in self.pipeline.stream(
+            urls,
+            download,
+            index,
+            data,
+            statistics,
+            cookie,
+            proxy,
+        ):
+            yield result
+        self.show_statistics(
+            statistics,
+        )
+
     def show_statistics(
         self,
         statistics: SimpleNamespace,
@@ -312,74 +390,204 @@ class XHS:
         index: list | tuple = None,
         data=False,
     ) -> None:
-        url = await self.extract_links(
-            url,
-        )
-        if not url:
-            self.logging(_("提取小红书作品链接失败"), WARNING)
-            return
         if index:
-            await self.__deal_extract(
+            if not (url := await self.extract_links(url)):
+                self.logging(_("提取小红书作品链接失败"), WARNING)
+                return
+            await self._deal_extract(
                 url[0],
                 download,
                 index,
                 data,
             )
         else:
+            if not (url := self.split_links(url)):
+                self.logging(_("提取小红书作品链接失败"), WARNING)
+                return
             statistics = SimpleNamespace(
                 all=len(url),
                 success=0,
                 fail=0,
                 skip=0,
             )
-            [
-                await self.__deal_extract(
-                    u,
-                    download,
+            await self.pipeline.run(
+                url,
+                download,
+                index,
+                data,
+                statistics,
+            )
+            self.show_statistics(
+                statistics,
+            )
+
+    async def extract_batch(
+        self,
+        file: Path,
+        index: list | tuple = None,
+        chunk: int = 500,
+    ) -> None:
+        """逐行读取链接文件并下载作品，处理进度保存至同目录的进度文件，再次运行时从中断位置继续"""
+        from ..module import BatchJournal
+
+        statistics = SimpleNamespace(
+            all=0,
+            success=0,
+            fail=0,
+            skip=0,
+            # 重试处理失败作品的统计数据单独记录，避免重复计数
+            retry=SimpleNamespace(
+                all=0,
+                success=0,
+                fail=0,
+                skip=0,
+            ),
+        )
+        async with BatchJournal(file) as journal:
+            for urls in self.__read_batch(file, chunk):
+                await self.__deal_batch(
+                    journal,
+                    await journal.register(urls),
                     index,
-                    data,
-                    count=statistics,
+                    statistics,
+                )
+            if failed := await journal.select(journal.FAILED):
+                self.logging(_("重试 {0} 个处理失败的作品").format(len(failed)))
+                await self.__deal_batch(
+                    journal,
+                    failed,
+                    index,
+                    statistics.retry,
                 )
-                for u in url
-            ]
             self.show_statistics(
                 statistics,
             )
+            if statistics.retry.all:
+                self.logging(
+                    _("重试 {0} 个作品，成功 {1} 个，失败 {2} 个，跳过 {3} 个").format(
+                        statistics.retry.all,
+                        statistics.retry.success,
+                        statistics.retry.fail,
+                        statistics.retry.skip,
+                    ),
+                )
+            progress = await journal.statistics()
+            self.logging(
+                _("批量下载进度：{0}").format(
+                    ", ".join(f"{k}: {v}" for k, v in progress.items())
+                )
+            )
+
+    @staticmethod
+    def __read_batch(file: Path, chunk: int):
+        urls = []
+        with file.open("r", encoding="utf-8-sig") as f:
+            for line in f:
+                urls.extend(i.url for i in LinkClassifier.scan(line))
+                if len(urls) >= chunk:
+                    yield list(dict.fromkeys(urls))
+                    urls = []
+        if urls:
+            yield list(dict.fromkeys(urls))
+
+    async def __deal_batch(
+        self,
+        journal: "BatchJournal",
+        urls: list[str],
+        index: list | tuple | None,
+        statistics: SimpleNamespace,
+    ) -> None:
+        if not urls:
+            return
+        statistics.all += len(urls)
+        downloaded = set()
+
+        async def checkpoint(position: int, status: str) -> None:
+            if status == journal.DOWNLOADED:
+                downloaded.add(position)
+            await journal.update(urls[position], status)
+
+        async def callback(position: int, result: dict) -> None:
+            if position in downloaded:
+                return
+            # 存在下载记录而跳过的作品视为已完成
+            if result.get("message") and "error" not in result:
+                await journal.update(
+                    urls[position],
+                    journal.DOWNLOADED,
+                    result["message"],
+                )
+            else:
+                await journal.update(
+                    urls[position],
+                    journal.FAILED,
+                    result.get("message", ""),
+                )
+
+        await self.pipeline.run(
+            urls,
+            True,
+            index,
+            False,
+            statistics,
+            callback=callback,
+            checkpoint=checkpoint,
+        )
 
     async def extract_links(
         self,
         url: str,
     ) -> list:
-        urls = []
-        if not url or not url.strip():
-            return urls
-        for i in url.split():
-            if not i.strip():
-                continue
-            if u := self.SHORT.search(i):
-                i = await self.html.request_url(
-                    u.group(),
-                    False,
-                )
-                # 如果解析短链接后得到新 URL，需要重新检查
-                if not i or not i.strip():
-                    continue
-            if u := self.SHARE.search(i):
-                urls.append(u.group())
-            elif u := self.LINK.search(i):
-                urls.append(u.group())
-            elif u := self.USER.search(i):
-                urls.append(u.group())
+        """提取作品链接，按作品 ID 去重后并发解析短链接，返回结果保持输入顺序"""
+        links, keys = [], set()
+        for link in LinkClassifier.scan(url):
+            # 短链接解析前无法得知作品 ID，先按短链接去重
+            if (key := link.id or link.url) not in keys:
+                keys.add(key)
+                links.append(link)
+        semaphore = Semaphore(self.resolver.CONCURRENCY)
+
+        async def resolve(link: Link) -> Link | None:
+            if link.kind != "short":
+                return link
+            async with semaphore:
+                return await self.__resolve_short(link.url)
+
+        urls, keys = [], set()
+        for link in await gather(*[resolve(i) for i in links]):
+            if link and link.id not in keys:
+                keys.add(link.id)
+                urls.append(link.url)
         return urls
 
+    def split_links(
+        self,
+        url: str,
+    ) -> list[str]:
+        return [i.url for i in LinkClassifier.scan(url)]
+
+    async def resolve_link(
+        self,
+        text: str,
+    ) -> str:
+        if (link := LinkClassifier.classify(text)) and link.kind == "short":
+            link = await self.__resolve_short(link.url)
+        return link.url if link else ""
+
+    async def __resolve_short(self, url: str) -> Link | None:
+        # 优先读取重定向响应头，失败时请求完整网页获取最终链接
+        target = await self.resolver.resolve(url) or await self.html.request_url(
+            url,
+            False,
+        )
+        if (link := LinkClassifier.classify(target)) and link.kind != "short":
+            return link
+        return None
+
     def extract_id(self, links: list[str]) -> list[str]:
-        ids = []
-        for i in links:
-            if j := self.ID.search(i):
-                ids.append(j.group(1))
-            elif j := self.ID_USER.search(i):
-                ids.append(j.group(1))
-        return ids
+        return [
+            link.id for i in links if (link := LinkClassifier.classify(i)) and link.id
+        ]
 
     async def _get_html_data(
         self,
@@ -394,11 +602,26 @@ class XHS:
             skip=0,
         ),
     ) -> tuple[str, Namespace | dict]:
-        if await self.skip_download(id_ := self.__extract_link_id(url)) and not data:
-            msg = _("作品 {0} 存在下载记录，跳过处理").format(id_)
-            self.logging(msg)
-            count.skip += 1
-            return id_, {"message": msg}
+        if message := await self.__skip_detail(
+            id_ := self.__extract_link_id(url),
+            data,
+            count,
+        ):
+            return id_, message
+        html = await self.__request_page(url, id_, cookie, proxy)
+        if isinstance(html, dict):
+            count.fail += 1
+            return id_, html
+        return id_, self.__generate_namespace(html, id_, count)
+
+    async def __request_page(
+        self,
+        url: str,
+        id_: str,
+        cookie: str | None,
+        proxy: str | None,
+    ) -> str | dict:
+        """请求失败时返回错误信息，由调用方计入失败数量"""
         self.logging(_("开始处理作品：{0}").format(id_))
         html = await self.html.request_url(
             url,
@@ -411,14 +634,146 @@ class XHS:
             # 这里我们可以通过检查URL或添加更明确的错误信息
             error_msg = _("请求被重定向到错误页面，笔记不存在或已被删除")
             self.logging(_("{0} {1}").format(id_, error_msg), ERROR)
-            count.fail += 1
-            return id_, {"message": error_msg, "error": "404"}
+            return {"message": error_msg, "error": "404"}
+        return html
+
+    def __generate_namespace(
+        self,
+        html: str,
+        id_: str,
+        count: SimpleNamespace,
+    ) -> Namespace | dict:
         namespace = self.__generate_data_object(html)
         if not namespace:
             self.logging(_("{0} 获取数据失败").format(id_), ERROR)
             count.fail += 1
-            return id_, {}
-        return id_, namespace
+            return {}
+        return namespace
+
+    async def __skip_detail(
+        self,
+        id_: str,
+        data: bool,
+        count: SimpleNamespace,
+    ) -> dict | None:
+        if await self.skip_download(id_) and not data:
+            msg = _("作品 {0} 存在下载记录，跳过处理").format(id_)
+            self.logging(msg)
+            count.skip += 1
+            return {"message": msg}
+        return None
+
+    async def _get_detail(
+        self,
+        url: str,
+        data: bool,
+        cookie: str = None,
+        proxy: str = None,
+        count=SimpleNamespace(
+            all=0,
+            success=0,
+            fail=0,
+            skip=0,
+        ),
+    ) -> tuple[str, dict]:
+        """获取包含下载地址的作品数据，未指定 Cookie 与代理时优先读取作品详情缓存"""
+        id_ = self.__extract_link_id(url)
+        if message := await self.__skip_detail(id_, data, count):
+            return id_, message
+        if cookie or proxy:
+            return id_, await self.__load_detail(url, cookie, proxy, count)
+        # 共享的请求结果由每个调用方各自计入失败数量
+        detail = await self.detail_cache.fetch(
+            id_,
+            lambda: self.__load_detail(url, None, None, SimpleNamespace(fail=0)),
+            lambda detail: "作品ID" in detail,
+        )
+        if "作品ID" not in detail:
+            count.fail += 1
+        return id_, detail
+
+    async def _fetch_page(
+        self,
+        url: str,
+        data: bool,
+        cookie: str = None,
+        proxy: str = None,
+        count=SimpleNamespace(
+            all=0,
+            success=0,
+            fail=0,
+            skip=0,
+        ),
+    ) -> tuple[str, str | dict]:
+        """多链接流水线的请求阶段：作品详情缓存命中时返回作品数据，否则返回作品网页，由 _parse_page 提取数据"""
+        id_ = self.__extract_link_id(url)
+        if message := await self.__skip_detail(id_, data, count):
+            return id_, message
+        if (
+            not (cookie or proxy)
+            and (detail := await self.detail_cache.lookup(id_)) is not None
+        ):
+            return id_, detail
+        # 同一作品的并发请求共享同一次网页请求，请求失败计入每个调用方各自的统计数据
+        page = await self.flight.run(
+            ("page", id_, cookie, proxy),
+            lambda: self.__request_page(url, id_, cookie, proxy),
+        )
+        if isinstance(page, dict):
+            count.fail += 1
+        return id_, page
+
+    async def _parse_page(
+        self,
+        html: str,
+        id_: str,
+        cache: bool,
+        count=SimpleNamespace(
+            all=0,
+            success=0,
+            fail=0,
+            skip=0,
+        ),
+    ) -> dict:
+        """多链接流水线的解析阶段：从作品网页提取作品数据，cache 为 True 时写入作品详情缓存"""
+        namespace = self.__generate_namespace(html, id_, count)
+        if not isinstance(namespace, Namespace):
+            return namespace
+        if "作品ID" in (detail := self._parse_detail(namespace, id_, count)) and cache:
+            await self.detail_cache.store(id_, detail)
+        return detail
+
+    async def __load_detail(
+        self,
+        url: str,
+        cookie: str | None,
+        proxy: str | None,
+        count: SimpleNamespace,
+    ) -> dict:
+        id_, namespace = await self._get_html_data(
+            url,
+            True,
+            cookie,
+            proxy,
+            count,
+        )
+        if not isinstance(namespace, Namespace):
+            return namespace
+        return self._parse_detail(namespace, id_, count)
+
+    def _parse_detail(
+        self,
+        namespace: Namespace,
+        id_: str,
+        count: SimpleNamespace,
+    ) -> dict:
+        if data := self._extract_data(
+            namespace,
+            id_,
+            count,
+        ):
+            self._extract_download_links(data, namespace, id_)
+        return data
 
     def _extract_data(
         self,
@@ -433,15 +788,12 @@ class XHS:
             return {}
         return data
 
-    async def _deal_download_tasks(
+    def _extract_download_links(
         self,
         data: dict,
         namespace: Namespace,
         id_: str,
-        download: bool,
-        index: list | tuple | None,
-        count: SimpleNamespace,
-    ):
+    ) -> None:
         if data["作品类型"] == _("视频"):
             self.__extract_video(data, namespace)
         elif data["作品类型"] in {
@@ -453,19 +805,30 @@ class XHS:
             self.logging(_("未知的作品类型：{0}").format(id_), WARNING)
             data["下载地址"] = []
             data["动图地址"] = []
+
+    async def _deal_download_tasks(
+        self,
+        data: dict,
+        download: bool,
+        index: list | tuple | None,
+        count: SimpleNamespace,
+    ):
         await self.update_author_nickname(
             data,
         )
-        await self.__download_files(
+        await self._record_files(
             data,
-            download,
-            index,
-            count,
+            *await self._download_files(
+                data,
+                download,
+                index,
+                count,
+            ),
         )
         # await sleep_time()
         return data
 
-    async def __deal_extract(
+    async def _deal_extract(
         self,
         url: str,
         download: bool,
@@ -480,27 +843,17 @@ class XHS:
             skip=0,
         ),
     ):
-        id_, namespace = await self._get_html_data(
+        id_, data = await self._get_detail(
             url,
             data,
             cookie,
             proxy,
             count,
         )
-        if not isinstance(namespace, Namespace):
-            return namespace
-        if not (
-            data := self._extract_data(
-                namespace,
-                id_,
-                count,
-            )
-        ):
+        if "作品ID" not in data:
             return data
         data = await self._deal_download_tasks(
             data,
-            namespace,
-            id_,
             download,
             index,
             count,
@@ -522,7 +875,7 @@ class XHS:
         namespace = self.json_to_namespace(data)
         id_ = namespace.safe_extract("noteId", "")
         if not (
-            data := self._extract_data(
+            data := self._parse_detail(
                 namespace,
                 id_,
                 count,
@@ -531,8 +884,6 @@ class XHS:
             return data
         return await self._deal_download_tasks(
             data,
-            namespace,
-            id_,
             True,
             index,
             count,
@@ -615,6 +966,8 @@ class XHS:
             ),
             style=MASTER,
         )
+        from pyperclip import copy
+
         self.event.clear()
         copy("")
         await gather(
@@ -623,6 +976,8 @@ class XHS:
         )
 
     async def __get_link(self, delay: int):
+        from pyperclip import paste
+
         while not self.event.is_set():
             if (t := paste()).lower() == "close":
                 self.stop_monitor()
@@ -647,7 +1002,7 @@ class XHS:
     async def __receive_link(self, delay: int, *args, **kwargs):
         while not self.event.is_set() or self.queue.qsize() > 0:
             with suppress(QueueEmpty):
-                await self.__deal_extract(self.queue.get_nowait(), *args, **kwargs)
+                await self._deal_extract(self.queue.get_nowait(), *args, **kwargs)
             await sleep(delay)
 
     def stop_monitor(self):
@@ -660,20 +1015,46 @@ class XHS:
         await self.id_recorder.__aenter__()
         await self.data_recorder.__aenter__()
         await self.map_recorder.__aenter__()
+        await self.detail_cache.__aenter__()
+        await self.resolver.__aenter__()
+        self.manager.start_proxy_check()
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        await self.id_recorder.__aexit__(exc_type, exc_value, traceback)
-        await self.data_recorder.__aexit__(exc_type, exc_value, traceback)
-        await self.map_recorder.__aexit__(exc_type, exc_value, traceback)
         await self.close()
 
     async def close(self):
+        # 先停止仍在使用数据库与客户端的后台任务，再关闭数据库、缓存与客户端
+        if self.jobs:
+            await self.jobs.close()
         await self.stop_script_server()
+        await self.close_database()
         await self.manager.close()
 
+    async def close_database(self):
+        await self.id_recorder.__aexit__(None, None, None)
+        await self.data_recorder.__aexit__(None, None, None)
+        await self.map_recorder.__aexit__(None, None, None)
+        await self.detail_cache.__aexit__(None, None, None)
+        await self.resolver.__aexit__(None, None, None)
+
+    @staticmethod
+    def merge_cookie(
+        read_cookie: int | str | list | None,
+        cookie: str | list | None,
+    ) -> list:
+        """浏览器 Cookie 与配置文件 Cookie 一同加入 Cookie 池，浏览器 Cookie 排在前面，重复与空值由 Manager 去除"""
+        browser = XHS.read_browser_cookie(read_cookie)
+        return [
+            *([browser] if isinstance(browser, str) else browser),
+            *(cookie if isinstance(cookie, (list, tuple)) else [cookie]),
+        ]
+
     @staticmethod
-    def read_browser_cookie(value: str | int) -> str:
+    def read_browser_cookie(value: str | int | list) -> str | list[str]:
+        """value 为浏览器列表时读取每个浏览器的 Cookie"""
+        if isinstance(value, list):
+            return [i for v in value if (i := XHS.read_browser_cookie(v))]
         return (
             BrowserCookie.get(
                 value,
@@ -691,168 +1072,21 @@ class XHS:
         port=5556,
         log_level="info",
     ):
-        api = FastAPI(
-            debug=self.VERSION_BETA,
-            title="XHS-Downloader",
-            version=__VERSION__,
-        )
-        self.setup_routes(api)
-        config = Config(
-            api,
-            host=host,
-            port=port,
-            log_level=log_level,
+        from .api import APIServer
+
+        await APIServer(self).run(
+            host,
+            port,
+            log_level,
         )
-        server = Server(config)
-        await server.serve()
 
     def setup_routes(
         self,
-        server: FastAPI,
+        server: "FastAPI",
     ):
-        @server.get(
-            "/",
-            summary=_("跳转至项目 GitHub 仓库"),
-            description=_("重定向至项目 GitHub 仓库主页"),
-            tags=["API"],
-        )
-        async def index():
-            return RedirectResponse(url=REPOSITORY)
-
-        @server.post(
-            "/xhs/detail",
-            summary=_("获取作品数据及下载地址"),
-            description=_(
-                dedent("""
-                **参数**:
-
-                - **url**: 小红书作品链接，自动提取，不支持多链接；必需参数
-                - **download**: 是否下载作品文件；设置为 true 将会耗费更多时间；可选参数
-                - **index**: 下载指定序号的图片文件，仅对图文作品生效；download 参数设置为 false 时不生效；可选参数
-                - **cookie**: 请求数据时使用的 Cookie；可选参数
-                - **proxy**: 请求数据时使用的代理；可选参数
-                - **skip**: 是否跳过存在下载记录的作品；设置为 true 将不会返回存在下载记录的作品数据；可选参数
-                """)
-            ),
-            tags=["API"],
-            response_model=ExtractData,
-        )
-        async def handle(extract: ExtractParams):
-            import time
-            from .request_logger import log_request
-
-            start_time = time.time()
-            data = None
-            error_msg = None
-            # 记录原始 URL 用于调试
-            original_url = extract.url
-            url = await self.extract_links(
-                extract.url,
-            )
-            if not url:
-                # 提供更详细的错误信息
-                msg = _("提取小红书作品链接失败: {0}").format(original_url[:100] if original_url else "URL为空")
-                error_msg = f"提取链接失败: {original_url[:100] if original_url else 'URL为空'}"
-            else:
-                try:
-                    result = await self.__deal_extract(
-                        url[0],
-                        extract.download,
-                        extract.index,
-                        not extract.skip,
-                        extract.cookie,
-                        extract.proxy,
-                    )
-                    if result and isinstance(result, dict) and result.get("error") == "404":
-                        # 明确返回404错误信息
-                        msg = result.get("message", _("笔记不存在或已被删除（404）"))
-                        data = None
-                        error_msg = "404 - 笔记不存在"
-                    elif result:
-                        msg = _("获取小红书作品数据成功")
-                        data = result
-                    else:
-                        msg = _("获取小红书作品数据失败")
-                        error_msg = "获取数据失败"
-                except Exception as e:
-                    msg = _("获取小红书作品数据失败")
-                    error_msg = str(e)
-                    raise
-
-            duration_ms = (time.time() - start_time) * 1000
-
-            # 记录日志
-            log_request(
-                endpoint="/xhs/detail",
-                request_data={
-                    "url": extract.url,
-                    "download": extract.download,
-                    "index": extract.index,
-                    "skip": extract.skip,
-                    "has_cookie": bool(extract.cookie),
-                    "has_proxy": bool(extract.proxy),
-                },
-                response_data={
-                    "message": msg,
-                    "has_data": data is not None,
-                    "data_keys": list(data.keys()) if isinstance(data, dict) else None,
-                } if data else None,
-                error=error_msg,
-                duration_ms=duration_ms,
-            )
+        from .api import APIServer
 
-            return ExtractData(message=msg, params=extract, data=data)
-
-        @server.get(
-            "/internal-logs",
-            summary=_("获取请求日志"),
-            description=_("获取API请求日志记录"),
-            tags=["API"],
-        )
-        async def get_logs(
-            request: Request,
-            limit: Annotated[int, Field(default=50, ge=1, le=100)] = 50,
-            offset: Annotated[int, Field(default=0, ge=0)] = 0,
-        ):
-            # 检查内部调用密钥（用于绕过 Vercel 预览部署的身份验证）
-            # 如果未配置密钥，则允许所有请求（向后兼容）
-            internal_key = os.getenv("XHS_INTERNAL_API_KEY", "")
-            if internal_key:
-                auth_header = request.headers.get("x-internal-api-key", "")
-                if auth_header != internal_key:
-                    from fastapi import HTTPException
-                    raise HTTPException(status_code=403, detail="Invalid internal API key")
-
-            from .request_logger import get_logs
-            logs, total = get_logs(limit=limit, offset=offset)
-            return {
-                "items": logs,
-                "total": total,
-                "limit": limit,
-                "offset": offset,
-            }
-
-        @server.delete(
-            "/internal-logs",
-            summary=_("清空请求日志"),
-            description=_("清空所有API请求日志记录"),
-            tags=["API"],
-        )
-        async def clear_logs(request: Request):
-            # 检查内部调用密钥
-            internal_key = os.getenv("XHS_INTERNAL_API_KEY", "")
-            if internal_key:
-                auth_header = request.headers.get("x-internal-api-key", "")
-                if auth_header != internal_key:
-                    from fastapi import HTTPException
-                    raise HTTPException(status_code=403, detail="Invalid internal API key")
-
-            from .request_logger import clear_logs
-            success = clear_logs()
-            return {
-                "success": success,
-                "message": _("日志已清空") if success else _("清空日志失败"),
-            }
+        APIServer(self).setup_routes(server)
 
     async def run_mcp_server(
         self,
@@ -861,158 +1095,13 @@ class XHS:
         port=5556,
         log_level="INFO",
     ):
-        mcp = FastMCP(
-            "XHS-Downloader",
-            instructions=dedent("""
-                本服务器提供两个 MCP 接口，分别用于获取小红书作品信息数据和下载小红书作品文件，二者互不依赖，可独立调用。
-
-                支持的作品链接格式：
-                - https://www.xiaohongshu.com/explore/...
-                - https://www.xiaohongshu.com/discovery/item/...
-                - https://xhslink.com/...
-
-                get_detail_data
-                功能：输入小红书作品链接，返回该作品的信息数据，不会下载文件。
-                参数：
-                - url（必填）：小红书作品链接
-                返回：
-                - message：结果提示
-                - data：作品信息数据
-
-                download_detail
-                功能：输入小红书作品链接，下载作品文件，默认不返回作品信息数据。
-                参数：
-                - url（必填）：小红书作品链接
-                - index（选填）：根据用户指定的图片序号（如用户说“下载第1和第3张”时，index应为 [1, 3]），生成由所需图片序号组成的列表；如果用户未指定序号，则该字段为 None
-                - return_data（可选）：是否返回作品信息数据；如需返回作品信息数据，设置此参数为 true，默认值为 false
-                返回：
-                - message：结果提示
-                - data：作品信息数据，不需要返回作品信息数据时固定为 None
-                """),
-            version=__VERSION__,
-        )
+        from .mcp import MCPServer
 
-        @mcp.tool(
-            name="get_detail_data",
-            description=dedent("""
-                功能：输入小红书作品链接，返回该作品的信息数据，不会下载文件。
-
-                参数：
-                url（必填）：小红书作品链接，格式如：
-                - https://www.xiaohongshu.com/explore/...
-                - https://www.xiaohongshu.com/discovery/item/...
-                - https://xhslink.com/...
-
-                返回：
-                - message：结果提示
-                - data：作品信息数据
-                """),
-            tags={
-                "小红书",
-                "XiaoHongShu",
-                "RedNote",
-            },
-            annotations={
-                "title": "获取小红书作品信息数据",
-                "readOnlyHint": False,
-                "destructiveHint": False,
-                "idempotentHint": True,
-                "openWorldHint": True,
-            },
-        )
-        async def get_detail_data(
-            url: Annotated[str, Field(description=_("小红书作品链接"))],
-        ) -> dict:
-            msg, data = await self.deal_detail_mcp(
-                url,
-                False,
-                None,
-            )
-            return {
-                "message": msg,
-                "data": data,
-            }
-
-        @mcp.tool(
-            name="download_detail",
-            description=dedent("""
-                功能：输入小红书作品链接，下载作品文件，默认不返回作品信息数据。
-
-                参数：
-                url（必填）：小红书作品链接，格式如：
-                - https://www.xiaohongshu.com/explore/...
-                - https://www.xiaohongshu.com/discovery/item/...
-                - https://xhslink.com/...
-                index（选填）：根据用户指定的图片序号（如用户说“下载第1和第3张”时，index应为 [1, 3]），生成由所需图片序号组成的列表；如果用户未指定序号，则该字段为 None
-                return_data（可选）：是否返回作品信息数据；如需返回作品信息数据，设置此参数为 true，默认值为 false
-
-                返回：
-                - message：结果提示
-                - data：作品信息数据，不需要返回作品信息数据时固定为 None
-                """),
-            tags={
-                "小红书",
-                "XiaoHongShu",
-                "RedNote",
-                "Download",
-                "下载",
-            },
-            annotations={
-                "title": "下载小红书作品文件，可以返回作品信息数据",
-                "readOnlyHint": False,
-                "destructiveHint": False,
-                "idempotentHint": True,
-                "openWorldHint": True,
-            },
-        )
-        async def download_detail(
-            url: Annotated[str, Field(description=_("小红书作品链接"))],
-            index: Annotated[
-                list[str | int] | None,
-                Field(default=None, description=_("指定需要下载的图文作品序号")),
-            ],
-            return_data: Annotated[
-                bool,
-                Field(default=False, description=_("是否需要返回作品信息数据")),
-            ],
-        ) -> dict:
-            msg, data = await self.deal_detail_mcp(
-                url,
-                True,
-                index,
-            )
-            match (
-                bool(data),
-                return_data,
-            ):
-                case (True, True):
-                    return {
-                        "message": msg + ", " + _("作品文件下载任务执行完毕"),
-                        "data": data,
-                    }
-                case (True, False):
-                    return {
-                        "message": _("作品文件下载任务执行完毕"),
-                        "data": None,
-                    }
-                case (False, True):
-                    return {
-                        "message": msg + ", " + _("作品文件下载任务未执行"),
-                        "data": None,
-                    }
-                case (False, False):
-                    return {
-                        "message": msg + ", " + _("作品文件下载任务未执行"),
-                        "data": None,
-                    }
-                case _:
-                    raise ValueError
-
-        await mcp.run_async(
-            transport=transport,
-            host=host,
-            port=port,
-            log_level=log_level,
+        await MCPServer(self).run(
+            transport,
+            host,
+            port,
+            log_level,
         )
 
     async def deal_detail_mcp(
@@ -1027,7 +1116,7 @@ class XHS:
         )
         if not url:
             msg = _("提取小红书作品链接失败")
-        elif data := await self.__deal_extract(
+        elif data := await self._deal_extract(
             url[0],
             download,
             index,
@@ -1075,6 +1164,8 @@ class XHS:
         host="0.0.0.0",
         port=5558,
     ):
+        from ..module import ScriptServer
+
         async with ScriptServer(self, host, port):
             await Future()
 
@@ -1,18 +1,18 @@
-from asyncio import Semaphore, gather
+from asyncio import Lock, gather
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
+from weakref import WeakValueDictionary
 
-from aiofiles import open
 from httpx import HTTPError
 
-from ..expansion import CacheError
+from ..expansion import CacheError, DirectoryIndex
 
 # from ..module import WARNING
 from ..module import (
     ERROR,
     FILE_SIGNATURES,
-    FILE_SIGNATURES_LENGTH,
-    MAX_WORKERS,
+    FileWriter,
     logging,
     # sleep_time,
 )
@@ -20,15 +20,15 @@ from ..module import retry as re_download
 from ..translation import _
 
 if TYPE_CHECKING:
-    from httpx import AsyncClient
+    from httpx import AsyncClient, Response
 
     from ..module import Manager
+    from ..module.scheduler import Slot
 
 __all__ = ["Download"]
 
 
 class Download:
-    SEMAPHORE = Semaphore(MAX_WORKERS)
     CONTENT_TYPE_MAP = {
         "image/png": "png",
         "image/jpeg": "jpeg",
@@ -49,6 +49,12 @@ class Download:
         self.temp = manager.temp
         self.chunk = manager.chunk
         self.client: "AsyncClient" = manager.download_client
+        self.download_pool = manager.download_pool
+        self.proxy_pool = manager.proxy_pool
+        # 下载失败的链接与所用代理，重试时优先更换代理
+        self.failed_proxies: dict[str, str] = {}
+        self.scheduler = manager.scheduler
+        self.executor = manager.io_executor
         self.headers = manager.blank_headers
         self.retry = manager.retry
         self.folder_mode = manager.folder_mode
@@ -67,6 +73,10 @@ class Download:
         self.live_download = manager.live_download
         self.author_archive = manager.author_archive
         self.write_mtime = manager.write_mtime
+        self.index = DirectoryIndex()
+        self.locks: WeakValueDictionary[str, Lock] = WeakValueDictionary()
+        self.segment_count = manager.segment_download["count"]
+        self.segment_threshold = manager.segment_download["threshold"]
 
     async def run(
         self,
@@ -115,10 +125,12 @@ class Download:
         if self.author_archive:
             folder = self.folder.joinpath(nickname)
             folder.mkdir(exist_ok=True)
+            self.manager.record_directory(folder)
         else:
             folder = self.folder
         path = self.manager.archive(folder, filename, self.folder_mode)
         path.mkdir(exist_ok=True)
+        self.manager.record_directory(path)
         return path
 
     def __ready_download_video(
@@ -188,7 +200,7 @@ class Download:
         path: Path,
         name: str,
     ) -> bool:
-        if path.joinpath(name).exists():
+        if self.index.exists(path, name):
             logging(self.print, _("{0} 文件已存在，跳过下载").format(name))
             return True
         return False
@@ -202,18 +214,49 @@ class Download:
         format_: str,
         mtime: int,
     ):
-        async with self.SEMAPHORE:
+        # 文件名相同的下载任务共用同一个临时文件，需要依次执行
+        lock = self.__lock(f"{name}.{format_}")
+        waited = lock.locked()
+        async with lock:
+            if waited and self.__check_exists_path(path, f"{name}.{format_}"):
+                return True
+            return await self.__download_stream(
+                url,
+                path,
+                name,
+                format_,
+                mtime,
+            )
+
+    def __lock(self, key: str) -> Lock:
+        if (lock := self.locks.get(key)) is None:
+            lock = self.locks[key] = Lock()
+        return lock
+
+    async def __download_stream(
+        self,
+        url: str,
+        path: Path,
+        name: str,
+        format_: str,
+        mtime: int,
+    ) -> bool:
+        length = 0
+        # 等待可用代理期间不占用域名并发名额，也不计入请求耗时
+        proxy = await self.__acquire(url)
+        async with self.scheduler.slot(url) as slot:
             headers = self.headers.copy()
             temp = self.temp.joinpath(f"{name}.{format_}")
-            self.__update_headers_range(
+            position = self.__update_headers_range(
                 headers,
                 temp,
             )
             try:
-                async with self.client.stream(
-                    "GET",
+                async with self.__stream(
                     url,
-                    headers=headers,
+                    proxy,
+                    headers,
+                    slot,
                 ) as response:
                     # await sleep_time()
                     if response.status_code == 416:
@@ -227,27 +270,39 @@ class Download:
                     #         response.headers.get(
                     #             'content-length', 0)) or None,
                     # )
-                    async with open(temp, "ab") as f:
-                        async for chunk in response.aiter_bytes(self.chunk):
-                            await f.write(chunk)
-                            # self.__update_progress(bar, len(chunk))
-                real = await self.__suffix_with_file(
-                    temp,
-                    path,
-                    name,
-                    # suffix,
-                    format_,
-                )
-                self.manager.move(
-                    temp,
-                    real,
-                    mtime,
-                    self.write_mtime,
-                )
-                # self.__create_progress(bar, None)
-                logging(self.print, _("文件 {0} 下载成功").format(real.name))
-                return True
+                    if not (
+                        length := self.__segment_length(response, position, format_)
+                    ):
+                        async with FileWriter(
+                            self.executor,
+                            temp,
+                            self.chunk,
+                            # 服务器未返回部分内容时重新写入完整文件
+                            position if response.status_code == 206 else 0,
+                        ) as writer:
+                            async for chunk in response.aiter_bytes():
+                                await writer.write(chunk)
+                                # self.__update_progress(bar, len(chunk))
+                if not length:
+                    real = self.__suffix_with_head(
+                        writer.head,
+                        path,
+                        name,
+                        # suffix,
+                        format_,
+                    )
+                    self.manager.move(
+                        temp,
+                        real,
+                        mtime,
+                        self.write_mtime,
+                    )
+                    self.index.add(real.parent, real.name)
+                    # self.__create_progress(bar, None)
+                    logging(self.print, _("文件 {0} 下载成功").format(real.name))
+                    return True
             except HTTPError as error:
+                slot.fail(error)
                 # self.__create_progress(bar, None)
                 logging(
                     self.print,
@@ -265,6 +320,166 @@ class Download:
                     ERROR,
                 )
                 return False
+        # 文件较大时关闭当前连接并释放并发名额，改为分段下载
+        return await self.__download_segments(
+            url,
+            length,
+            path,
+            name,
+            format_,
+            mtime,
+        )
+
+    def __segment_length(
+        self,
+        response: "Response",
+        position: int,
+        format_: str,
+    ) -> int:
+        """从完整文件请求的响应头读取文件总大小，需要分段下载时返回文件总大小，否则返回 0"""
+        if (
+            format_ != self.video_format
+            or self.segment_count < 2
+            or position
+            or response.status_code != 206
+        ):
+            return 0
+        try:
+            length = int(response.headers.get("Content-Range", "").rpartition("/")[2])
+        except ValueError:
+            return 0
+        return length if length >= self.segment_threshold else 0
+
+    async def __acquire(self, url: str) -> str | None:
+        """返回代理池中评分最好的代理，优先避开该链接上次请求失败的代理，未设置代理时返回 None"""
+        failed = self.failed_proxies.pop(url, None)
+        return await self.proxy_pool.acquire((failed,) if failed else ())
+
+    @asynccontextmanager
+    async def __stream(
+        self,
+        url: str,
+        proxy: str | None,
+        headers: dict,
+        slot: "Slot",
+    ):
+        """使用指定代理发送请求，未设置代理时直接连接"""
+        async with AsyncExitStack() as stack:
+            client = (
+                await stack.enter_async_context(self.download_pool.client(proxy))
+                if proxy
+                else self.client
+            )
+            try:
+                response = await stack.enter_async_context(
+                    client.stream(
+                        "GET",
+                        url,
+                        headers=headers,
+                    )
+                )
+                slot.respond()
+                if proxy:
+                    self.proxy_pool.success(proxy, slot.elapsed)
+                yield response
+            except HTTPError as error:
+                slot.fail(error)
+                if proxy and not slot.success:
+                    self.failed_proxies[url] = proxy
+                    self.proxy_pool.failure(proxy)
+                raise
+
+    async def __download_segments(
+        self,
+        url: str,
+        length: int,
+        path: Path,
+        name: str,
+        format_: str,
+        mtime: int,
+    ) -> bool:
+        temp = self.temp.joinpath(f"{name}.{format_}.part")
+        size = -(-length // self.segment_count)
+        ranges = [
+            (start, min(start + size, length) - 1) for start in range(0, length, size)
+        ]
+        try:
+            # 预先分配完整文件，各分段直接写入对应偏移位置
+            await FileWriter.allocate(self.executor, temp, length)
+            results = await gather(
+                *[self.__download_segment(url, temp, *i) for i in ranges],
+            )
+            # 预分配后文件大小始终等于总大小，需要核对各分段实际写入的字节数
+            if None in results or [i[1] for i in results] != [
+                end - start + 1 for start, end in ranges
+            ]:
+                raise CacheError(
+                    _("文件 {0} 分段下载不完整").format(temp.name),
+                )
+            real = self.__suffix_with_head(
+                results[0][0],
+                path,
+                name,
+                format_,
+            )
+            self.manager.move(
+                temp,
+                real,
+                mtime,
+                self.write_mtime,
+            )
+            self.index.add(real.parent, real.name)
+            logging(self.print, _("文件 {0} 下载成功").format(real.name))
+            return True
+        except (CacheError, OSError) as error:
+            self.manager.delete(temp)
+            logging(
+                self.print,
+                _("{0} 下载失败，错误信息: {1}").format(name, repr(error)),
+                ERROR,
+            )
+            return False
+
+    async def __download_segment(
+        self,
+        url: str,
+        temp: Path,
+        start: int,
+        end: int,
+    ) -> tuple[bytes, int] | None:
+        """返回分段起始字节与实际写入的字节数，下载失败时返回 None"""
+        proxy = await self.__acquire(url)
+        async with self.scheduler.slot(url) as slot:
+            try:
+                async with self.__stream(
+                    url,
+                    proxy,
+                    self.headers | {"Range": f"bytes={start}-{end}"},
+                    slot,
+                ) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        return None
+                    async with FileWriter(
+                        self.executor,
+                        temp,
+                        self.chunk,
+                        start,
+                        create=False,
+                    ) as writer:
+                        async for chunk in response.aiter_bytes():
+                            await writer.write(chunk)
+                    return writer.head, writer.written
+            except HTTPError as error:
+                slot.fail(error)
+                logging(
+                    self.print,
+                    _("网络异常，{0} 分段 {1}-{2} 下载失败，错误信息: {3}").format(
+                        temp.name, start, end, repr(error)
+                    ),
+                    ERROR,
+                )
+                return None
 
     @staticmethod
     def __create_progress(
@@ -313,25 +528,14 @@ class Download:
         headers["Range"] = f"bytes={(p := self.__get_resume_byte_position(file))}-"
         return p
 
-    async def __suffix_with_file(
-        self,
-        temp: Path,
+    @staticmethod
+    def __suffix_with_head(
+        file_start: bytes,
         path: Path,
         name: str,
         default_suffix: str,
     ) -> Path:
-        try:
-            async with open(temp, "rb") as f:
-                file_start = await f.read(FILE_SIGNATURES_LENGTH)
-            for offset, signature, suffix in FILE_SIGNATURES:
-                if file_start[offset : offset + len(signature)] == signature:
-                    return path.joinpath(f"{name}.{suffix}")
-        except Exception as error:
-            logging(
-                self.print,
-                _("文件 {0} 格式判断失败，错误信息：{1}").format(
-                    temp.name, repr(error)
-                ),
-                ERROR,
-            )
+        for offset, signature, suffix in FILE_SIGNATURES:
+            if file_start[offset : offset + len(signature)] == signature:
+                return path.joinpath(f"{name}.{suffix}")
         return path.joinpath(f"{name}.{default_suffix}")
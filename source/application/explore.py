@@ -1,97 +1,129 @@
 from datetime import datetime
+from typing import Any, Callable, NamedTuple
 
-from ..expansion import Namespace
+from ..expansion import AccessorTree, Namespace
 from ..translation import _
 
-__all__ = ["Explore"]
+__all__ = ["Explore", "Field"]
+
+
+class Field(NamedTuple):
+    """作品数据字段声明
+
+    key: 输出字段名称
+    paths: 候选属性链，按顺序取第一个有效值
+    default: 全部候选属性链均无有效值时使用的默认值
+    transform: 转换函数，参数为字段值与全部属性链的读取结果
+    requires: 转换函数额外依赖的属性链
+    """
+
+    key: str
+    paths: tuple[str, ...]
+    default: Any = ""
+    transform: Callable[[Any, dict], Any] | None = None
+    requires: tuple[str, ...] = ()
 
 
 class Explore:
     time_format = "%Y-%m-%d_%H:%M:%S"
 
-    def run(self, data: Namespace) -> dict:
+    def __init__(self, fields: dict[str, str | list[str]] = None):
+        self.fields = self.FIELDS + self.__custom_fields(fields)
+        self.tree = AccessorTree(
+            [c for f in self.fields for c in (*f.paths, *f.requires)]
+        )
+
+    def run(self, data: Namespace | dict) -> dict:
         return self.__extract_data(data)
 
-    def __extract_data(self, data: Namespace) -> dict:
+    def __extract_data(self, data: Namespace | dict) -> dict:
         result = {}
         if data:
-            self.__extract_interact_info(result, data)
-            self.__extract_tags(result, data)
-            self.__extract_info(result, data)
-            self.__extract_time(result, data)
-            self.__extract_user(result, data)
+            values = self.tree(data.data if isinstance(data, Namespace) else data)
+            for key, paths, default, transform, __ in self.fields:
+                for path in paths:
+                    if value := values.get(path):
+                        break
+                else:
+                    value = default
+                result[key] = transform(value, values) if transform else value
         return result
 
     @staticmethod
-    def __extract_interact_info(container: dict, data: Namespace) -> None:
-        # 尝试多种字段名格式，以兼容不同的数据结构
-        # 优先使用下划线命名（实际API返回的格式）
-        collected = data.safe_extract("interact_info.collected_count", None)
-        if collected is None:
-            collected = data.safe_extract("interactInfo.collectedCount", "-1")
-        container["收藏数量"] = collected
-
-        comment = data.safe_extract("interact_info.comment_count", None)
-        if comment is None:
-            comment = data.safe_extract("interactInfo.commentCount", "-1")
-        container["评论数量"] = comment
-
-        shared = data.safe_extract("interact_info.shared_count", None)
-        if shared is None:
-            shared = data.safe_extract("interactInfo.shareCount", "-1")
-        container["分享数量"] = shared
-
-        liked = data.safe_extract("interact_info.liked_count", None)
-        if liked is None:
-            liked = data.safe_extract("interactInfo.likedCount", "-1")
-        container["点赞数量"] = liked
+    def __custom_fields(fields: dict[str, str | list[str]] | None) -> tuple:
+        if not fields:
+            return ()
+        return tuple(
+            Field(k, (v,) if isinstance(v, str) else tuple(v))
+            for k, v in fields.items()
+        )
 
     @staticmethod
-    def __extract_tags(container: dict, data: Namespace):
-        tags = data.safe_extract("tagList", [])
-        container["作品标签"] = " ".join(
-            Namespace.object_extract(i, "name") for i in tags
-        )
+    def __join_tags(tags: list, values: dict) -> str:
+        return " ".join(Namespace.object_extract(i, "name") for i in tags)
 
-    def __extract_info(self, container: dict, data: Namespace):
-        container["作品ID"] = data.safe_extract("noteId")
-        container["作品链接"] = (
-            f"https://www.xiaohongshu.com/explore/{container['作品ID']}"
-        )
-        container["作品标题"] = data.safe_extract("title")
-        container["作品描述"] = data.safe_extract("desc")
-        container["作品类型"] = self.__classify_works(data)
-        # container["IP归属地"] = data.safe_extract("ipLocation")
-
-    def __extract_time(self, container: dict, data: Namespace):
-        container["发布时间"] = (
-            datetime.fromtimestamp(time / 1000).strftime(self.time_format)
-            if (time := data.safe_extract("time"))
-            else _("未知")
-        )
-        container["最后更新时间"] = (
-            datetime.fromtimestamp(last / 1000).strftime(self.time_format)
-            if (last := data.safe_extract("lastUpdateTime"))
+    @staticmethod
+    def __explore_link(id_: str, values: dict) -> str:
+        return f"https://www.xiaohongshu.com/explore/{id_}"
+
+    @staticmethod
+    def __user_link(id_: str, values: dict) -> str:
+        return f"https://www.xiaohongshu.com/user/profile/{id_}"
+
+    @staticmethod
+    def __format_time(time: int | None, values: dict) -> str:
+        return (
+            datetime.fromtimestamp(time / 1000).strftime(Explore.time_format)
+            if time
             else _("未知")
         )
-        container["时间戳"] = (
-            (time / 1000) if (time := data.safe_extract("time")) else None
-        )
 
     @staticmethod
-    def __extract_user(container: dict, data: Namespace):
-        container["作者昵称"] = data.safe_extract("user.nickname")
-        container["作者ID"] = data.safe_extract("user.userId")
-        container["作者链接"] = (
-            f"https://www.xiaohongshu.com/user/profile/{container['作者ID']}"
-        )
+    def __timestamp(time: int | None, values: dict) -> float | None:
+        return (time / 1000) if time else None
 
     @staticmethod
-    def __classify_works(data: Namespace) -> str:
-        type_ = data.safe_extract("type")
-        list_ = data.safe_extract("imageList", [])
+    def __classify_works(type_: str, values: dict) -> str:
+        list_ = values.get("imageList") or []
         if type_ not in {"video", "normal"} or len(list_) == 0:
             return _("未知")
         if type_ == "video":
             return _("视频") if len(list_) == 1 else _("图集")
         return _("图文")
+
+    # 尝试多种字段名格式，以兼容不同的数据结构
+    # 优先使用下划线命名（实际API返回的格式）
+    FIELDS = (
+        Field(
+            "收藏数量",
+            ("interact_info.collected_count", "interactInfo.collectedCount"),
+            "-1",
+        ),
+        Field(
+            "评论数量",
+            ("interact_info.comment_count", "interactInfo.commentCount"),
+            "-1",
+        ),
+        Field(
+            "分享数量",
+            ("interact_info.shared_count", "interactInfo.shareCount"),
+            "-1",
+        ),
+        Field(
+            "点赞数量",
+            ("interact_info.liked_count", "interactInfo.likedCount"),
+            "-1",
+        ),
+        Field("作品标签", ("tagList",), [], __join_tags),
+        Field("作品ID", ("noteId",)),
+        Field("作品链接", ("noteId",), "", __explore_link),
+        Field("作品标题", ("title",)),
+        Field("作品描述", ("desc",)),
+        Field("作品类型", ("type",), "", __classify_works, ("imageList",)),
+        Field("发布时间", ("time",), None, __format_time),
+        Field("最后更新时间", ("lastUpdateTime",), None, __format_time),
+        Field("时间戳", ("time",), None, __timestamp),
+        Field("作者昵称", ("user.nickname",)),
+        Field("作者ID", ("user.userId",)),
+        Field("作者链接", ("user.userId",), "", __user_link),
+    )
@@ -0,0 +1,201 @@
+from asyncio import CancelledError, Queue, Task, create_task, gather, wait
+from contextlib import suppress
+from time import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from ..module import ERROR, BatchParams, JobData, JobItem
+from ..translation import _
+
+if TYPE_CHECKING:
+    from .app import XHS
+
+__all__ = ["Job", "JobManager"]
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCESS = "success"
+FAILED = "failed"
+SKIPPED = "skipped"
+CANCELLED = "cancelled"
+COMPLETED = "completed"
+FINISHED = {SUCCESS, FAILED, SKIPPED, CANCELLED}
+
+
+class Job:
+    def __init__(self, params: BatchParams, links: list[str]):
+        self.id = uuid4().hex
+        self.params = params
+        self.created = time()
+        self.finished: float | None = None
+        self.cancelled = False
+        self.items = [JobItem(url=i, status=PENDING) for i in links]
+        self.remaining = len(links)
+        self.tasks: dict[int, Task] = {}
+
+    @property
+    def status(self) -> str:
+        if self.cancelled:
+            return CANCELLED
+        if not self.remaining:
+            return COMPLETED
+        if self.remaining < len(self.items) or self.tasks:
+            return RUNNING
+        return PENDING
+
+    def done(self, position: int, status: str, message: str = "", data=None):
+        """记录作品处理结果，已有结果的作品保持不变"""
+        if (item := self.items[position]).status in FINISHED:
+            return
+        item.status, item.message, item.data = status, message, data
+        self.remaining -= 1
+        if not self.remaining:
+            self.finished = time()
+
+    def dump(self, items=True) -> JobData:
+        statistics = dict.fromkeys(
+            (PENDING, RUNNING, SUCCESS, FAILED, SKIPPED, CANCELLED),
+            0,
+        )
+        for item in self.items:
+            statistics[item.status] += 1
+        return JobData(
+            id=self.id,
+            status=self.status,
+            created=self.created,
+            finished=self.finished,
+            total=len(self.items),
+            statistics=statistics,
+            items=self.items if items else None,
+        )
+
+
+class JobManager:
+    """批量处理任务队列
+
+    提交的作品链接进入共享队列，由固定数量的后台任务依次处理，任务状态保存在内存中
+    """
+
+    # 内存中保留的任务数量上限，超出后移除最早完成的任务
+    LIMIT = 256
+
+    def __init__(
+        self,
+        core: "XHS",
+        workers: int = 4,
+    ):
+        self.core = core
+        self.size = workers
+        self.queue: Queue[tuple[Job, int]] = Queue()
+        self.jobs: dict[str, Job] = {}
+        self.workers: list[Task] = []
+
+    def submit(self, params: BatchParams) -> Job | None:
+        if not (links := [j for i in params.urls for j in self.core.split_links(i)]):
+            return None
+        job = Job(params, links)
+        self.jobs[job.id] = job
+        self.__prune()
+        for position in range(len(links)):
+            self.queue.put_nowait((job, position))
+        if not self.workers:
+            self.workers = [create_task(self.__worker()) for __ in range(self.size)]
+        self.core.logging(
+            _("批量任务 {0} 已创建，共 {1} 个作品待处理").format(job.id, len(links))
+        )
+        return job
+
+    def get(self, id_: str) -> Job | None:
+        return self.jobs.get(id_)
+
+    def cancel(self, id_: str) -> Job | None:
+        if not (job := self.jobs.get(id_)) or job.status == COMPLETED:
+            return job
+        job.cancelled = True
+        for position, item in enumerate(job.items):
+            if item.status == PENDING:
+                job.done(position, CANCELLED)
+        for task in job.tasks.values():
+            task.cancel()
+        self.core.logging(_("批量任务 {0} 已取消").format(job.id))
+        return job
+
+    def __prune(self) -> None:
+        for id_ in [i for i, j in self.jobs.items() if j.finished][
+            : max(len(self.jobs) - self.LIMIT, 0)
+        ]:
+            del self.jobs[id_]
+
+    async def __worker(self):
+        while True:
+            job, position = await self.queue.get()
+            try:
+                if job.items[position].status != PENDING:
+                    continue
+                task = job.tasks[position] = create_task(self.__process(job, position))
+                try:
+                    await wait((task,))
+                except CancelledError:
+                    # 任务已被取消时不再重复取消，避免中断其清理过程
+                    if not task.cancelling():
+                        task.cancel()
+                    raise
+                if task.cancelled():
+                    job.done(position, CANCELLED)
+            finally:
+                job.tasks.pop(position, None)
+                self.queue.task_done()
+
+    async def __process(self, job: Job, position: int) -> None:
+        item, params = job.items[position], job.params
+        item.status = RUNNING
+        count = SimpleNamespace(
+            all=1,
+            success=0,
+            fail=0,
+            skip=0,
+        )
+        try:
+            if not (url := await self.core.resolve_link(item.url)):
+                job.done(position, FAILED, _("提取小红书作品链接失败"))
+                return
+            result = await self.core._deal_extract(
+                url,
+                params.download,
+                params.index,
+                not params.skip,
+                params.cookie,
+                params.proxy,
+                count,
+            )
+        except CancelledError:
+            raise
+        except Exception as error:
+            self.core.logging(
+                _("作品 {0} 处理异常：{1}").format(item.url, repr(error)),
+                ERROR,
+            )
+            job.done(position, FAILED, repr(error))
+            return
+        if not result or "作品ID" not in result:
+            job.done(
+                position,
+                SKIPPED if count.skip else FAILED,
+                result.get("message") or _("获取小红书作品数据失败"),
+            )
+        elif count.fail:
+            job.done(position, FAILED, _("作品文件下载失败"), result)
+        else:
+            job.done(position, SUCCESS, _("获取小红书作品数据成功"), result)
+
+    async def close(self) -> None:
+        # 等待处理任务结束，避免关闭后仍有任务写入数据库或文件
+        tasks = [i for job in self.jobs.values() for i in job.tasks.values()]
+        for task in tasks:
+            task.cancel()
+        for worker in self.workers:
+            worker.cancel()
+        with suppress(CancelledError):
+            await gather(*self.workers, *tasks, return_exceptions=True)
+        self.workers = []
@@ -0,0 +1,181 @@
+from textwrap import dedent
+from typing import TYPE_CHECKING, Annotated
+
+from fastmcp import FastMCP
+from pydantic import Field
+
+from ..module import __VERSION__
+from ..translation import _
+
+if TYPE_CHECKING:
+    from .app import XHS
+
+__all__ = ["MCPServer"]
+
+
+class MCPServer:
+    """MCP 服务，仅在 MCP 模式下导入 FastMCP"""
+
+    def __init__(self, core: "XHS"):
+        self.core = core
+
+    async def run(
+        self,
+        transport="streamable-http",
+        host="0.0.0.0",
+        port=5556,
+        log_level="INFO",
+    ):
+        mcp = FastMCP(
+            "XHS-Downloader",
+            instructions=dedent("""
+                本服务器提供两个 MCP 接口，分别用于获取小红书作品信息数据和下载小红书作品文件，二者互不依赖，可独立调用。
+
+                支持的作品链接格式：
+                - https://www.xiaohongshu.com/explore/...
+                - https://www.xiaohongshu.com/discovery/item/...
+                - https://xhslink.com/...
+
+                get_detail_data
+                功能：输入小红书作品链接，返回该作品的信息数据，不会下载文件。
+                参数：
+                - url（必填）：小红书作品链接
+                返回：
+                - message：结果提示
+                - data：作品信息数据
+
+                download_detail
+                功能：输入小红书作品链接，下载作品文件，默认不返回作品信息数据。
+                参数：
+                - url（必填）：小红书作品链接
+                - index（选填）：根据用户指定的图片序号（如用户说“下载第1和第3张”时，index应为 [1, 3]），生成由所需图片序号组成的列表；如果用户未指定序号，则该字段为 None
+                - return_data（可选）：是否返回作品信息数据；如需返回作品信息数据，设置此参数为 true，默认值为 false
+                返回：
+                - message：结果提示
+                - data：作品信息数据，不需要返回作品信息数据时固定为 None
+                """),
+            version=__VERSION__,
+        )
+
+        @mcp.tool(
+            name="get_detail_data",
+            description=dedent("""
+                功能：输入小红书作品链接，返回该作品的信息数据，不会下载文件。
+
+                参数：
+                url（必填）：小红书作品链接，格式如：
+                - https://www.xiaohongshu.com/explore/...
+                - https://www.xiaohongshu.com/discovery/item/...
+                - https://xhslink.com/...
+
+                返回：
+                - message：结果提示
+                - data：作品信息数据
+                """),
+            tags={
+                "小红书",
+                "XiaoHongShu",
+                "RedNote",
+            },
+            annotations={
+                "title": "获取小红书作品信息数据",
+                "readOnlyHint": False,
+                "destructiveHint": False,
+                "idempotentHint": True,
+                "openWorldHint": True,
+            },
+        )
+        async def get_detail_data(
+            url: Annotated[str, Field(description=_("小红书作品链接"))],
+        ) -> dict:
+            msg, data = await self.core.deal_detail_mcp(
+                url,
+                False,
+                None,
+            )
+            return {
+                "message": msg,
+                "data": data,
+            }
+
+        @mcp.tool(
+            name="download_detail",
+            description=dedent("""
+                功能：输入小红书作品链接，下载作品文件，默认不返回作品信息数据。
+
+                参数：
+                url（必填）：小红书作品链接，格式如：
+                - https://www.xiaohongshu.com/explore/...
+                - https://www.xiaohongshu.com/discovery/item/...
+                - https://xhslink.com/...
+                index（选填）：根据用户指定的图片序号（如用户说“下载第1和第3张”时，index应为 [1, 3]），生成由所需图片序号组成的列表；如果用户未指定序号，则该字段为 None
+                return_data（可选）：是否返回作品信息数据；如需返回作品信息数据，设置此参数为 true，默认值为 false
+
+                返回：
+                - message：结果提示
+                - data：作品信息数据，不需要返回作品信息数据时固定为 None
+                """),
+            tags={
+                "小红书",
+                "XiaoHongShu",
+                "RedNote",
+                "Download",
+                "下载",
+            },
+            annotations={
+                "title": "下载小红书作品文件，可以返回作品信息数据",
+                "readOnlyHint": False,
+                "destructiveHint": False,
+                "idempotentHint": True,
+                "openWorldHint": True,
+            },
+        )
+        async def download_detail(
+            url: Annotated[str, Field(description=_("小红书作品链接"))],
+            index: Annotated[
+                list[str | int] | None,
+                Field(default=None, description=_("指定需要下载的图文作品序号")),
+            ],
+            return_data: Annotated[
+                bool,
+                Field(default=False, description=_("是否需要返回作品信息数据")),
+            ],
+        ) -> dict:
+            msg, data = await self.core.deal_detail_mcp(
+                url,
+                True,
+                index,
+            )
+            match (
+                bool(data),
+                return_data,
+            ):
+                case (True, True):
+                    return {
+                        "message": msg + ", " + _("作品文件下载任务执行完毕"),
+                        "data": data,
+                    }
+                case (True, False):
+                    return {
+                        "message": _("作品文件下载任务执行完毕"),
+                        "data": None,
+                    }
+                case (False, True):
+                    return {
+                        "message": msg + ", " + _("作品文件下载任务未执行"),
+                        "data": None,
+                    }
+                case (False, False):
+                    return {
+                        "message": msg + ", " + _("作品文件下载任务未执行"),
+                        "data": None,
+                    }
+                case _:
+                    raise ValueError
+
+        await mcp.run_async(
+            transport=transport,
+            host=host,
+            port=port,
+            log_level=log_level,
+        )
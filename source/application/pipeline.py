@@ -0,0 +1,273 @@
+from asyncio import CancelledError, Queue, create_task, gather
+from contextlib import suppress
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable
+
+from ..module import ERROR
+from ..translation import _
+
+if TYPE_CHECKING:
+    from .app import XHS
+
+__all__ = ["Pipeline"]
+
+
+class Pipeline:
+    """多链接并发处理流水线
+
+    每个作品依次经过 解析短链接 → 请求网页 → 提取数据 → 下载文件 → 记录数据 五个阶段，
+    阶段之间通过队列衔接，每个阶段拥有独立的并发数量；作品详情缓存命中时不请求网页，提取数据阶段直接放行
+    """
+
+    STAGES = (
+        "resolve",
+        "fetch",
+        "parse",
+        "download",
+        "record",
+    )
+
+    def __init__(
+        self,
+        core: "XHS",
+        workers: dict[str, int],
+    ):
+        self.core = core
+        self.workers = workers
+
+    async def run(
+        self,
+        links: list[str],
+        download: bool,
+        index: list | tuple | None,
+        data: bool,
+        count: SimpleNamespace,
+        cookie: str = None,
+        proxy: str = None,
+        callback: Callable[[int, dict], Awaitable[None]] = None,
+        checkpoint: Callable[[int, str], Awaitable[None]] = None,
+    ) -> list[dict]:
+        """处理全部链接并按输入顺序返回结果
+
+        传入 callback 时每个作品处理结束后立即以 (序号, 结果) 调用，不再保存结果，返回空列表；
+        传入 checkpoint 时作品获取数据成功后以 (序号, "parsed") 调用，下载成功或共享的下载任务成功后以 (序号, "downloaded") 调用
+        """
+        results = [] if callback else [{} for __ in links]
+        queues = {stage: Queue() for stage in self.STAGES}
+        params = SimpleNamespace(
+            download=download,
+            index=index,
+            data=data,
+            cookie=cookie,
+            proxy=proxy,
+            count=count,
+            callback=callback,
+            checkpoint=checkpoint,
+        )
+        workers = [
+            create_task(self.__worker(stage, queues, results, params))
+            for stage in self.STAGES
+            for __ in range(self.workers[stage])
+        ]
+        for position, link in enumerate(links):
+            queues[self.STAGES[0]].put_nowait(
+                SimpleNamespace(
+                    position=position,
+                    url=link,
+                    id_="",
+                    page="",
+                    data=None,
+                    downloaded=False,
+                    leader=True,
+                    result={},
+                )
+            )
+        try:
+            # 每个阶段的任务仅来源于上一阶段，依次等待即可确认全部任务完成
+            for stage in self.STAGES:
+                await queues[stage].join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await gather(*workers, return_exceptions=True)
+        return results
+
+    async def stream(
+        self,
+        links: list[str],
+        download: bool,
+        index: list | tuple | None,
+        data: bool,
+        count: SimpleNamespace,
+        cookie: str = None,
+        proxy: str = None,
+    ) -> AsyncIterator[tuple[int, dict]]:
+        """按完成顺序逐个返回 (序号, 结果)，迭代提前结束时取消尚未完成的作品"""
+        queue = Queue()
+        task = create_task(
+            self.run(
+                links,
+                download,
+                index,
+                data,
+                count,
+                cookie,
+                proxy,
+                lambda *args: queue.put(args),
+            )
+        )
+        task.add_done_callback(lambda __: queue.put_nowait(None))
+        try:
+            while (item := await queue.get()) is not None:
+                yield item
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                with suppress(CancelledError):
+                    await task
+
+    async def __worker(
+        self,
+        stage: str,
+        queues: dict[str, Queue],
+        results: list,
+        params: SimpleNamespace,
+    ):
+        handler = getattr(self, f"_{stage}")
+        next_ = self.__next_stage(stage)
+        queue = queues[stage]
+        while True:
+            item = await queue.get()
+            forward = False
+            try:
+                forward = await handler(item, params)
+            except Exception as error:
+                self.core.logging(
+                    _("作品 {0} 处理异常：{1}").format(
+                        item.id_ or item.url, repr(error)
+                    ),
+                    ERROR,
+                )
+                params.count.fail += 1
+            try:
+                if forward:
+                    queues[next_].put_nowait(item)
+                else:
+                    await self.__finish(item, results, params)
+            finally:
+                queue.task_done()
+
+    async def __finish(
+        self,
+        item: SimpleNamespace,
+        results: list,
+        params: SimpleNamespace,
+    ) -> None:
+        if params.callback:
+            try:
+                await params.callback(item.position, item.result)
+            except Exception as error:
+                self.core.logging(
+                    _("作品 {0} 结果回调异常：{1}").format(
+                        item.id_ or item.url, repr(error)
+                    ),
+                    ERROR,
+                )
+        else:
+            results[item.position] = item.result
+
+    @staticmethod
+    async def __checkpoint(
+        item: SimpleNamespace,
+        params: SimpleNamespace,
+        status: str,
+    ) -> None:
+        if params.checkpoint:
+            await params.checkpoint(item.position, status)
+
+    def __next_stage(self, stage: str) -> str | None:
+        if (i := self.STAGES.index(stage) + 1) < len(self.STAGES):
+            return self.STAGES[i]
+        return None
+
+    async def _resolve(
+        self,
+        item: SimpleNamespace,
+        params: SimpleNamespace,
+    ) -> bool:
+        if url := await self.core.resolve_link(item.url):
+            item.url = url
+            return True
+        self.core.logging(
+            _("提取小红书作品链接失败: {0}").format(item.url[:100]),
+            ERROR,
+        )
+        params.count.fail += 1
+        return False
+
+    async def _fetch(
+        self,
+        item: SimpleNamespace,
+        params: SimpleNamespace,
+    ) -> bool:
+        item.id_, page = await self.core._fetch_page(
+            item.url,
+            params.data,
+            params.cookie,
+            params.proxy,
+            params.count,
+        )
+        if isinstance(page, str):
+            item.page = page
+            return True
+        item.data = page
+        if "作品ID" in item.data:
+            return True
+        item.result = item.data
+        return False
+
+    async def _parse(
+        self,
+        item: SimpleNamespace,
+        params: SimpleNamespace,
+    ) -> bool:
+        if item.page:
+            item.data = await self.core._parse_page(
+                item.page,
+                item.id_,
+                not (params.cookie or params.proxy),
+                params.count,
+            )
+            item.page = ""
+        if "作品ID" in item.data:
+            await self.__checkpoint(item, params, "parsed")
+            return True
+        item.result = item.data
+        return False
+
+    async def _download(
+        self,
+        item: SimpleNamespace,
+        params: SimpleNamespace,
+    ) -> bool:
+        await self.core.update_author_nickname(item.data)
+        item.downloaded, item.leader = await self.core._download_files(
+            item.data,
+            params.download,
+            params.index,
+            params.count,
+        )
+        if item.downloaded:
+            await self.__checkpoint(item, params, "downloaded")
+        return True
+
+    async def _record(
+        self,
+        item: SimpleNamespace,
+        params: SimpleNamespace,
+    ) -> bool:
+        await self.core._record_files(item.data, item.downloaded, item.leader)
+        self.core.logging(_("作品处理完成：{0}").format(item.id_))
+        item.result = item.data
+        return False
@@ -1,10 +1,10 @@
+from time import monotonic
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse, parse_qs
 
-from httpx import HTTPError
-from httpx import get
+from httpx import HTTPError, HTTPStatusError
 
-from ..module import ERROR, Manager, logging, sleep_time
+from ..module import ERROR, Manager, logging
 from ..translation import _
 
 if TYPE_CHECKING:
@@ -21,6 +21,10 @@ class Html:
         self.print = manager.print
         self.retry = manager.retry
         self.client = manager.request_client
+        self.client_pool = manager.client_pool
+        self.proxy_pool = manager.proxy_pool
+        self.cookie_pool = manager.cookie_pool
+        self.rate_limiter = manager.rate_limiter
         self.headers = manager.headers
         self.timeout = manager.timeout
 
@@ -34,71 +38,88 @@ class Html:
     ) -> str:
         if not url.startswith("http"):
             url = f"https://{url}"
-        headers = self.update_cookie(
-            cookie,
-        )
         # 使用 _NO_RETRY 标记来避免重试
         _NO_RETRY = object()
 
+        # 未指定代理时使用代理池中评分最好的代理，重试时优先更换代理
+        tried = set()
+        # 未指定 Cookie 时由 Cookie 池分配，Cookie 暂停使用后更换 Cookie 重试
+        used = set()
+
         async def _do_request():
+            route = proxy or await self.proxy_pool.acquire(tried)
+            account = None if cookie else self.cookie_pool.select(used)
+            headers = self.update_cookie(
+                cookie or account,
+            )
+            await self.rate_limiter.acquire(
+                url,
+                headers.get("Cookie") or headers.get("cookie"),
+                route,
+            )
+            start = monotonic()
             try:
-                match bool(proxy):
+                match bool(route):
                     case False:
                         response = await self.__request_url_get(
                             url,
                             headers,
                             **kwargs,
                         )
-                        await sleep_time()
-                        # 检查是否重定向到 404 页面
-                        final_url = str(response.url)
-                        if "/404" in final_url or "errorCode" in final_url:
-                            error_msg = _("请求被重定向到错误页面: {0}").format(final_url)
-                            logging(self.print, error_msg, ERROR)
-                            # 返回特殊标记，避免重试
-                            return _NO_RETRY
-                        # 检查重定向后的 URL 是否包含 xsec_token
-                        # 如果原始 URL 不包含 token 但重定向后的 URL 包含，说明重定向是正常的
-                        if "xsec_token" not in url and "xsec_token" in final_url:
-                            # httpx 已经自动跟随重定向，这里只记录日志
-                            token = self.extract_xsec_token(final_url)
-                            if token:
-                                logging(
-                                    self.print,
-                                    _("检测到重定向，已获取 xsec_token: {0}").format(token[:20] + "..." if len(token) > 20 else token),
-                                )
-                        response.raise_for_status()
-                        return response.text if content else str(response.url)
                     case True:
                         response = await self.__request_url_get_proxy(
                             url,
                             headers,
-                            proxy,
+                            route,
                             **kwargs,
                         )
-                        await sleep_time()
-                        # 检查是否重定向到 404 页面
-                        final_url = str(response.url)
-                        if "/404" in final_url or "errorCode" in final_url:
-                            error_msg = _("请求被重定向到错误页面: {0}").format(final_url)
-                            logging(self.print, error_msg, ERROR)
-                            # 返回特殊标记，避免重试
-                            return _NO_RETRY
-                        # 检查重定向后的 URL 是否包含 xsec_token
-                        # 如果原始 URL 不包含 token 但重定向后的 URL 包含，说明重定向是正常的
-                        if "xsec_token" not in url and "xsec_token" in final_url:
-                            # httpx 已经自动跟随重定向，这里只记录日志
-                            token = self.extract_xsec_token(final_url)
-                            if token:
-                                logging(
-                                    self.print,
-                                    _("检测到重定向，已获取 xsec_token: {0}").format(token[:20] + "..." if len(token) > 20 else token),
-                                )
-                        response.raise_for_status()
-                        return response.text if content else str(response.url)
                     case _:
                         raise ValueError
+                # 检查是否重定向到 404 页面
+                final_url = str(response.url)
+                if "/404" in final_url or "errorCode" in final_url:
+                    error_msg = _("请求被重定向到错误页面: {0}").format(final_url)
+                    logging(self.print, error_msg, ERROR)
+                    # 同一 Cookie 连续重定向到带有错误代码的页面时暂停使用该 Cookie，并更换 Cookie 重试；
+                    # 作品已删除等情况仅重定向到 404 页面，与 Cookie 无关
+                    if (
+                        account
+                        and "errorCode" in final_url
+                        and self.cookie_pool.failure(account)
+                    ):
+                        used.add(account)
+                        return ""
+                    # 返回特殊标记，避免重试
+                    return _NO_RETRY
+                # 检查重定向后的 URL 是否包含 xsec_token
+                # 如果原始 URL 不包含 token 但重定向后的 URL 包含，说明重定向是正常的
+                if "xsec_token" not in url and "xsec_token" in final_url:
+                    # httpx 已经自动跟随重定向，这里只记录日志
+                    token = self.extract_xsec_token(final_url)
+                    if token:
+                        logging(
+                            self.print,
+                            _("检测到重定向，已获取 xsec_token: {0}").format(
+                                token[:20] + "..." if len(token) > 20 else token
+                            ),
+                        )
+                response.raise_for_status()
+                if route and not proxy:
+                    self.proxy_pool.success(route, monotonic() - start)
+                if account:
+                    self.cookie_pool.success(account)
+                return response.text if content else str(response.url)
             except HTTPError as error:
+                if route and not proxy:
+                    tried.add(route)
+                    self.proxy_pool.failure(route)
+                if (
+                    account
+                    and isinstance(error, HTTPStatusError)
+                    and error.response.status_code in self.cookie_pool.THROTTLE
+                ):
+                    used.add(account)
+                    self.cookie_pool.failure(account, trip=True)
                 logging(
                     self.print,
                     _("网络异常，{0} 请求失败: {1}").format(url, repr(error)),
@@ -170,7 +191,10 @@ class Html:
             # 清理 Cookie 字符串中的换行符和其他非法字符
             # HTTP header 值不能包含换行符、回车符等控制字符
             cleaned_cookie = cookie.replace("\n", "").replace("\r", "").strip()
-            return self.headers | {"Cookie": cleaned_cookie}
+            # 移除默认 Cookie，避免请求携带两个 Cookie 请求头
+            return {k: v for k, v in self.headers.items() if k.lower() != "cookie"} | {
+                "Cookie": cleaned_cookie
+            }
         return self.headers.copy()
 
     async def __request_url_head(
@@ -193,15 +217,13 @@ class Html:
         proxy: str,
         **kwargs,
     ):
-        return await self.client.head(
-            url,
-            headers=headers,
-            proxy=proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
-            **kwargs,
-        )
+        async with self.client_pool.client(proxy) as client:
+            return await client.head(
+                url,
+                headers=headers,
+                follow_redirects=True,
+                **kwargs,
+            )
 
     async def __request_url_get(
         self,
@@ -223,12 +245,10 @@ class Html:
         proxy: str,
         **kwargs,
     ):
-        return get(
-            url,
-            headers=headers,
-            proxy=proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
-            **kwargs,
-        )
+        async with self.client_pool.client(proxy) as client:
+            return await client.get(
+                url,
+                headers=headers,
+                follow_redirects=True,
+                **kwargs,
+            )
@@ -0,0 +1,129 @@
+from asyncio import Semaphore
+from time import monotonic, time
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin, urlparse
+
+from aiosqlite import connect
+from httpx import HTTPError
+
+from ..module import ERROR, SingleFlight, logging
+from ..translation import _
+
+if TYPE_CHECKING:
+    from ..module import Manager
+
+__all__ = ["ShortLinkResolver"]
+
+
+class ShortLinkResolver:
+    """短链接解析
+
+    不跟随重定向，仅读取短链接域名返回的 Location 响应头，解析结果保存至内存与 SQLite 缓存；
+    设置代理时与其他请求相同，通过代理池发送请求
+    """
+
+    HOST = "xhslink.com"
+    # 解析结果有效期(秒)、同时解析的短链接数量上限与最大重定向次数
+    TTL = 7 * 24 * 60 * 60
+    CONCURRENCY = 8
+    HOPS = 5
+
+    def __init__(self, manager: "Manager"):
+        self.file = manager.root.joinpath("ShortLink.db")
+        self.client = manager.request_client
+        self.client_pool = manager.client_pool
+        self.proxy_pool = manager.proxy_pool
+        self.print = manager.print
+        self.semaphore = Semaphore(self.CONCURRENCY)
+        self.flight = SingleFlight()
+        self.memory: dict[str, tuple[float, str]] = {}
+        self.database = None
+
+    async def resolve(self, url: str) -> str:
+        """返回短链接重定向的目标链接，解析失败时返回空字符串"""
+        if not url.startswith("http"):
+            url = f"https://{url}"
+        if target := await self.__cached(url):
+            return target
+        return await self.flight.run(url, lambda: self.__resolve(url))
+
+    async def __cached(self, url: str) -> str:
+        now = time()
+        if (item := self.memory.get(url)) and item[0] > now:
+            return item[1]
+        if self.database:
+            async with self.database.execute(
+                "SELECT EXPIRES, TARGET FROM short_link WHERE URL=?", (url,)
+            ) as cursor:
+                if (row := await cursor.fetchone()) and row[0] > now:
+                    self.memory[url] = row
+                    return row[1]
+        return ""
+
+    async def __resolve(self, url: str) -> str:
+        async with self.semaphore:
+            target = await self.__follow(url)
+        if target:
+            item = (time() + self.TTL, target)
+            self.memory[url] = item
+            if self.database:
+                await self.database.execute(
+                    "REPLACE INTO short_link VALUES (?, ?, ?);", (url, *item)
+                )
+                await self.database.commit()
+        return target
+
+    async def __follow(self, url: str) -> str:
+        target = url
+        proxy = await self.proxy_pool.acquire()
+        try:
+            for __ in range(self.HOPS):
+                start = monotonic()
+                response = await self.__request(target, proxy)
+                if proxy:
+                    self.proxy_pool.success(proxy, monotonic() - start)
+                if not response.is_redirect:
+                    return ""
+                target = urljoin(target, response.headers["Location"])
+                if not self.__is_short(target):
+                    return target
+        except HTTPError as error:
+            if proxy:
+                self.proxy_pool.failure(proxy)
+            logging(
+                self.print,
+                _("网络异常，{0} 请求失败: {1}").format(url, repr(error)),
+                ERROR,
+            )
+        return ""
+
+    async def __request(self, url: str, proxy: str | None):
+        if not proxy:
+            return await self.client.get(url, follow_redirects=False)
+        async with self.client_pool.client(proxy) as client:
+            return await client.get(url, follow_redirects=False)
+
+    def __is_short(self, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        return host == self.HOST or host.endswith(f".{self.HOST}")
+
+    async def __aenter__(self):
+        self.database = await connect(self.file)
+        await self.database.execute("PRAGMA journal_mode=WAL;")
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS short_link ("
+            "URL TEXT PRIMARY KEY,"
+            "EXPIRES REAL NOT NULL,"
+            "TARGET TEXT NOT NULL"
+            ");"
+        )
+        await self.database.execute(
+            "DELETE FROM short_link WHERE EXPIRES<=?", (time(),)
+        )
+        await self.database.commit()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.database:
+            await self.database.close()
+            self.database = None
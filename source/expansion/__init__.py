@@ -1,9 +1,15 @@
+from .bloom import BloomFilter
 from .browser import BrowserCookie
 from .cleaner import Cleaner
 from .converter import Converter
 from .error import CacheError
+from .file_folder import DirectoryIndex
 from .file_folder import file_switch
 from .file_folder import remove_empty_directories
+from .links import Link
+from .links import LinkClassifier
+from .namespace import Accessor
+from .namespace import AccessorTree
 from .namespace import Namespace
 from .truncate import beautify_string
 from .truncate import trim_string
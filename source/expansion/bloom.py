@@ -0,0 +1,32 @@
+from hashlib import blake2b
+from math import ceil, log
+
+__all__ = ["BloomFilter"]
+
+
+class BloomFilter:
+    """布隆过滤器，判断不存在时结果可靠，判断存在时可能误判"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __indexes(self, key: str):
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:], "little") | 1
+        return ((a + i * b) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for i in self.__indexes(key):
+            self.bits[i >> 3] |= 1 << (i & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[i >> 3] & (1 << (i & 7)) for i in self.__indexes(key))
+
+    def __len__(self) -> int:
+        return self.count
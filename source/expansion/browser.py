@@ -1,7 +1,7 @@
 from contextlib import suppress
 from sys import platform
+from typing import TYPE_CHECKING
 
-from rich.console import Console
 from rookiepy import (
     arc,
     brave,
@@ -20,6 +20,9 @@ try:
 except ImportError:
     _ = lambda s: s
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
 __all__ = ["BrowserCookie"]
 
 
@@ -37,13 +40,19 @@ class BrowserCookie:
         "LibreWolf": (librewolf, "Linux, macOS, Windows"),
     }
 
+    @staticmethod
+    def __console() -> "Console":
+        from rich.console import Console
+
+        return Console()
+
     @classmethod
     def run(
         cls,
         domains: list[str],
-        console: Console = None,
+        console: "Console" = None,
     ) -> str | None:
-        console = console or Console()
+        console = console or cls.__console()
         options = "\n".join(
             f"{i}. {k}: {v[1]}"
             for i, (k, v) in enumerate(cls.SUPPORT_BROWSER.items(), start=1)
@@ -68,9 +77,9 @@ class BrowserCookie:
         cls,
         browser: str | int,
         domains: list[str],
-        console: Console = None,
+        console: "Console" = None,
     ) -> str:
-        console = console or Console()
+        console = console or cls.__console()
         if not (browser := cls.__browser_object(browser)):
             console.print(_("浏览器名称或序号输入错误！"))
             return ""
@@ -1,13 +1,20 @@
+from json import JSONDecoder
+from re import compile
 from typing import Union
 
-from lxml.etree import HTML
-from yaml import safe_load
+from yaml import YAMLError, safe_load
 
 __all__ = ["Converter"]
 
 
 class Converter:
-    INITIAL_STATE = "//script/text()"
+    INITIAL_STATE = "window.__INITIAL_STATE__="
+    SCRIPT_END = "</script>"
+    NOTE_DETAIL_MAP = '"noteDetailMap":'
+    # 匹配字符串字面量或 JS 字面量 undefined，字符串内容保持不变；
+    # undefined 转换为字符串 "undefined"，与 YAML 解析结果保持一致
+    UNDEFINED = compile(r'("[^"\\]*(?:\\.[^"\\]*)*")|\bundefined\b')
+    DECODER = JSONDecoder()
     KEYS_LINK = (
         "note",
         "noteDetailMap",
@@ -21,13 +28,47 @@ class Converter:
     def _extract_object(self, html: str) -> str:
         if not html:
             return ""
-        html_tree = HTML(html)
-        scripts = html_tree.xpath(self.INITIAL_STATE)
-        return self.get_script(scripts)
+        if (start := html.rfind(self.INITIAL_STATE)) == -1:
+            return ""
+        start += len(self.INITIAL_STATE)
+        if (end := html.find(self.SCRIPT_END, start)) == -1:
+            end = len(html)
+        return html[start:end].strip().rstrip(";")
+
+    @classmethod
+    def _normalize(cls, text: str) -> str:
+        if "undefined" not in text:
+            return text
+        return cls.UNDEFINED.sub(cls.__replace_undefined, text)
 
     @staticmethod
-    def _convert_object(text: str) -> dict:
-        return safe_load(text.lstrip("window.__INITIAL_STATE__="))
+    def __replace_undefined(match) -> str:
+        return match.group(1) or '"undefined"'
+
+    @classmethod
+    def _convert_object(cls, text: str) -> dict:
+        if not text:
+            return {}
+        try:
+            return cls._convert_partial(text)
+        except ValueError:
+            return cls._convert_yaml(text)
+
+    @classmethod
+    def _convert_partial(cls, text: str) -> dict:
+        """仅解码 noteDetailMap 对象，跳过初始状态中的其他数据"""
+        if (start := text.find(cls.NOTE_DETAIL_MAP)) == -1:
+            return {}
+        text = cls._normalize(text[start + len(cls.NOTE_DETAIL_MAP) :].lstrip())
+        data, __ = cls.DECODER.raw_decode(text)
+        return {"note": {"noteDetailMap": data}}
+
+    @staticmethod
+    def _convert_yaml(text: str) -> dict:
+        try:
+            return safe_load(text)
+        except YAMLError:
+            return {}
 
     @classmethod
     def _filter_object(cls, data: dict) -> dict:
@@ -54,11 +95,3 @@ class Converter:
         elif isinstance(data, list | tuple | set):
             return data[index]
         raise TypeError
-
-    @staticmethod
-    def get_script(scripts: list) -> str:
-        scripts.reverse()
-        for script in scripts:
-            if script.startswith("window.__INITIAL_STATE__"):
-                return script
-        return ""
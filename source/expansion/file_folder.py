@@ -1,4 +1,6 @@
+from collections import OrderedDict
 from contextlib import suppress
+from os import scandir
 from pathlib import Path
 
 
@@ -23,3 +25,49 @@ def remove_empty_directories(path: Path) -> None:
         if not dir_names and not file_names:
             with suppress(OSError):
                 dir_path.rmdir()
+
+
+class DirectoryIndex:
+    """目录文件名索引
+
+    首次访问目录时读取一次目录内容，之后的文件存在判断优先查询内存索引，索引命中时再检查文件是否仍然存在；
+    写入目录的文件需要调用 add 同步更新索引，超出数量上限时淘汰最久未使用的目录
+    """
+
+    def __init__(self, size: int = 256):
+        self.size = size
+        self.folders: OrderedDict[Path, set[str]] = OrderedDict()
+
+    def names(self, folder: Path) -> set[str]:
+        if (names := self.folders.get(folder)) is None:
+            names = self.folders[folder] = self.__scan(folder)
+            while len(self.folders) > self.size:
+                self.folders.popitem(last=False)
+        else:
+            self.folders.move_to_end(folder)
+        return names
+
+    def exists(self, folder: Path, name: str) -> bool:
+        if name not in (names := self.names(folder)):
+            return False
+        # 文件可能已在程序运行期间被删除
+        if folder.joinpath(name).exists():
+            return True
+        names.discard(name)
+        return False
+
+    def add(self, folder: Path, name: str) -> None:
+        if (names := self.folders.get(folder)) is not None:
+            names.add(name)
+
+    def discard(self, folder: Path, name: str) -> None:
+        if (names := self.folders.get(folder)) is not None:
+            names.discard(name)
+
+    @staticmethod
+    def __scan(folder: Path) -> set[str]:
+        try:
+            with scandir(folder) as entries:
+                return {i.name for i in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
@@ -0,0 +1,67 @@
+from re import compile
+from typing import Iterator, NamedTuple
+from urllib.parse import unquote
+
+__all__ = ["Link", "LinkClassifier"]
+
+
+class Link(NamedTuple):
+    """链接分类结果
+
+    kind: 链接类型，short 短链接、share 分享链接、link 作品链接、user 用户主页作品链接
+    url: 链接，缺少协议时补全为 https
+    id: 作品 ID，短链接为空字符串
+    token: xsec_token 参数，不存在时为空字符串
+    """
+
+    kind: str
+    url: str
+    id: str
+    token: str
+
+
+class LinkClassifier:
+    """合并全部链接格式的正则表达式，一次扫描即可完成提取、分类与作品 ID 读取"""
+
+    PATTERN = compile(
+        r"(?P<url>(?:https?://)?(?:"
+        r"www\.xiaohongshu\.com/(?:"
+        r"explore/(?P<link>[^/?\s]+)"
+        r"|discovery/item/(?P<share>[^/?\s]+)"
+        r"|user/profile/[a-z0-9]+/(?P<user>[^/?\s]+)"
+        r")(?:[^\s]*?[?&]xsec_token=(?P<token>[^&#\s]+))?[^\s]*"
+        r"|(?P<short>xhslink\.com/[^\s\"<>\\^`{|}，。；！？、【】《》]+)"
+        r"))"
+    )
+    KINDS = (
+        "short",
+        "share",
+        "link",
+        "user",
+    )
+
+    @classmethod
+    def scan(cls, text: str) -> Iterator[Link]:
+        """按出现顺序返回文本中的全部链接"""
+        for match in cls.PATTERN.finditer(text or ""):
+            yield cls.__build(match)
+
+    @classmethod
+    def classify(cls, text: str) -> Link | None:
+        """返回文本中的第一个链接，不存在链接时返回 None"""
+        if match := cls.PATTERN.search(text or ""):
+            return cls.__build(match)
+        return None
+
+    @classmethod
+    def __build(cls, match) -> Link:
+        url = match["url"]
+        if not url.startswith("http"):
+            url = f"https://{url}"
+        kind = next(i for i in cls.KINDS if match[i])
+        return Link(
+            kind,
+            url,
+            "" if kind == "short" else match[kind],
+            unquote(match["token"] or ""),
+        )
@@ -1,71 +1,126 @@
-from copy import deepcopy
+from functools import lru_cache
 from types import SimpleNamespace
-from typing import Union
+from typing import Any, Union
 
-__all__ = ["Namespace"]
+__all__ = ["Namespace", "Accessor", "AccessorTree"]
 
+MISSING = object()
+INVALID = object()
 
-class Namespace:
-    def __init__(self, data: dict) -> None:
-        self.data: SimpleNamespace = self.generate_data_object(data)
 
-    @staticmethod
-    def generate_data_object(data: dict) -> SimpleNamespace:
-        def depth_conversion(element):
-            if isinstance(element, dict):
-                return SimpleNamespace(
-                    **{k: depth_conversion(v) for k, v in element.items()}
-                )
-            elif isinstance(element, list):
-                return [depth_conversion(item) for item in element]
-            else:
-                return element
+class Accessor:
+    """预编译的属性链读取器，直接读取原始数据，不转换、不复制数据"""
 
-        return depth_conversion(data)
+    __slots__ = (
+        "chain",
+        "steps",
+    )
 
-    def safe_extract(
+    def __init__(self, chain: str) -> None:
+        self.chain = chain
+        self.steps = self.parse(chain)
+
+    def __call__(
         self,
-        attribute_chain: str,
+        data: Any,
         default: Union[str, int, list, dict, SimpleNamespace] = "",
     ):
-        return self.__safe_extract(self.data, attribute_chain, default)
+        for attribute, index in self.steps:
+            if (data := self.step(data, attribute, index)) is MISSING:
+                return default
+        return data or default
+
+    def __repr__(self) -> str:
+        return f"Accessor({self.chain!r})"
 
     @staticmethod
-    def __safe_extract(
-        data_object: SimpleNamespace,
-        attribute_chain: str,
-        default: Union[str, int, list, dict, SimpleNamespace] = "",
-    ):
-        data = deepcopy(data_object)
-        attributes = attribute_chain.split(".")
-        for attribute in attributes:
+    def parse(chain: str) -> tuple[tuple[str, int | None], ...]:
+        steps = []
+        for attribute in chain.split("."):
             if "[" in attribute:
-                parts = attribute.split("[", 1)
-                attribute = parts[0]
-                index = parts[1][:-1]
+                attribute, index = attribute.split("[", 1)
                 try:
-                    index = int(index)
-                    data = getattr(data, attribute, None)[index]
-                except (IndexError, TypeError, ValueError):
-                    return default
+                    index = int(index[:-1])
+                except ValueError:
+                    index = INVALID
+                steps.append((attribute, index))
             else:
-                data = getattr(data, attribute, None)
-                if not data:
-                    return default
-        return data or default
+                steps.append((attribute, None))
+        return tuple(steps)
+
+    @staticmethod
+    def step(data: Any, attribute: str, index: int | None):
+        """读取属性链中的一个节点，读取失败时返回 MISSING"""
+        value = (
+            data.get(attribute)
+            if isinstance(data, dict)
+            else getattr(data, attribute, None)
+        )
+        if index is None:
+            return value or MISSING
+        if index is INVALID:
+            return MISSING
+        try:
+            return value[index]
+        except (IndexError, KeyError, TypeError):
+            return MISSING
+
+
+class AccessorTree:
+    """将多条属性链合并为前缀树，一次遍历即可读取全部属性链的值"""
+
+    def __init__(self, chains: list[str] | tuple[str, ...]) -> None:
+        self.chains = tuple(dict.fromkeys(chains))
+        self.tree: dict = {}
+        for chain in self.chains:
+            node = self.tree
+            steps = Accessor.parse(chain)
+            for i, step in enumerate(steps, start=1):
+                ends, children = node.setdefault(step, ([], {}))
+                if i == len(steps):
+                    ends.append(chain)
+                node = children
+
+    def __call__(self, data: Any) -> dict[str, Any]:
+        """返回属性链与读取结果的映射，读取失败的属性链不会出现在结果中"""
+        values = {}
+        self.__walk(data, self.tree, values)
+        return values
+
+    def __walk(self, data: Any, tree: dict, values: dict) -> None:
+        for (attribute, index), (ends, children) in tree.items():
+            if (value := Accessor.step(data, attribute, index)) is MISSING:
+                continue
+            for chain in ends:
+                values[chain] = value
+            if children:
+                self.__walk(value, children, values)
+
+
+class Namespace:
+    def __init__(self, data: dict) -> None:
+        self.data: dict = data or {}
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def compile(attribute_chain: str) -> Accessor:
+        return Accessor(attribute_chain)
+
+    def safe_extract(
+        self,
+        attribute_chain: str,
+        default: Union[str, int, list, dict, SimpleNamespace] = "",
+    ):
+        return self.compile(attribute_chain)(self.data, default)
 
     @classmethod
     def object_extract(
         cls,
-        data_object: SimpleNamespace,
+        data_object: dict | SimpleNamespace,
         attribute_chain: str,
         default: Union[str, int, list, dict, SimpleNamespace] = "",
     ):
-        return cls.__safe_extract(
-            data_object,
-            attribute_chain,
-            default,
-        )
+        return cls.compile(attribute_chain)(data_object, default)
 
     @property
     def __dict__(self):
@@ -73,6 +128,8 @@ class Namespace:
 
     @classmethod
     def convert_to_dict(cls, data) -> dict:
+        if isinstance(data, dict):
+            return data
         return {
             key: cls.convert_to_dict(value)
             if isinstance(value, SimpleNamespace)
@@ -81,4 +138,4 @@ class Namespace:
         }
 
     def __bool__(self):
-        return bool(vars(self.data))
+        return bool(self.data)
@@ -1,11 +1,8 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .extend import Account
 from .manager import Manager
-from .model import (
-    ExtractData,
-    ExtractParams,
-    SearchData,
-    SearchParams,
-)
 from .recorder import DataRecorder
 from .recorder import IDRecorder
 from .recorder import MapRecorder
@@ -33,6 +30,12 @@ from .static import (
     FILE_SIGNATURES,
     FILE_SIGNATURES_LENGTH,
     MAX_WORKERS,
+    COOKIE_POOL,
+    DETAIL_CACHE,
+    DOWNLOAD_CONCURRENCY,
+    PIPELINE_WORKERS,
+    RATE_LIMIT,
+    SEGMENT_DOWNLOAD,
     __VERSION__,
 )
 from .tools import (
@@ -41,4 +44,58 @@ from .tools import (
     sleep_time,
     retry_limited,
 )
-from .script import ScriptServer
+
+if TYPE_CHECKING:
+    from .cache import DetailCache
+    from .client import ClientPool
+    from .cookie import CookiePool
+    from .flight import SingleFlight
+    from .journal import BatchJournal
+    from .limiter import RateLimiter, TokenBucket
+    from .proxy import ProxyPool
+    from .scheduler import AdaptiveLimiter, HostScheduler
+    from .writer import FileWriter
+    from .model import (
+        BatchData,
+        BatchParams,
+        ExtractData,
+        ExtractParams,
+        JobData,
+        JobItem,
+        SearchData,
+        SearchParams,
+    )
+    from .script import ScriptServer
+
+# 数据模型依赖 pydantic，脚本服务器依赖 websockets，仅在使用时导入；
+# 缓存、批量进度记录等组件由各自的使用方导入
+__MODULES = {
+    "AdaptiveLimiter": ".scheduler",
+    "BatchJournal": ".journal",
+    "ClientPool": ".client",
+    "CookiePool": ".cookie",
+    "DetailCache": ".cache",
+    "FileWriter": ".writer",
+    "HostScheduler": ".scheduler",
+    "ProxyPool": ".proxy",
+    "RateLimiter": ".limiter",
+    "SingleFlight": ".flight",
+    "TokenBucket": ".limiter",
+    "BatchData": ".model",
+    "BatchParams": ".model",
+    "ExtractData": ".model",
+    "ExtractParams": ".model",
+    "JobData": ".model",
+    "JobItem": ".model",
+    "SearchData": ".model",
+    "SearchParams": ".model",
+    "ScriptServer": ".script",
+}
+
+
+def __getattr__(name: str):
+    if module := __MODULES.get(name):
+        value = getattr(import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
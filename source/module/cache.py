@@ -0,0 +1,144 @@
+from collections import OrderedDict
+from json import dumps, loads
+from time import time
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from aiosqlite import connect
+
+from .flight import SingleFlight
+
+if TYPE_CHECKING:
+    from ..module import Manager
+
+__all__ = ["DetailCache"]
+
+
+class DetailCache:
+    """作品详情缓存
+
+    内存缓存按最近使用顺序淘汰，超过有效期的数据视为不存在；可选启用 SQLite 持久化缓存，
+    内存未命中时读取持久化缓存；禁用缓存时仍会合并同一作品的并发请求
+    """
+
+    def __init__(self, manager: "Manager"):
+        self.file = manager.root.joinpath("DetailCache.db")
+        self.size = manager.detail_cache["size"]
+        self.ttl = manager.detail_cache["ttl"]
+        self.persist = manager.detail_cache["persist"]
+        self.switch = bool(self.size and self.ttl)
+        self.memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.flight = SingleFlight()
+        self.database = None
+        self.hits = 0
+        self.misses = 0
+
+    async def fetch(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[dict]],
+        store: Callable[[dict], bool] = bool,
+    ) -> dict:
+        """读取缓存，未命中时调用 loader 获取数据，store 判断结果是否写入缓存
+
+        同一作品的并发请求共享同一次 loader 调用，每个调用方获得独立的数据副本
+        """
+        if self.switch and (data := await self.get(key)) is not None:
+            return data
+        return loads(
+            dumps(
+                await self.flight.run(
+                    key,
+                    lambda: self.__load(key, loader, store),
+                )
+            )
+        )
+
+    async def __load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[dict]],
+        store: Callable[[dict], bool],
+    ) -> dict:
+        # 读取持久化缓存期间其他请求可能已经写入缓存
+        if self.switch and (item := self.memory.get(key)) and item[0] > time():
+            self.hits += 1
+            return loads(item[1])
+        self.misses += self.switch
+        data = await loader()
+        if self.switch and store(data):
+            await self.set(key, data)
+        return data
+
+    async def lookup(self, key: str) -> dict | None:
+        """读取缓存并统计命中情况，用于请求数据与写入缓存分开进行的调用方"""
+        if not self.switch:
+            return None
+        if (data := await self.get(key)) is None:
+            self.misses += 1
+        return data
+
+    async def store(self, key: str, data: dict) -> None:
+        if self.switch:
+            await self.set(key, data)
+
+    async def get(self, key: str) -> dict | None:
+        now = time()
+        if item := self.memory.get(key):
+            if item[0] > now:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return loads(item[1])
+            del self.memory[key]
+        if self.database:
+            async with self.database.execute(
+                "SELECT EXPIRES, DATA FROM detail_cache WHERE ID=?", (key,)
+            ) as cursor:
+                if (row := await cursor.fetchone()) and row[0] > now:
+                    self.__remember(key, row)
+                    self.hits += 1
+                    return loads(row[1])
+        return None
+
+    async def set(self, key: str, data: dict) -> None:
+        item = (time() + self.ttl, dumps(data, ensure_ascii=False))
+        self.__remember(key, item)
+        if self.database:
+            await self.database.execute(
+                "REPLACE INTO detail_cache VALUES (?, ?, ?);", (key, *item)
+            )
+            await self.database.commit()
+
+    def __remember(self, key: str, item: tuple[float, str]) -> None:
+        self.memory[key] = item
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.size:
+            self.memory.popitem(last=False)
+
+    def statistics(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.memory),
+        }
+
+    async def __aenter__(self):
+        if self.switch and self.persist:
+            self.database = await connect(self.file)
+            await self.database.execute("PRAGMA journal_mode=WAL;")
+            await self.database.execute(
+                "CREATE TABLE IF NOT EXISTS detail_cache ("
+                "ID TEXT PRIMARY KEY,"
+                "EXPIRES REAL NOT NULL,"
+                "DATA TEXT NOT NULL"
+                ");"
+            )
+            await self.database.execute(
+                "DELETE FROM detail_cache WHERE EXPIRES<=?", (time(),)
+            )
+            await self.database.commit()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.database:
+            await self.database.close()
+            self.database = None
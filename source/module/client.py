@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from time import monotonic
+
+from httpx import AsyncClient, AsyncHTTPTransport, Limits
+
+__all__ = ["ClientPool"]
+
+
+class PooledClient:
+    __slots__ = (
+        "client",
+        "used",
+        "active",
+    )
+
+    def __init__(self, client: AsyncClient):
+        self.client = client
+        self.used = monotonic()
+        self.active = 0
+
+
+class ClientPool:
+    """按代理地址复用异步客户端
+
+    每个代理地址对应一个独立的连接池，客户端数量超过上限时关闭最久未使用的客户端，
+    闲置超时的客户端同样会被关闭，正在使用的客户端不会被关闭
+    """
+
+    def __init__(
+        self,
+        headers: dict,
+        timeout: int,
+        size: int = 8,
+        idle: float = 300,
+        limits: Limits = None,
+    ):
+        self.headers = headers
+        self.timeout = timeout
+        self.limits = limits
+        self.size = size
+        self.idle = idle
+        self.clients: OrderedDict[str, PooledClient] = OrderedDict()
+
+    @asynccontextmanager
+    async def client(self, proxy: str):
+        await self.__evict(proxy)
+        if pooled := self.clients.get(proxy):
+            self.clients.move_to_end(proxy)
+        else:
+            pooled = self.clients[proxy] = PooledClient(self.__create_client(proxy))
+        pooled.active += 1
+        try:
+            yield pooled.client
+        finally:
+            pooled.active -= 1
+            pooled.used = monotonic()
+
+    def __create_client(self, proxy: str) -> AsyncClient:
+        return AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            verify=False,
+            follow_redirects=True,
+            mounts={
+                "http://": self.__create_transport(proxy),
+                "https://": self.__create_transport(proxy),
+            },
+        )
+
+    def __create_transport(self, proxy: str) -> AsyncHTTPTransport:
+        if self.limits:
+            return AsyncHTTPTransport(proxy=proxy, limits=self.limits)
+        return AsyncHTTPTransport(proxy=proxy)
+
+    async def __evict(self, keep: str) -> None:
+        now = monotonic()
+        overflow = len(self.clients) - self.size + (keep not in self.clients)
+        for proxy, pooled in list(self.clients.items()):
+            if pooled.active or proxy == keep:
+                continue
+            if overflow > 0 or now - pooled.used >= self.idle:
+                del self.clients[proxy]
+                overflow -= 1
+                await pooled.client.aclose()
+
+    async def close(self) -> None:
+        clients, self.clients = list(self.clients.values()), OrderedDict()
+        for pooled in clients:
+            await pooled.client.aclose()
@@ -0,0 +1,173 @@
+from time import monotonic
+from typing import Callable, Iterable
+
+from ..translation import _
+from .limiter import RateLimiter
+from .static import INFO, WARNING
+from .tools import logging
+
+__all__ = ["CookiePool"]
+
+
+class CookieState:
+    __slots__ = (
+        "cookie",
+        "identity",
+        "failures",
+        "requests",
+        "used",
+        "opened",
+        "cooldown",
+        "probing",
+    )
+
+    def __init__(self, cookie: str):
+        self.cookie = cookie
+        self.identity = RateLimiter.identity(cookie)
+        self.failures = 0
+        self.requests = 0
+        self.used = 0.0
+        self.opened = 0.0
+        self.cooldown = 0.0
+        self.probing = 0.0
+
+    @property
+    def status(self) -> str:
+        if not self.opened:
+            return "active"
+        return (
+            "probing" if monotonic() >= self.opened + self.cooldown else "quarantined"
+        )
+
+
+class CookiePool:
+    """Cookie 池
+
+    按轮询或最近最少使用的方式为请求分配 Cookie，请求频率按 Cookie 分别限制，可用 Cookie 越多请求速度越快；
+    请求被限制或连续重定向到错误页面的 Cookie 暂停使用，冷却结束后仅放行一个试探请求，失败时延长冷却时间；
+    全部 Cookie 暂停使用时请求不携带 Cookie
+    """
+
+    # 触发暂停的连续失败次数、初始与最大冷却时间(秒)、表示请求被限制的响应状态码
+    THRESHOLD = 3
+    COOLDOWN = 600
+    MAX_COOLDOWN = 3600
+    THROTTLE = {429, 461}
+    MODES = ("lru", "round")
+
+    def __init__(
+        self,
+        cookies: Iterable[str],
+        mode: str = "lru",
+        print_object: Callable = None,
+    ):
+        self.print = print_object
+        self.mode = mode if mode in self.MODES else "lru"
+        self.cookies = {i: CookieState(i) for i in cookies}
+        self.order = list(self.cookies.values())
+        self.position = 0
+        self.exhausted = False
+
+    def __bool__(self) -> bool:
+        return bool(self.cookies)
+
+    def __len__(self) -> int:
+        return len(self.cookies)
+
+    def __iter__(self):
+        return iter(self.cookies)
+
+    def select(self, exclude: Iterable[str] = ()) -> str | None:
+        """返回下一个可用 Cookie，优先返回 exclude 以外的 Cookie；全部 Cookie 暂停使用时返回 None"""
+        exclude = set(exclude)
+        now = monotonic()
+        available = [
+            (index, i)
+            for index, i in enumerate(self.order)
+            if i.status == "active"
+            # 试探请求未返回结果时，超过冷却时间后允许再次试探
+            or (i.status == "probing" and now - i.probing >= self.COOLDOWN)
+        ]
+        if not available:
+            if self.cookies and not self.exhausted:
+                self.exhausted = True
+                self.__log(_("所有 Cookie 均暂停使用，请求将不携带 Cookie"), WARNING)
+            return None
+        self.exhausted = False
+        if self.mode == "round":
+            # 从上次分配的 Cookie 之后开始查找
+            index, state = min(
+                available,
+                key=lambda x: (
+                    x[1].cookie in exclude,
+                    (x[0] - self.position) % len(self.order),
+                ),
+            )
+            self.position = index + 1
+        else:
+            __, state = min(
+                available,
+                key=lambda x: (x[1].cookie in exclude, x[1].used),
+            )
+        if state.opened:
+            state.probing = now
+        state.used = now
+        state.requests += 1
+        return state.cookie
+
+    def success(self, cookie: str) -> None:
+        if not (state := self.cookies.get(cookie)):
+            return
+        state.failures = 0
+        state.probing = 0.0
+        if state.opened:
+            state.opened = 0.0
+            state.cooldown = 0.0
+            self.__log(
+                _("Cookie {0} 恢复可用").format(state.identity),
+                INFO,
+            )
+
+    def failure(self, cookie: str, trip: bool = False) -> bool:
+        """记录请求失败，trip 为 True 时立即暂停使用该 Cookie；返回该 Cookie 是否已暂停使用"""
+        if not (state := self.cookies.get(cookie)):
+            return False
+        state.failures += 1
+        probing, state.probing = bool(state.probing), 0.0
+        if state.status == "quarantined":
+            return True
+        if probing or trip or state.failures >= self.THRESHOLD:
+            self.__open(state)
+            return True
+        return False
+
+    def __open(self, state: CookieState) -> None:
+        # 冷却结束后再次失败时冷却时间加倍
+        state.cooldown = (
+            min(state.cooldown * 2, self.MAX_COOLDOWN)
+            if state.cooldown
+            else self.COOLDOWN
+        )
+        state.opened = monotonic()
+        self.__log(
+            _("Cookie {0} 请求受限，暂停使用 {1} 秒").format(
+                state.identity, int(state.cooldown)
+            ),
+            WARNING,
+        )
+
+    def __log(self, text: str, style: str) -> None:
+        if self.print:
+            logging(self.print, text, style)
+
+    def statistics(self) -> list[dict]:
+        """各 Cookie 的状态，以摘要代替 Cookie 内容"""
+        return [
+            {
+                "cookie": i.identity,
+                "status": i.status,
+                "failures": i.failures,
+                "requests": i.requests,
+            }
+            for i in self.order
+        ]
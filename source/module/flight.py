@@ -0,0 +1,41 @@
+from asyncio import CancelledError, Future, current_task, get_running_loop, shield
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+__all__ = ["SingleFlight"]
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """相同键的并发调用只执行一次，其余调用等待并共享同一执行结果"""
+
+    def __init__(self):
+        self.pending: dict[Hashable, Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.pending
+
+    async def run(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        while future := self.pending.get(key):
+            try:
+                # 等待方被取消时不影响共享的执行结果
+                return await shield(future)
+            except CancelledError:
+                # 执行方被取消时，由等待方重新执行
+                if not future.cancelled() or current_task().cancelling():
+                    raise
+        future = self.pending[key] = get_running_loop().create_future()
+        try:
+            result = await function()
+            future.set_result(result)
+            return result
+        except CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # 没有等待方时避免未获取的异常产生警告
+            future.exception()
+            raise
+        finally:
+            del self.pending[key]
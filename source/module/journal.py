@@ -0,0 +1,83 @@
+from pathlib import Path
+from time import time
+
+from aiosqlite import connect
+
+__all__ = ["BatchJournal"]
+
+
+class BatchJournal:
+    """批量下载进度记录
+
+    每个链接的处理状态保存在链接文件同目录的 SQLite 文件中，程序中断后再次运行时从中断位置继续
+    """
+
+    PENDING = "pending"
+    PARSED = "parsed"
+    DOWNLOADED = "downloaded"
+    FAILED = "failed"
+
+    def __init__(self, file: Path):
+        self.file = file.with_name(f"{file.name}.journal.db")
+        self.database = None
+
+    async def register(self, urls: list[str]) -> list[str]:
+        """写入新链接，返回其中尚未完成且未失败的链接"""
+        now = time()
+        await self.database.executemany(
+            "INSERT OR IGNORE INTO batch_item (URL, STATUS, UPDATED) VALUES (?, ?, ?);",
+            [(i, self.PENDING, now) for i in urls],
+        )
+        await self.database.commit()
+        placeholders = ", ".join("?" for __ in urls)
+        async with self.database.execute(
+            f"SELECT URL FROM batch_item WHERE URL IN ({placeholders}) "
+            "AND STATUS IN (?, ?) ORDER BY ROWID",
+            (*urls, self.PENDING, self.PARSED),
+        ) as cursor:
+            return [i[0] for i in await cursor.fetchall()]
+
+    async def update(self, url: str, status: str, message: str = "") -> None:
+        await self.database.execute(
+            "UPDATE batch_item SET STATUS=?, MESSAGE=?, UPDATED=? WHERE URL=?;",
+            (status, message, time(), url),
+        )
+        await self.database.commit()
+
+    async def select(self, status: str) -> list[str]:
+        async with self.database.execute(
+            "SELECT URL FROM batch_item WHERE STATUS=? ORDER BY ROWID", (status,)
+        ) as cursor:
+            return [i[0] for i in await cursor.fetchall()]
+
+    async def statistics(self) -> dict[str, int]:
+        result = dict.fromkeys(
+            (self.PENDING, self.PARSED, self.DOWNLOADED, self.FAILED),
+            0,
+        )
+        async with self.database.execute(
+            "SELECT STATUS, COUNT(*) FROM batch_item GROUP BY STATUS"
+        ) as cursor:
+            for status, count in await cursor.fetchall():
+                result[status] = count
+        return result
+
+    async def __aenter__(self):
+        self.database = await connect(self.file)
+        await self.database.execute("PRAGMA journal_mode=WAL;")
+        await self.database.execute("PRAGMA synchronous=NORMAL;")
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS batch_item ("
+            "URL TEXT PRIMARY KEY,"
+            "STATUS TEXT NOT NULL,"
+            "MESSAGE TEXT NOT NULL DEFAULT '',"
+            "UPDATED REAL NOT NULL"
+            ");"
+        )
+        await self.database.commit()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.database:
+            await self.database.close()
+            self.database = None
@@ -0,0 +1,76 @@
+from asyncio import Lock, sleep
+from hashlib import blake2b
+from random import uniform
+from time import monotonic
+from urllib.parse import urlparse
+
+__all__ = ["TokenBucket", "RateLimiter"]
+
+
+class TokenBucket:
+    """令牌桶，按固定速率生成令牌，最多积累 burst 个令牌"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = monotonic()
+        self.lock = Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = monotonic()
+                self.tokens = min(
+                    self.burst,
+                    self.tokens + (now - self.updated) * self.rate,
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await sleep((1 - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """请求频率限制
+
+    按域名、Cookie 与代理的组合分别限制请求频率，不同 Cookie 或代理的请求互不影响；
+    豁免域名的请求不受限制
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        jitter: float,
+        exempt: tuple[str, ...] = (),
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.exempt = exempt
+        self.buckets: dict[tuple[str, str, str], TokenBucket] = {}
+
+    async def acquire(
+        self,
+        url: str,
+        cookie: str = None,
+        proxy: str = None,
+    ) -> None:
+        host = urlparse(url).hostname or ""
+        if any(host == i or host.endswith(f".{i}") for i in self.exempt):
+            return
+        key = (host, self.identity(cookie), proxy or "")
+        if not (bucket := self.buckets.get(key)):
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.burst)
+        await bucket.acquire()
+        if self.jitter:
+            await sleep(uniform(0, self.jitter))
+
+    @staticmethod
+    def identity(cookie: str | None) -> str:
+        """Cookie 的摘要，避免在内存中以明文作为键保存"""
+        if not cookie:
+            return ""
+        return blake2b(cookie.encode(), digest_size=8).hexdigest()
@@ -1,20 +1,39 @@
+from asyncio import CancelledError, Task, create_task, gather, sleep
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 from pathlib import Path
 from re import compile, sub
 from shutil import move, rmtree
 from os import utime
+from time import monotonic, time
 from httpx import (
     AsyncClient,
     AsyncHTTPTransport,
     HTTPStatusError,
+    Limits,
     RequestError,
     TimeoutException,
-    get,
 )
 
 from source.expansion import remove_empty_directories
 
 from ..translation import _
-from .static import HEADERS, USERAGENT, WARNING
+from .client import ClientPool
+from .cookie import CookiePool
+from .limiter import RateLimiter
+from .proxy import ProxyPool
+from .scheduler import HostScheduler
+from .static import (
+    COOKIE_POOL,
+    DETAIL_CACHE,
+    DOWNLOAD_CONCURRENCY,
+    HEADERS,
+    PIPELINE_WORKERS,
+    RATE_LIMIT,
+    SEGMENT_DOWNLOAD,
+    USERAGENT,
+    WARNING,
+)
 from .tools import logging
 from typing import TYPE_CHECKING
 
@@ -41,6 +60,15 @@ class Manager:
         "作者昵称",
         "作者ID",
     )
+    # 作品数据中已有的字段，不允许作为额外字段
+    RESERVED_KEYS = NAME_KEYS + (
+        "作品链接",
+        "作者链接",
+        "时间戳",
+        "下载地址",
+        "动图地址",
+        "采集时间",
+    )
     NO_PROXY = {
         "http://": None,
         "https://": None,
@@ -57,7 +85,7 @@ class Manager:
         name_format: str,
         chunk: int,
         user_agent: str,
-        cookie: str,
+        cookie: str | list[str],
         proxy: str | dict,
         timeout: int,
         retry: int,
@@ -71,6 +99,14 @@ class Manager:
         author_archive: bool,
         write_mtime: bool,
         script_server: bool,
+        pipeline_workers: dict,
+        extra_fields: dict,
+        download_concurrency: dict,
+        segment_download: dict,
+        rate_limit: dict,
+        detail_cache: dict,
+        proxy_check: int,
+        cookie_pool: dict,
         cleaner: "Cleaner",
         print_object,
     ):
@@ -78,18 +114,23 @@ class Manager:
         self.root = root
         self.cleaner = cleaner
         self.temp = root.joinpath("Temp")
+        # 本次运行期间创建或写入过的文件夹，关闭程序时仅检查这些文件夹是否为空
+        self.directories: set[Path] = set()
         self.path = self.__check_path(path)
         self.folder = self.__check_folder(folder)
         self.compatible()
         self.blank_headers = HEADERS | {
             "user-agent": user_agent or USERAGENT,
         }
-        # 清理 Cookie 字符串中的换行符和其他非法字符
-        # HTTP header 值不能包含换行符、回车符等控制字符
-        cleaned_cookie = cookie.replace("\n", "").replace("\r", "").strip() if cookie else ""
-        self.headers = self.blank_headers | {
-            "cookie": cleaned_cookie,
-        }
+        self.cookie_pool_config = self.__check_cookie_pool(cookie_pool)
+        self.cookies = self.__check_cookies(cookie, self.cookie_pool_config["file"])
+        self.cookie_pool = CookiePool(
+            self.cookies,
+            self.cookie_pool_config["mode"],
+            self.print,
+        )
+        # Cookie 由 Cookie 池为每个请求分配，默认请求头不包含 Cookie，避免暂停使用的 Cookie 继续发送
+        self.headers = self.blank_headers.copy()
         self.retry = retry
         self.chunk = chunk
         self.name_format = self.__check_name_format(name_format)
@@ -97,32 +138,38 @@ class Manager:
         self.image_format = self.__check_image_format(image_format)
         self.folder_mode = self.check_bool(folder_mode, False)
         self.download_record = self.check_bool(download_record, True)
-        self.proxy_tip = None
-        self.proxy = self.__check_proxy(proxy)
-        self.print_proxy_tip()
+        self.proxy_tip: dict[str, tuple] = {}
+        # 启动时不测试代理，由 start_proxy_check 在后台测试
+        self.proxies = self.__check_proxies(proxy)
+        self.proxy_pool = ProxyPool(self.proxies, self.print)
+        self.proxy_check = self.__check_interval(proxy_check)
+        self.proxy_state: dict[str, dict] = {}
+        self.proxy_task: Task | None = None
         self.timeout = timeout
-        self.request_client = AsyncClient(
-            headers=self.headers
-            | {
-                "referer": "https://www.xiaohongshu.com/",
-            },
-            timeout=timeout,
-            verify=False,
-            follow_redirects=True,
-            mounts={
-                "http://": AsyncHTTPTransport(proxy=self.proxy),
-                "https://": AsyncHTTPTransport(proxy=self.proxy),
-            },
+        self.download_concurrency = self.__check_concurrency(download_concurrency)
+        self.scheduler = HostScheduler(**self.download_concurrency)
+        self.segment_download = self.__check_segments(segment_download)
+        self.rate_limit = self.__check_rate_limit(rate_limit)
+        self.detail_cache = self.__check_detail_cache(detail_cache)
+        self.rate_limiter = RateLimiter(
+            **self.rate_limit,
+            exempt=("xhslink.com",),
         )
-        self.download_client = AsyncClient(
-            headers=self.blank_headers,
-            timeout=timeout,
-            verify=False,
-            follow_redirects=True,
-            mounts={
-                "http://": AsyncHTTPTransport(proxy=self.proxy),
-                "https://": AsyncHTTPTransport(proxy=self.proxy),
-            },
+        # 直接连接的客户端，代理池中的代理均暂停使用时同样使用该客户端
+        self.request_client, self.download_client = self.__create_clients()
+        self.client_pool = ClientPool(
+            self.request_client.headers,
+            timeout,
+        )
+        self.download_pool = ClientPool(
+            self.blank_headers,
+            timeout,
+            limits=self.__download_limits(),
+        )
+        # 文件写入统一由单个专用线程执行
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="FileWriter",
         )
         self.image_download = self.check_bool(image_download, True)
         self.video_download = self.check_bool(video_download, True)
@@ -130,6 +177,13 @@ class Manager:
         self.author_archive = self.check_bool(author_archive, False)
         self.write_mtime = self.check_bool(write_mtime, False)
         self.script_server = self.check_bool(script_server, False)
+        self.pipeline_workers = self.__check_workers(pipeline_workers)
+        # 请求频率按 Cookie 分别限制，获取作品数据的并发数量不少于 Cookie 数量
+        self.pipeline_workers["fetch"] = max(
+            self.pipeline_workers["fetch"],
+            len(self.cookie_pool),
+        )
+        self.extra_fields = self.__check_fields(extra_fields)
         self.create_folder()
 
     def __check_path(self, path: str) -> Path:
@@ -204,12 +258,106 @@ class Manager:
         return value if isinstance(value, bool) else default
 
     async def close(self):
+        await self.stop_proxy_check()
         await self.request_client.aclose()
         await self.download_client.aclose()
+        await self.client_pool.close()
+        await self.download_pool.close()
+        self.io_executor.shutdown()
         # self.__clean()
+        self.prune_directories()
+
+    def record_directory(self, path: Path) -> None:
+        self.directories.add(path)
+
+    def prune_directories(self) -> None:
+        """删除本次运行期间创建或写入过的空文件夹，子文件夹优先处理"""
+        for path in sorted(
+            self.directories,
+            key=lambda i: len(i.parts),
+            reverse=True,
+        ):
+            # 文件夹非空时删除失败
+            with suppress(OSError):
+                path.rmdir()
+        self.directories.clear()
+
+    def sweep_directories(self) -> None:
+        """遍历全部数据文件夹并删除空文件夹，文件数量较多时耗时较长"""
         remove_empty_directories(self.root)
         remove_empty_directories(self.folder)
 
+    @staticmethod
+    def __check_workers(workers: dict | None) -> dict[str, int]:
+        workers = workers if isinstance(workers, dict) else {}
+        return {
+            k: v if isinstance(v := workers.get(k), int) and v > 0 else d
+            for k, d in PIPELINE_WORKERS.items()
+        }
+
+    @staticmethod
+    def __check_concurrency(concurrency: dict | None) -> dict[str, int | float]:
+        concurrency = concurrency if isinstance(concurrency, dict) else {}
+        result = {
+            k: v if isinstance(v := concurrency.get(k), int | float) and v > 0 else d
+            for k, d in DOWNLOAD_CONCURRENCY.items()
+        }
+        result["minimum"] = max(int(result["minimum"]), 1)
+        result["maximum"] = max(int(result["maximum"]), result["minimum"])
+        result["initial"] = int(result["initial"])
+        return result
+
+    @staticmethod
+    def __check_segments(segments: dict | None) -> dict[str, int]:
+        segments = segments if isinstance(segments, dict) else {}
+        return {
+            k: v if isinstance(v := segments.get(k), int) and v >= 0 else d
+            for k, d in SEGMENT_DOWNLOAD.items()
+        }
+
+    @staticmethod
+    def __check_rate_limit(rate_limit: dict | None) -> dict[str, int | float]:
+        rate_limit = rate_limit if isinstance(rate_limit, dict) else {}
+        result = {
+            k: v if isinstance(v := rate_limit.get(k), int | float) and v >= 0 else d
+            for k, d in RATE_LIMIT.items()
+        }
+        result["rate"] = result["rate"] or RATE_LIMIT["rate"]
+        result["burst"] = max(int(result["burst"]), 1)
+        return result
+
+    def __check_detail_cache(self, cache: dict | None) -> dict[str, int | bool]:
+        cache = cache if isinstance(cache, dict) else {}
+        return {
+            "size": v
+            if isinstance(v := cache.get("size"), int) and v >= 0
+            else DETAIL_CACHE["size"],
+            "ttl": v
+            if isinstance(v := cache.get("ttl"), int | float) and v >= 0
+            else DETAIL_CACHE["ttl"],
+            "persist": self.check_bool(cache.get("persist"), DETAIL_CACHE["persist"]),
+        }
+
+    def __download_limits(self) -> Limits:
+        # 作品文件分布于图片、视频等多个 CDN 域名，连接池上限按三个域名计算
+        return Limits(
+            max_connections=self.download_concurrency["maximum"] * 3,
+            max_keepalive_connections=self.download_concurrency["maximum"] * 2,
+        )
+
+    def __check_fields(self, fields: dict | None) -> dict[str, str | list[str]]:
+        if not isinstance(fields, dict):
+            return {}
+        return {
+            k: v
+            for k, v in fields.items()
+            if k not in self.RESERVED_KEYS
+            and (
+                isinstance(v, str)
+                or (isinstance(v, list) and all(isinstance(i, str) for i in v))
+            )
+        }
+
     def __check_name_format(self, format_: str) -> str:
         keys = format_.split()
         return next(
@@ -217,47 +365,181 @@ class Manager:
             format_,
         )
 
-    def __check_proxy(
+    def __create_clients(self) -> tuple[AsyncClient, AsyncClient]:
+        request_client = AsyncClient(
+            headers=self.headers
+            | {
+                "referer": "https://www.xiaohongshu.com/",
+            },
+            timeout=self.timeout,
+            verify=False,
+            follow_redirects=True,
+            mounts={
+                "http://": AsyncHTTPTransport(),
+                "https://": AsyncHTTPTransport(),
+            },
+        )
+        download_client = AsyncClient(
+            headers=self.blank_headers,
+            timeout=self.timeout,
+            verify=False,
+            follow_redirects=True,
+            mounts={
+                "http://": AsyncHTTPTransport(
+                    limits=self.__download_limits(),
+                ),
+                "https://": AsyncHTTPTransport(
+                    limits=self.__download_limits(),
+                ),
+            },
+        )
+        return request_client, download_client
+
+    @staticmethod
+    def __check_proxies(proxy: str | list | dict | None) -> list[str]:
+        """支持单个代理、空格分隔的多个代理与代理列表"""
+        match proxy:
+            case str():
+                proxy = proxy.split()
+            case dict():
+                proxy = list(proxy.values())
+            case list() | tuple():
+                pass
+            case _:
+                return []
+        return list(dict.fromkeys(i for i in proxy if i and isinstance(i, str)))
+
+    @staticmethod
+    def __check_cookie_pool(config: dict | None) -> dict[str, str]:
+        config = config if isinstance(config, dict) else {}
+        return {
+            k: v if isinstance(v := config.get(k), str) else d
+            for k, d in COOKIE_POOL.items()
+        }
+
+    def __check_cookies(self, cookie: str | list | None, file: str) -> list[str]:
+        """合并配置文件中的 Cookie 与 Cookie 文件中的 Cookie，Cookie 文件每行一个 Cookie"""
+        match cookie:
+            case str():
+                cookies = [cookie]
+            case list() | tuple():
+                cookies = [i for i in cookie if isinstance(i, str)]
+            case _:
+                cookies = []
+        if file:
+            cookies.extend(self.__read_cookie_file(file))
+        # 清理 Cookie 字符串中的换行符和其他非法字符
+        # HTTP header 值不能包含换行符、回车符等控制字符
+        cookies = (i.replace("\n", "").replace("\r", "").strip() for i in cookies)
+        return list(dict.fromkeys(i for i in cookies if i))
+
+    def __read_cookie_file(self, file: str) -> list[str]:
+        path = Path(file)
+        if not path.is_absolute():
+            path = self.root.joinpath(path)
+        try:
+            text = path.read_text(encoding="utf-8-sig")
+        except OSError as e:
+            logging(
+                self.print,
+                _("读取 Cookie 文件 {0} 失败：{1}").format(path, e),
+                WARNING,
+            )
+            return []
+        lines = (i.strip() for i in text.splitlines())
+        return [i for i in lines if i and not i.startswith("#")]
+
+    @staticmethod
+    def __check_interval(interval: int | None) -> int:
+        return interval if isinstance(interval, int) and interval >= 0 else 300
+
+    def start_proxy_check(self) -> None:
+        """在后台测试代理，proxy_check 大于 0 时按间隔重复测试"""
+        if self.proxy_pool and not self.proxy_task:
+            self.proxy_task = create_task(self.__run_proxy_check())
+
+    async def stop_proxy_check(self) -> None:
+        if self.proxy_task:
+            self.proxy_task.cancel()
+            with suppress(CancelledError):
+                await self.proxy_task
+            self.proxy_task = None
+
+    async def __run_proxy_check(self) -> None:
+        while True:
+            await self.check_proxy()
+            if not self.proxy_check:
+                break
+            await sleep(self.proxy_check)
+
+    async def check_proxy(
         self,
-        proxy: str,
         url="https://www.xiaohongshu.com/explore",
-    ) -> str | None:
-        if proxy:
-            try:
-                response = get(
-                    url,
-                    proxy=proxy,
-                    timeout=10,
-                    headers={
-                        "User-Agent": USERAGENT,
-                    },
-                )
+    ) -> None:
+        """测试代理池中的全部代理，测试结果计入代理评分，测试失败的代理暂停使用"""
+        await gather(*(self.__check_proxy(i, url) for i in self.proxy_pool))
+
+    async def __check_proxy(self, proxy: str, url: str) -> bool:
+        start = monotonic()
+        try:
+            async with AsyncClient(
+                proxy=proxy,
+                timeout=10,
+                headers={
+                    "User-Agent": USERAGENT,
+                },
+            ) as client:
+                response = await client.get(url)
                 response.raise_for_status()
-                self.proxy_tip = (_("代理 {0} 测试成功").format(proxy),)
-                return proxy
-            except TimeoutException:
-                self.proxy_tip = (
-                    _("代理 {0} 测试超时").format(proxy),
-                    WARNING,
-                )
-            except (
-                RequestError,
-                HTTPStatusError,
-            ) as e:
-                self.proxy_tip = (
-                    _("代理 {0} 测试失败：{1}").format(
-                        proxy,
-                        e,
-                    ),
-                    WARNING,
-                )
-        return None
+            healthy = True
+            tip = (_("代理 {0} 测试成功").format(proxy),)
+        except TimeoutException:
+            healthy = False
+            tip = (
+                _("代理 {0} 测试超时").format(proxy),
+                WARNING,
+            )
+        except (
+            RequestError,
+            HTTPStatusError,
+        ) as e:
+            healthy = False
+            tip = (
+                _("代理 {0} 测试失败：{1}").format(
+                    proxy,
+                    e,
+                ),
+                WARNING,
+            )
+        latency = monotonic() - start
+        if healthy:
+            self.proxy_pool.success(proxy, latency)
+        else:
+            self.proxy_pool.failure(proxy, trip=True)
+        changed = healthy != self.proxy_state.get(proxy, {}).get("healthy")
+        self.proxy_state[proxy] = {
+            "healthy": healthy,
+            "checked": time(),
+            "message": tip[0],
+        }
+        # 仅在首次测试与代理状态变化时输出提示
+        if changed:
+            self.proxy_tip[proxy] = tip
+            logging(self.print, *tip)
+        return healthy
+
+    def proxy_statistics(self) -> list[dict]:
+        """代理池评分数据与最近一次代理测试结果"""
+        return [
+            i | {"check": self.proxy_state.get(i["proxy"])}
+            for i in self.proxy_pool.statistics()
+        ]
 
     def print_proxy_tip(
         self,
     ) -> None:
-        if self.proxy_tip:
-            logging(self.print, *self.proxy_tip)
+        for tip in self.proxy_tip.values():
+            logging(self.print, *tip)
 
     @classmethod
     def clean_cookie(cls, cookie_string: str) -> str:
@@ -284,6 +566,8 @@ class Manager:
     ):
         self.folder.mkdir(exist_ok=True)
         self.temp.mkdir(exist_ok=True)
+        self.record_directory(self.folder)
+        self.record_directory(self.temp)
 
     def compatible(
         self,
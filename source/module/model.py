@@ -33,3 +33,35 @@ class SearchData(BaseModel):
     message: str
     params: SearchParams
     data: list[dict] | None
+
+
+class BatchParams(BaseModel):
+    urls: list[str]
+    download: bool = False
+    index: list[str | int] | None = None
+    cookie: str = None
+    proxy: str = None
+    skip: bool = False
+
+
+class JobItem(BaseModel):
+    url: str
+    status: str
+    message: str = ""
+    data: dict | None = None
+
+
+class JobData(BaseModel):
+    id: str
+    status: str
+    created: float
+    finished: float | None = None
+    total: int
+    statistics: dict[str, int]
+    items: list[JobItem] | None = None
+
+
+class BatchData(BaseModel):
+    message: str
+    params: BatchParams
+    data: JobData | None
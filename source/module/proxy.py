@@ -0,0 +1,198 @@
+from asyncio import Event, wait_for
+from contextlib import suppress
+from math import ceil
+from time import monotonic
+from typing import Callable, Iterable
+
+from ..translation import _
+from .static import INFO, WARNING
+from .tools import logging
+
+__all__ = ["ProxyPool"]
+
+
+class ProxyState:
+    __slots__ = (
+        "proxy",
+        "latency",
+        "errors",
+        "failures",
+        "requests",
+        "opened",
+        "cooldown",
+        "probing",
+    )
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        self.latency = 0.0
+        self.errors = 0.0
+        self.failures = 0
+        self.requests = 0
+        self.opened = 0.0
+        self.cooldown = 0.0
+        self.probing = 0.0
+
+    @property
+    def status(self) -> str:
+        if not self.opened:
+            return "closed"
+        return "half-open" if monotonic() >= self.opened + self.cooldown else "open"
+
+
+class ProxyPool:
+    """代理池
+
+    按延迟与错误率的指数加权移动平均值为代理评分，优先使用评分最好的代理；
+    连续失败的代理暂停使用，冷却结束后仅放行一个试探请求，试探成功后恢复使用，失败时延长冷却时间；
+    全部代理暂停使用时，请求等待代理恢复，不会改为直接连接
+    """
+
+    # 移动平均权重、触发暂停的连续失败次数、初始与最大冷却时间(秒)
+    ALPHA = 0.3
+    THRESHOLD = 3
+    COOLDOWN = 30
+    MAX_COOLDOWN = 300
+
+    def __init__(self, proxies: Iterable[str], print_object: Callable = None):
+        self.print = print_object
+        self.proxies = {i: ProxyState(i) for i in proxies}
+        self.recovered = Event()
+        self.waiting = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.proxies)
+
+    def __iter__(self):
+        return iter(self.proxies)
+
+    def select(self, exclude: Iterable[str] = ()) -> str | None:
+        """返回评分最好的可用代理，优先返回 exclude 以外的代理；全部代理暂停使用时返回 None"""
+        exclude = set(exclude)
+        now = monotonic()
+        available = [
+            i
+            for i in self.proxies.values()
+            if i.status == "closed"
+            # 试探请求未返回结果时，超过冷却时间后允许再次试探
+            or (i.status == "half-open" and now - i.probing >= self.COOLDOWN)
+        ]
+        if not available:
+            return None
+        measured = [i.latency for i in self.proxies.values() if i.latency]
+        default = sum(measured) / len(measured) if measured else 0.0
+        state = min(
+            available,
+            key=lambda i: (
+                i.proxy in exclude,
+                self.__score(i, default),
+                i.errors,
+                # 评分相同时分散请求
+                i.requests,
+            ),
+        )
+        if state.opened:
+            state.probing = now
+        state.requests += 1
+        return state.proxy
+
+    async def acquire(self, exclude: Iterable[str] = ()) -> str | None:
+        """返回可用代理；全部代理暂停使用时等待最早结束冷却的代理，未设置代理时返回 None"""
+        exclude = set(exclude)
+        while self.proxies:
+            if proxy := self.select(exclude):
+                return proxy
+            delay = self.__delay()
+            if not self.waiting:
+                self.__log(
+                    _("所有代理均暂停使用，等待 {0} 秒后重试").format(ceil(delay)),
+                    WARNING,
+                )
+            self.waiting += 1
+            try:
+                # 代理恢复可用时提前结束等待
+                with suppress(TimeoutError):
+                    await wait_for(self.recovered.wait(), delay)
+            finally:
+                self.waiting -= 1
+        return None
+
+    def __delay(self) -> float:
+        """返回距离最早可以再次试探的代理结束冷却的秒数"""
+        return max(
+            min(
+                i.opened + i.cooldown
+                if i.status == "open"
+                else i.probing + self.COOLDOWN
+                for i in self.proxies.values()
+            )
+            - monotonic(),
+            0,
+        )
+
+    @staticmethod
+    def __score(state: ProxyState, default: float) -> float:
+        # 尚未测得延迟的代理按已测得延迟的平均值计算
+        return (state.latency or default) * (1 + 4 * state.errors)
+
+    def success(self, proxy: str, latency: float) -> None:
+        if not (state := self.proxies.get(proxy)):
+            return
+        state.latency = (
+            latency
+            if not state.latency
+            else self.ALPHA * latency + (1 - self.ALPHA) * state.latency
+        )
+        state.errors *= 1 - self.ALPHA
+        state.failures = 0
+        state.probing = 0.0
+        if state.opened:
+            state.opened = 0.0
+            state.cooldown = 0.0
+            self.__log(_("代理 {0} 恢复可用").format(proxy), INFO)
+            self.recovered.set()
+            self.recovered = Event()
+
+    def failure(self, proxy: str, trip: bool = False) -> None:
+        """记录请求失败，trip 为 True 时立即暂停使用该代理"""
+        if not (state := self.proxies.get(proxy)):
+            return
+        state.errors = self.ALPHA + (1 - self.ALPHA) * state.errors
+        state.failures += 1
+        probing, state.probing = bool(state.probing), 0.0
+        if state.status == "open":
+            return
+        if probing or trip or state.failures >= self.THRESHOLD:
+            self.__open(state)
+
+    def __open(self, state: ProxyState) -> None:
+        # 冷却结束后再次失败时冷却时间加倍
+        state.cooldown = (
+            min(state.cooldown * 2, self.MAX_COOLDOWN)
+            if state.cooldown
+            else self.COOLDOWN
+        )
+        state.opened = monotonic()
+        self.__log(
+            _("代理 {0} 请求失败，暂停使用 {1} 秒").format(
+                state.proxy, int(state.cooldown)
+            ),
+            WARNING,
+        )
+
+    def __log(self, text: str, style: str) -> None:
+        if self.print:
+            logging(self.print, text, style)
+
+    def statistics(self) -> list[dict]:
+        return [
+            {
+                "proxy": i.proxy,
+                "status": i.status,
+                "latency": round(i.latency, 3),
+                "error_rate": round(i.errors, 3),
+                "failures": i.failures,
+                "requests": i.requests,
+            }
+            for i in self.proxies.values()
+        ]
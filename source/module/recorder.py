@@ -1,9 +1,16 @@
-from asyncio import CancelledError
+from asyncio import CancelledError, Lock, create_task, sleep
 from contextlib import suppress
+from json import dumps
+from time import monotonic
 from typing import TYPE_CHECKING
 from shutil import move
 from aiosqlite import connect
 
+from ..expansion import BloomFilter
+from ..translation import _
+from .static import WARNING
+from .tools import logging
+
 if TYPE_CHECKING:
     from ..module import Manager
 
@@ -11,24 +18,70 @@ __all__ = ["IDRecorder", "DataRecorder", "MapRecorder"]
 
 
 class IDRecorder:
+    # 写入缓冲区达到指定行数或距离上次写入超过指定秒数时，批量写入数据库
+    BATCH_SIZE = 64
+    FLUSH_INTERVAL = 5
+    INSERT = "REPLACE INTO explore_id VALUES (?);"
+    # 下载记录数量不超过该值时使用集合精确索引，超过后改用布隆过滤器
+    INDEX_LIMIT = 500_000
+
     def __init__(self, manager: "Manager"):
         self.name = "ExploreID.db"
         self.file = manager.root.joinpath(self.name)
         self.changed = False
         self.switch = manager.download_record
+        self.print = manager.print
         self.database = None
         self.cursor = None
+        self.buffer: dict[str, tuple] = {}
+        self.flushed = monotonic()
+        self.lock = Lock()
+        self.timer = None
+        self.index: set[str] | None = None
+        self.bloom: BloomFilter | None = None
 
     async def _connect_database(self):
         self.database = await connect(self.file)
+        await self._tune_database()
         self.cursor = await self.database.cursor()
         await self.database.execute(
             "CREATE TABLE IF NOT EXISTS explore_id (ID TEXT PRIMARY KEY);"
         )
         await self.database.commit()
+        if self.switch:
+            await self.__load_index()
+
+    async def __load_index(self):
+        self.index, self.bloom = set(), None
+        async with self.database.execute("SELECT ID FROM explore_id") as cursor:
+            while rows := await cursor.fetchmany(10_000):
+                for (id_,) in rows:
+                    self.__index_add(id_)
+
+    def __index_add(self, id_: str) -> None:
+        if self.bloom is not None:
+            self.bloom.add(id_)
+            return
+        self.index.add(id_)
+        if len(self.index) > self.INDEX_LIMIT:
+            self.bloom = BloomFilter(self.INDEX_LIMIT * 4)
+            for i in self.index:
+                self.bloom.add(i)
+            self.index = None
+
+    async def _tune_database(self):
+        await self.database.execute("PRAGMA journal_mode=WAL;")
+        await self.database.execute("PRAGMA synchronous=NORMAL;")
 
     async def select(self, id_: str):
         if self.switch:
+            if id_ in self.buffer:
+                return (id_,)
+            if self.index is not None:
+                return (id_,) if id_ in self.index else None
+            if self.bloom is not None and id_ not in self.bloom:
+                return None
+            # 布隆过滤器可能误判或包含已删除的记录，需要查询数据库确认
             await self.cursor.execute("SELECT ID FROM explore_id WHERE ID=?", (id_,))
             return await self.cursor.fetchone()
 
@@ -40,32 +93,76 @@ class IDRecorder:
         **kwargs,
     ) -> None:
         if self.switch:
-            await self.database.execute("REPLACE INTO explore_id VALUES (?);", (id_,))
-            await self.database.commit()
+            if self.index is not None or self.bloom is not None:
+                self.__index_add(id_)
+            await self._buffer(id_, (id_,))
 
-    async def __delete(self, id_: str) -> None:
-        if id_:
-            await self.database.execute("DELETE FROM explore_id WHERE ID=?", (id_,))
+    async def _buffer(self, key: str, row: tuple) -> None:
+        if not self.database:
+            # 数据库连接关闭后缓存的数据无法写入，不再缓存
+            logging(
+                self.print,
+                _("{0} 未连接，{1} 的记录未保存").format(self.name, key),
+                WARNING,
+            )
+            return
+        self.buffer[key] = row
+        if (
+            len(self.buffer) >= self.BATCH_SIZE
+            or monotonic() - self.flushed >= self.FLUSH_INTERVAL
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self.lock:
+            self.flushed = monotonic()
+            if not self.buffer or not self.database:
+                return
+            rows, self.buffer = list(self.buffer.values()), {}
+            await self.database.executemany(self.INSERT, rows)
             await self.database.commit()
 
+    async def __flush_timer(self):
+        while True:
+            await sleep(self.FLUSH_INTERVAL)
+            await self.flush()
+
     async def delete(self, ids: list[str]):
         if self.switch:
-            [await self.__delete(i) for i in ids]
+            await self.flush()
+            await self.database.executemany(
+                "DELETE FROM explore_id WHERE ID=?", [(i,) for i in ids if i]
+            )
+            await self.database.commit()
+            if self.index is not None:
+                self.index.difference_update(ids)
 
     async def all(self):
         if self.switch:
+            await self.flush()
             await self.cursor.execute("SELECT ID FROM explore_id")
             return [i[0] for i in await self.cursor.fetchmany()]
 
     async def __aenter__(self):
         self.compatible()
         await self._connect_database()
+        if self.switch:
+            self.timer = create_task(self.__flush_timer())
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.timer:
+            self.timer.cancel()
+            with suppress(CancelledError):
+                await self.timer
+            self.timer = None
+        if not self.database:
+            return
+        await self.flush()
         with suppress(CancelledError):
             await self.cursor.close()
         await self.database.close()
+        self.database = None
 
     def compatible(
         self,
@@ -106,32 +203,44 @@ class DataRecorder(IDRecorder):
         self.file = manager.folder.joinpath(self.name)
         self.changed = True
         self.switch = manager.record_data
+        # 额外提取的字段同样写入数据库
+        self.table = self.DATA_TABLE + tuple((i, "TEXT") for i in manager.extra_fields)
+        self.INSERT = f"""REPLACE INTO explore_data (
+        {", ".join(self.__quote(i) for i, __ in self.table)}
+        ) VALUES (
+        {", ".join("?" for __ in self.table)}
+        );"""
 
     async def _connect_database(self):
         self.database = await connect(self.file)
+        await self._tune_database()
         self.cursor = await self.database.cursor()
         await self.database.execute(f"""CREATE TABLE IF NOT EXISTS explore_data (
-        {",".join(" ".join(i) for i in self.DATA_TABLE)}
+        {",".join(f"{self.__quote(i)} {j}" for i, j in self.table)}
         );""")
+        # 已有数据库缺少新增的额外字段时添加对应列
+        async with self.database.execute("PRAGMA table_info(explore_data);") as cursor:
+            columns = {i[1] for i in await cursor.fetchall()}
+        for i, j in self.table:
+            if i not in columns:
+                await self.database.execute(
+                    f"ALTER TABLE explore_data ADD COLUMN {self.__quote(i)} {j};"
+                )
         await self.database.commit()
 
+    @staticmethod
+    def __quote(name: str) -> str:
+        return '"{0}"'.format(name.replace('"', '""'))
+
     async def select(self, id_: str):
         pass
 
     async def add(self, **kwargs) -> None:
         if self.switch:
-            await self.database.execute(
-                f"""REPLACE INTO explore_data (
-        {", ".join(i[0] for i in self.DATA_TABLE)}
-        ) VALUES (
-        {", ".join("?" for _ in kwargs)}
-        );""",
+            await self._buffer(
+                kwargs["作品ID"],
                 self.__generate_values(kwargs),
             )
-            await self.database.commit()
-
-    async def __delete(self, id_: str) -> None:
-        pass
 
     async def delete(self, ids: list | tuple):
         pass
@@ -140,10 +249,19 @@ class DataRecorder(IDRecorder):
         pass
 
     def __generate_values(self, data: dict) -> tuple:
-        return tuple(data[i] for i, _ in self.DATA_TABLE)
+        return tuple(self.__value(data.get(i)) for i, __ in self.table)
+
+    @staticmethod
+    def __value(value):
+        # 额外字段可能为列表或字典，以 JSON 格式保存
+        if value is None or isinstance(value, str | int | float):
+            return value
+        return dumps(value, ensure_ascii=False)
 
 
 class MapRecorder(IDRecorder):
+    INSERT = "REPLACE INTO mapping_data VALUES (?, ?);"
+
     def __init__(self, manager: "Manager"):
         super().__init__(manager)
         self.name = "MappingData.db"
@@ -152,6 +270,7 @@ class MapRecorder(IDRecorder):
 
     async def _connect_database(self):
         self.database = await connect(self.file)
+        await self._tune_database()
         self.cursor = await self.database.cursor()
         await self.database.execute(
             "CREATE TABLE IF NOT EXISTS mapping_data ("
@@ -163,6 +282,8 @@ class MapRecorder(IDRecorder):
 
     async def select(self, id_: str):
         if self.switch:
+            if id_ in self.buffer:
+                return self.buffer[id_][1:]
             await self.cursor.execute(
                 "SELECT NAME FROM mapping_data WHERE ID=?", (id_,)
             )
@@ -170,22 +291,19 @@ class MapRecorder(IDRecorder):
 
     async def add(self, id_: str, name: str, *args, **kwargs) -> None:
         if self.switch:
-            await self.database.execute(
-                "REPLACE INTO mapping_data VALUES (?, ?);",
+            await self._buffer(
+                id_,
                 (
                     id_,
                     name,
                 ),
             )
-            await self.database.commit()
-
-    async def __delete(self, id_: str) -> None:
-        pass
 
     async def delete(self, ids: list[str]):
         pass
 
     async def all(self):
         if self.switch:
+            await self.flush()
             await self.cursor.execute("SELECT ID, NAME FROM mapping_data")
             return [i[0] for i in await self.cursor.fetchmany()]
@@ -0,0 +1,114 @@
+from asyncio import Condition
+from contextlib import asynccontextmanager
+from time import monotonic
+from urllib.parse import urlparse
+
+from httpx import HTTPError, HTTPStatusError
+
+__all__ = ["AdaptiveLimiter", "HostScheduler"]
+
+
+class AdaptiveLimiter:
+    """AIMD 自适应并发限制
+
+    请求成功且延迟未超过阈值时线性增加并发数量，请求失败或延迟超过阈值时将并发数量减半
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        latency: float,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency = latency
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.active = 0
+        self.decreased = 0.0
+        self.condition = Condition()
+
+    async def acquire(self) -> None:
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+
+    async def release(self, success: bool, elapsed: float) -> None:
+        async with self.condition:
+            self.active -= 1
+            if success and elapsed <= self.latency:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif (now := monotonic()) - self.decreased >= self.latency:
+                # 同一时间窗口内的多次失败只触发一次减半
+                self.limit = max(self.minimum, self.limit / 2)
+                self.decreased = now
+            self.condition.notify_all()
+
+
+class Slot:
+    __slots__ = (
+        "start",
+        "elapsed",
+        "success",
+    )
+
+    def __init__(self):
+        self.start = monotonic()
+        self.elapsed = 0.0
+        self.success = True
+
+    def respond(self) -> None:
+        """记录从发出请求到收到响应头的耗时"""
+        self.elapsed = monotonic() - self.start
+
+    def fail(self, error: HTTPError = None) -> None:
+        """记录请求失败，仅限流状态码、服务端错误与网络错误会触发降低并发"""
+        if isinstance(error, HTTPStatusError):
+            code = error.response.status_code
+            if code != 429 and code < 500:
+                return
+        self.success = False
+
+
+class HostScheduler:
+    """按域名分配下载并发数量，每个域名拥有独立的自适应并发限制"""
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        latency: float,
+    ):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency = latency
+        self.limiters: dict[str, AdaptiveLimiter] = {}
+
+    def limiter(self, url: str) -> AdaptiveLimiter:
+        host = urlparse(url).netloc
+        if not (limiter := self.limiters.get(host)):
+            limiter = self.limiters[host] = AdaptiveLimiter(
+                self.initial,
+                self.minimum,
+                self.maximum,
+                self.latency,
+            )
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        limiter = self.limiter(url)
+        await limiter.acquire()
+        slot = Slot()
+        try:
+            yield slot
+        except BaseException:
+            slot.success = False
+            raise
+        finally:
+            if not slot.elapsed:
+                slot.respond()
+            await limiter.release(slot.success, slot.elapsed)
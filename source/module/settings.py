@@ -2,7 +2,16 @@ from json import dump, load
 from pathlib import Path
 from platform import system
 from shutil import move
-from .static import ROOT, USERAGENT
+from .static import (
+    COOKIE_POOL,
+    DETAIL_CACHE,
+    DOWNLOAD_CONCURRENCY,
+    PIPELINE_WORKERS,
+    RATE_LIMIT,
+    ROOT,
+    SEGMENT_DOWNLOAD,
+    USERAGENT,
+)
 
 __all__ = ["Settings"]
 
@@ -15,8 +24,10 @@ class Settings:
         "folder_name": "Download",  # 下载文件夹名称
         "name_format": "发布时间 作者昵称 作品标题",  # 文件命名格式
         "user_agent": USERAGENT,  # 请求头
-        "cookie": "",  # Cookie
-        "proxy": None,  # 代理设置
+        "cookie": "",  # Cookie，多个 Cookie 设置为 Cookie 列表
+        "cookie_pool": COOKIE_POOL,  # Cookie 池的 Cookie 文件与分配方式
+        "proxy": None,  # 代理设置，多个代理使用空格分隔或设置为代理列表
+        "proxy_check": 300,  # 代理可用性检查间隔(秒)，设置为 0 时仅在启动后检查一次
         "timeout": 10,  # 超时时间(秒)
         "chunk": 1024 * 1024 * 2,  # 下载块大小(字节)
         "max_retry": 5,  # 最大重试次数
@@ -31,6 +42,12 @@ class Settings:
         "write_mtime": False,  # 是否写入修改时间
         "language": "zh_CN",  # 语言设置
         "script_server": False,  # 是否启用脚本服务器
+        "pipeline_workers": PIPELINE_WORKERS,  # 多链接处理各阶段并发数量
+        "download_concurrency": DOWNLOAD_CONCURRENCY,  # 每个域名的下载并发数量
+        "rate_limit": RATE_LIMIT,  # 请求作品页面的频率限制
+        "segment_download": SEGMENT_DOWNLOAD,  # 大文件分段下载的分段数量与最小文件大小
+        "detail_cache": DETAIL_CACHE,  # 作品详情缓存
+        "extra_fields": {},  # 额外提取的作品数据字段，例如 {"IP归属地": "ipLocation"}
     }
     # 根据操作系统设置编码格式
     encode = "UTF-8-SIG" if system() == "Windows" else "UTF-8"
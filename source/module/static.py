@@ -70,5 +70,49 @@ FILE_SIGNATURES_LENGTH = max(
 
 MAX_WORKERS: int = 4
 
+# 下载文件时每个域名的并发数量：初始值、最小值、最大值与触发降低并发的响应延迟(秒)
+DOWNLOAD_CONCURRENCY: dict[str, int | float] = {
+    "initial": MAX_WORKERS,
+    "minimum": 1,
+    "maximum": 16,
+    "latency": 5,
+}
+
+# 请求作品页面的频率限制：每秒生成的令牌数量、令牌桶容量与每次请求前的随机等待上限(秒)
+# 按域名、Cookie 与代理分别计算，短链接解析不受限制；随机等待默认关闭
+RATE_LIMIT: dict[str, int | float] = {
+    "rate": 0.5,
+    "burst": 2,
+    "jitter": 0,
+}
+
+# Cookie 池：Cookie 文件路径(每行一个 Cookie)与分配方式，分配方式支持 lru(最近最少使用) 与 round(轮询)
+COOKIE_POOL: dict[str, str] = {
+    "file": "",
+    "mode": "lru",
+}
+
+# 作品详情缓存：内存缓存数量上限、有效期(秒)与是否启用持久化缓存，数量上限或有效期为 0 时禁用
+DETAIL_CACHE: dict[str, int | bool] = {
+    "size": 256,
+    "ttl": 300,
+    "persist": False,
+}
+
+# 大文件分段下载：分段数量与启用分段下载的最小文件大小(字节)，分段数量小于 2 时禁用
+SEGMENT_DOWNLOAD: dict[str, int] = {
+    "count": 4,
+    "threshold": 32 * 1024 * 1024,
+}
+
+# 多链接处理流水线各阶段的默认并发数量
+PIPELINE_WORKERS: dict[str, int] = {
+    "resolve": 4,
+    "fetch": 2,
+    "parse": 1,
+    "download": 4,
+    "record": 1,
+}
+
 if __name__ == "__main__":
     print(__VERSION__)
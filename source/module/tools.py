@@ -2,9 +2,6 @@ from asyncio import sleep
 from random import uniform
 from typing import Callable
 
-from rich import print
-from rich.text import Text
-
 from ..translation import _
 from .static import INFO
 
@@ -39,6 +36,9 @@ def retry_limited(function):
 
 
 def logging(log: Callable, text, style=INFO):
+    from rich import print
+    from rich.text import Text
+
     string = Text(text, style=style)
     func = log()
     if func is print:
@@ -0,0 +1,110 @@
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from os import posix_fallocate
+except ImportError:
+    posix_fallocate = None
+
+from .static import FILE_SIGNATURES_LENGTH
+
+__all__ = ["FileWriter"]
+
+
+class FileWriter:
+    """异步写入文件
+
+    数据先在内存中合并为 size 整数倍的数据块，再交由专用 I/O 线程写入；打开、写入与关闭文件均在该线程中执行，
+    数据量不超过 size 的文件仅切换一次线程；文件起始字节保留在内存中，用于判断文件格式，无需重新读取文件
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        file: Path,
+        size: int,
+        offset: int = 0,
+        create: bool = True,
+    ):
+        """offset: 写入起始位置；create: offset 为 0 时是否新建文件，为 False 时写入已有文件
+
+        断点续传以文件大小作为已接收字节数，因此逐步写入的文件不预先分配磁盘空间
+        """
+        self.executor = executor
+        self.file = file
+        self.size = max(size, 1)
+        self.offset = offset
+        self.create = create and not offset
+        self.buffer = bytearray()
+        self.head = b""
+        self.written = 0
+        self.f = None
+
+    @staticmethod
+    async def allocate(executor: ThreadPoolExecutor, file: Path, length: int) -> None:
+        """新建指定大小的文件"""
+        await get_running_loop().run_in_executor(
+            executor,
+            FileWriter.__allocate,
+            file,
+            length,
+        )
+
+    @staticmethod
+    def __allocate(file: Path, length: int) -> None:
+        with file.open("wb") as f:
+            if posix_fallocate and length:
+                try:
+                    posix_fallocate(f.fileno(), 0, length)
+                    return
+                except OSError:
+                    # 文件系统不支持预分配时仅设置文件大小
+                    pass
+            f.truncate(length)
+
+    async def write(self, chunk: bytes) -> None:
+        if not self.offset and len(self.head) < FILE_SIGNATURES_LENGTH:
+            self.head += chunk[: FILE_SIGNATURES_LENGTH - len(self.head)]
+        self.buffer += chunk
+        if len(self.buffer) >= self.size:
+            await self.__flush(len(self.buffer) - len(self.buffer) % self.size)
+
+    async def __flush(self, length: int, close: bool = False) -> None:
+        data = bytes(self.buffer[:length])
+        del self.buffer[:length]
+        await get_running_loop().run_in_executor(
+            self.executor,
+            self.__write,
+            data,
+            close,
+        )
+
+    def __write(self, data: bytes, close: bool) -> None:
+        if not self.f:
+            self.__open()
+        try:
+            if data:
+                self.f.write(data)
+                self.written += len(data)
+        finally:
+            if close:
+                self.__close()
+
+    def __open(self) -> None:
+        self.f = self.file.open("wb" if self.create else "r+b")
+        if self.offset and len(self.head) < FILE_SIGNATURES_LENGTH:
+            # 断点续传时从已有文件读取起始字节
+            self.head = self.f.read(FILE_SIGNATURES_LENGTH)
+        self.f.seek(self.offset)
+
+    def __close(self) -> None:
+        self.f.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # 发生异常时同样写入已接收的数据，用于断点续传
+        if self.f or self.buffer or exc_type is None:
+            await self.__flush(len(self.buffer), True)
@@ -0,0 +1,54 @@
+"""Converter 单页解析耗时对比
+
+运行方式：python tests/benchmarks/converter.py
+"""
+
+from pathlib import Path
+from sys import path
+from timeit import Timer
+
+TESTS = Path(__file__).parents[1]
+path[:0] = [str(TESTS.parent), str(TESTS)]
+
+from legacy import LegacyConverter  # noqa: E402
+from source.expansion import Converter  # noqa: E402
+
+
+def large_page() -> str:
+    """页面初始状态包含约 100 KB 的其他数据，接近实际作品页面"""
+    html = TESTS.joinpath("data", "converter", "image_note.html").read_text(
+        encoding="utf-8"
+    )
+    padding = '"feed":{"items":[%s]},' % ",".join(
+        '{"id":"%024d","title":"%s","cover":"%s"}' % (i, "标题" * 20, "x" * 120)
+        for i in range(500)
+    )
+    return html.replace(
+        "window.__INITIAL_STATE__={", "window.__INITIAL_STATE__={" + padding, 1
+    )
+
+
+def measure(converter, html: str) -> float:
+    timer = Timer(lambda: converter.run(html))
+    number, __ = timer.autorange()
+    return min(timer.repeat(3, number)) / number * 1000
+
+
+def main():
+    pages = {
+        i.stem: i.read_text(encoding="utf-8")
+        for i in sorted(TESTS.joinpath("data", "converter").glob("*.html"))
+    }
+    pages["large_page"] = large_page()
+    print(f"{'page':<20}{'size':>10}{'legacy ms':>12}{'current ms':>12}")
+    for name, html in pages.items():
+        try:
+            legacy = f"{measure(LegacyConverter(), html):.3f}"
+        except Exception:
+            legacy = "error"
+        current = measure(Converter(), html)
+        print(f"{name:<20}{len(html.encode()):>10}{legacy:>12}{current:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""各入口模块导入耗时
+
+运行方式：python tests/benchmarks/importtime.py [重复次数]
+
+每次在新的解释器进程中使用 -X importtime 导入模块，取多次运行的最小值，
+并列出导入过程中加载的可选依赖
+"""
+
+from pathlib import Path
+from subprocess import run
+from sys import argv, executable
+
+ROOT = Path(__file__).parents[2]
+MODULES = (
+    "source.module",
+    "source.application",
+    "source.CLI",
+    "source.TUI",
+    "source.application.api",
+    "source.application.mcp",
+)
+# 仅部分运行模式需要的第三方依赖
+OPTIONAL = (
+    "rich",
+    "click",
+    "textual",
+    "fastapi",
+    "uvicorn",
+    "fastmcp",
+    "pydantic",
+    "websockets",
+    "pyperclip",
+    "rookiepy",
+    "aiosqlite",
+)
+
+
+def importtime(module: str) -> tuple[float, set[str]]:
+    """返回模块累计导入耗时（毫秒）与已加载的顶层包"""
+    result = run(
+        [executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total, packages = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        __, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        name = name.strip()
+        packages.add(name.partition(".")[0])
+        if name == module:
+            total = int(cumulative) / 1000
+    return total, packages
+
+
+def main():
+    repeat = int(argv[1]) if len(argv) > 1 else 5
+    print(f"{'module':<26}{'ms':>8}  optional dependencies")
+    for module in MODULES:
+        results = [importtime(module) for __ in range(repeat)]
+        total = min(i[0] for i in results)
+        loaded = ", ".join(i for i in OPTIONAL if i in results[0][1])
+        print(f"{module:<26}{total:>8.1f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
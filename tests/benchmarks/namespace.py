@@ -0,0 +1,60 @@
+"""Namespace 属性链读取耗时对比
+
+运行方式：python tests/benchmarks/namespace.py
+"""
+
+from pathlib import Path
+from sys import path
+from timeit import Timer
+
+TESTS = Path(__file__).parents[1]
+path[:0] = [str(TESTS.parent), str(TESTS)]
+
+from legacy import LegacyNamespace  # noqa: E402
+from source.application.explore import Explore  # noqa: E402
+from source.expansion import Converter, Namespace  # noqa: E402
+
+CHAINS = tuple(
+    dict.fromkeys(c for f in Explore().fields for c in (*f.paths, *f.requires))
+)
+
+
+def measure(function) -> float:
+    timer = Timer(function)
+    number, __ = timer.autorange()
+    return min(timer.repeat(3, number)) / number * 1_000_000
+
+
+def main():
+    note = Converter().run(
+        TESTS.joinpath("data", "converter", "image_note.html").read_text(
+            encoding="utf-8"
+        )
+    )
+    legacy, current = LegacyNamespace(note), Namespace(note)
+    explore = Explore()
+    cases = {
+        "construct": (
+            lambda: LegacyNamespace(note),
+            lambda: Namespace(note),
+        ),
+        "safe_extract x1": (
+            lambda: legacy.safe_extract("user.nickname"),
+            lambda: current.safe_extract("user.nickname"),
+        ),
+        f"safe_extract x{len(CHAINS)}": (
+            lambda: [legacy.safe_extract(i) for i in CHAINS],
+            lambda: [current.safe_extract(i) for i in CHAINS],
+        ),
+        "explore note": (
+            lambda: [LegacyNamespace(note).safe_extract(i) for i in CHAINS],
+            lambda: explore.run(Namespace(note)),
+        ),
+    }
+    print(f"{'case':<20}{'legacy us':>12}{'current us':>12}")
+    for name, (old, new) in cases.items():
+        print(f"{name:<20}{measure(old):>12.2f}{measure(new):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from asyncio import run
+from os import environ
+from tempfile import mkdtemp
+
+import pytest
+
+# 数据文件写入临时目录，避免测试影响程序目录
+environ.setdefault("XHS_VOLUME", mkdtemp(prefix="xhs-test-"))
+
+
+@pytest.fixture
+def settings() -> dict:
+    """Manager 参数，测试可在创建 Manager 前修改"""
+    return {
+        "path": "",
+        "folder": "Download",
+        "name_format": "作品ID",
+        "chunk": 64 * 1024,
+        "user_agent": "",
+        "cookie": "",
+        "proxy": None,
+        "timeout": 10,
+        "retry": 0,
+        "record_data": False,
+        "image_format": "PNG",
+        "image_download": True,
+        "video_download": True,
+        "live_download": False,
+        "download_record": False,
+        "folder_mode": False,
+        "author_archive": False,
+        "write_mtime": False,
+        "script_server": False,
+        "pipeline_workers": None,
+        "extra_fields": None,
+        "download_concurrency": None,
+        "segment_download": None,
+        "rate_limit": None,
+        "detail_cache": None,
+        "proxy_check": 0,
+        "cookie_pool": None,
+    }
+
+
+@pytest.fixture
+def manager(tmp_path, settings):
+    from rich import print
+
+    from source.expansion import Cleaner
+    from source.module import Manager
+
+    manager = Manager(
+        root=tmp_path,
+        cleaner=Cleaner(),
+        print_object=lambda: print,
+        **settings,
+    )
+    yield manager
+    run(manager.close())
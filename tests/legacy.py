@@ -0,0 +1,147 @@
+"""修改前的 Converter 与 Namespace 实现，用于对照测试与基准测试"""
+
+from copy import deepcopy
+from types import SimpleNamespace
+from typing import Union
+
+from lxml.etree import HTML
+from yaml import safe_load
+
+__all__ = ["LegacyConverter", "LegacyNamespace"]
+
+
+class LegacyConverter:
+    INITIAL_STATE = "//script/text()"
+    KEYS_LINK = (
+        "note",
+        "noteDetailMap",
+        "[-1]",
+        "note",
+    )
+
+    def run(self, content: str) -> dict:
+        return self._filter_object(self._convert_object(self._extract_object(content)))
+
+    def _extract_object(self, html: str) -> str:
+        if not html:
+            return ""
+        html_tree = HTML(html)
+        scripts = html_tree.xpath(self.INITIAL_STATE)
+        return self.get_script(scripts)
+
+    @staticmethod
+    def _convert_object(text: str) -> dict:
+        return safe_load(text.lstrip("window.__INITIAL_STATE__="))
+
+    @classmethod
+    def _filter_object(cls, data: dict) -> dict:
+        return cls.deep_get(data, cls.KEYS_LINK) or {}
+
+    @classmethod
+    def deep_get(cls, data: dict, keys: list | tuple, default=None):
+        if not data:
+            return default
+        try:
+            for key in keys:
+                if key.startswith("[") and key.endswith("]"):
+                    data = cls.safe_get(data, int(key[1:-1]))
+                else:
+                    data = data[key]
+            return data
+        except (KeyError, IndexError, ValueError, TypeError):
+            return default
+
+    @staticmethod
+    def safe_get(data: Union[dict, list, tuple, set], index: int):
+        if isinstance(data, dict):
+            return list(data.values())[index]
+        elif isinstance(data, list | tuple | set):
+            return data[index]
+        raise TypeError
+
+    @staticmethod
+    def get_script(scripts: list) -> str:
+        scripts.reverse()
+        for script in scripts:
+            if script.startswith("window.__INITIAL_STATE__"):
+                return script
+        return ""
+
+
+class LegacyNamespace:
+    def __init__(self, data: dict) -> None:
+        self.data: SimpleNamespace = self.generate_data_object(data)
+
+    @staticmethod
+    def generate_data_object(data: dict) -> SimpleNamespace:
+        def depth_conversion(element):
+            if isinstance(element, dict):
+                return SimpleNamespace(
+                    **{k: depth_conversion(v) for k, v in element.items()}
+                )
+            elif isinstance(element, list):
+                return [depth_conversion(item) for item in element]
+            else:
+                return element
+
+        return depth_conversion(data)
+
+    def safe_extract(
+        self,
+        attribute_chain: str,
+        default: Union[str, int, list, dict, SimpleNamespace] = "",
+    ):
+        return self.__safe_extract(self.data, attribute_chain, default)
+
+    @staticmethod
+    def __safe_extract(
+        data_object: SimpleNamespace,
+        attribute_chain: str,
+        default: Union[str, int, list, dict, SimpleNamespace] = "",
+    ):
+        data = deepcopy(data_object)
+        attributes = attribute_chain.split(".")
+        for attribute in attributes:
+            if "[" in attribute:
+                parts = attribute.split("[", 1)
+                attribute = parts[0]
+                index = parts[1][:-1]
+                try:
+                    index = int(index)
+                    data = getattr(data, attribute, None)[index]
+                except (IndexError, TypeError, ValueError):
+                    return default
+            else:
+                data = getattr(data, attribute, None)
+                if not data:
+                    return default
+        return data or default
+
+    @classmethod
+    def object_extract(
+        cls,
+        data_object: SimpleNamespace,
+        attribute_chain: str,
+        default: Union[str, int, list, dict, SimpleNamespace] = "",
+    ):
+        return cls.__safe_extract(
+            data_object,
+            attribute_chain,
+            default,
+        )
+
+    @property
+    def __dict__(self):
+        return self.convert_to_dict(self.data)
+
+    @classmethod
+    def convert_to_dict(cls, data) -> dict:
+        return {
+            key: cls.convert_to_dict(value)
+            if isinstance(value, SimpleNamespace)
+            else value
+            for key, value in vars(data).items()
+        }
+
+    def __bool__(self):
+        return bool(vars(self.data))
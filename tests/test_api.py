@@ -0,0 +1,145 @@
+from asyncio import CancelledError, Event, run, sleep, wait_for
+from json import dumps, loads
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from source.application.api import APIServer
+from source.application.app import XHS
+from source.application.pipeline import Pipeline
+
+
+class FakeCore:
+    """只实现流式接口所需方法，extract_stream 使用真实实现"""
+
+    jobs = object()
+    extract_stream = XHS.extract_stream
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.cancelled = []
+        self.pipeline = Pipeline(
+            self,
+            {"resolve": 3, "fetch": 3, "parse": 3, "download": 3, "record": 3},
+        )
+
+    def logging(self, *args, **kwargs):
+        pass
+
+    def show_statistics(self, statistics):
+        pass
+
+    def split_links(self, url):
+        return url.split()
+
+    async def resolve_link(self, url):
+        return url
+
+    async def _fetch_page(self, url, data, cookie, proxy, count):
+        try:
+            await sleep(self.delays[url])
+        except CancelledError:
+            self.cancelled.append(url)
+            raise
+        if url == "missing":
+            count.fail += 1
+            return url, {"message": "missing"}
+        return url, f"<html>{url}</html>"
+
+    async def _parse_page(self, html, id_, cache, count):
+        return {"作品ID": id_}
+
+    async def update_author_nickname(self, data):
+        pass
+
+    async def _download_files(self, data, download, index, count):
+        count.success += 1
+        return True, True
+
+    async def _record_files(self, data, downloaded, leader):
+        pass
+
+
+def app(core):
+    server = FastAPI()
+    APIServer(core).setup_routes(server)
+    return server
+
+
+async def post(core, url, **headers):
+    async with AsyncClient(
+        transport=ASGITransport(app(core)),
+        base_url="http://test",
+    ) as client:
+        return await client.post("/xhs/stream", json={"url": url}, headers=headers)
+
+
+def test_ndjson_in_completion_order():
+    core = FakeCore({"a": 0.05, "b": 0.01, "missing": 0.03})
+    response = run(post(core, "a b missing"))
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    items = [loads(i) for i in lines]
+    assert [i["data"] and i["data"]["作品ID"] for i in items] == ["b", None, "a"]
+    assert items[1]["message"] == "missing"
+    assert response.text.endswith("\n")
+
+
+def test_sse_framing():
+    core = FakeCore({"a": 0.02, "b": 0.01})
+    response = run(post(core, "a b", accept="text/event-stream"))
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = response.text.split("\n\n")
+    assert events.pop() == ""
+    assert all(i.startswith("data: ") and "\n" not in i for i in events)
+    assert [loads(i.removeprefix("data: "))["data"]["作品ID"] for i in events] == [
+        "b",
+        "a",
+    ]
+
+
+def test_disconnect_cancels_pipeline():
+    core = FakeCore({"a": 10, "b": 0.01, "c": 10})
+    body = dumps({"url": "a b c"}).encode()
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    received = Event()
+    chunks = []
+
+    async def receive():
+        if requests:
+            return requests.pop(0)
+        # 收到第一条数据后客户端断开连接
+        await received.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks.append(message["body"])
+            received.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/xhs/stream",
+        "raw_path": b"/xhs/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"test"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+
+    async def request():
+        await wait_for(app(core)(scope, receive, send), 1)
+        # 响应结束时未完成的作品已被取消，而不是留到事件循环关闭时
+        return sorted(core.cancelled)
+
+    assert run(request()) == ["a", "c"]
+    assert [loads(i)["data"]["作品ID"] for i in chunks] == ["b"]
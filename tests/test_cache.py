@@ -0,0 +1,107 @@
+from asyncio import gather, run, sleep
+from types import SimpleNamespace
+
+from source.module import DetailCache
+
+
+def cache(tmp_path, size=2, ttl=60, persist=False) -> DetailCache:
+    return DetailCache(
+        SimpleNamespace(
+            root=tmp_path,
+            detail_cache={"size": size, "ttl": ttl, "persist": persist},
+        )
+    )
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await sleep(0.01)
+        return {"作品ID": self.calls}
+
+
+def test_hit_and_miss(tmp_path):
+    async def main():
+        detail, loader = cache(tmp_path), Loader()
+        first = await detail.fetch("a", loader)
+        second = await detail.fetch("a", loader)
+        return detail, loader, first, second
+
+    detail, loader, first, second = run(main())
+    assert loader.calls == 1
+    assert first == second
+    assert first is not second
+    assert detail.statistics() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_concurrent_requests_share_one_load(tmp_path):
+    async def main():
+        detail, loader = cache(tmp_path), Loader()
+        results = await gather(*(detail.fetch("a", loader) for __ in range(5)))
+        return loader, results
+
+    loader, results = run(main())
+    assert loader.calls == 1
+    assert len({id(i) for i in results}) == 5
+
+
+def test_lru_eviction_ttl_and_store_predicate(tmp_path):
+    async def main():
+        detail, loader = cache(tmp_path, size=2), Loader()
+        for key in "abc":
+            await detail.fetch(key, loader)
+        evicted = list(detail.memory)
+        expired = cache(tmp_path, ttl=0.01)
+        await expired.set("a", {"作品ID": 1})
+        await sleep(0.02)
+        rejected = cache(tmp_path)
+        await rejected.fetch("a", Loader(), lambda data: False)
+        return evicted, await expired.get("a"), len(rejected.memory)
+
+    evicted, expired, rejected = run(main())
+    assert evicted == ["b", "c"]
+    assert expired is None
+    assert rejected == 0
+
+
+def test_persistent_tier_survives_restart(tmp_path):
+    async def main():
+        async with cache(tmp_path, persist=True) as first:
+            await first.fetch("a", Loader())
+        async with cache(tmp_path, persist=True) as second:
+            loader = Loader()
+            data = await second.fetch("a", loader)
+            return loader.calls, data, second.hits
+
+    calls, data, hits = run(main())
+    assert calls == 0
+    assert data == {"作品ID": 1}
+    assert hits == 1
+
+
+def test_lookup_and_store(tmp_path):
+    async def main():
+        detail = cache(tmp_path)
+        missing = await detail.lookup("a")
+        await detail.store("a", {"作品ID": "a"})
+        return missing, await detail.lookup("a"), detail.statistics()
+
+    missing, found, statistics = run(main())
+    assert missing is None
+    assert found == {"作品ID": "a"}
+    assert statistics["hits"] == statistics["misses"] == 1
+
+
+def test_disabled_cache_still_merges_requests(tmp_path):
+    async def main():
+        detail, loader = cache(tmp_path, size=0), Loader()
+        await gather(*(detail.fetch("a", loader) for __ in range(3)))
+        await detail.fetch("a", loader)
+        return detail, loader
+
+    detail, loader = run(main())
+    assert loader.calls == 2
+    assert detail.statistics() == {"hits": 0, "misses": 0, "size": 0}
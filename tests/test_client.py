@@ -0,0 +1,70 @@
+from asyncio import run
+
+from source.module import ClientPool
+
+PROXIES = [f"http://127.0.0.1:{i}" for i in range(1, 5)]
+
+
+def test_one_client_per_proxy_is_reused():
+    async def main():
+        pool = ClientPool({}, 5)
+        async with pool.client(PROXIES[0]) as first:
+            pass
+        async with pool.client(PROXIES[0]) as second:
+            pass
+        await pool.close()
+        return first, second
+
+    first, second = run(main())
+    assert first is second
+    assert first.is_closed
+
+
+def test_least_recently_used_clients_are_evicted_and_closed():
+    async def main():
+        pool = ClientPool({}, 5, size=2)
+        clients = []
+        for proxy in PROXIES:
+            async with pool.client(proxy) as client:
+                clients.append(client)
+        closed = [i.is_closed for i in clients]
+        remaining = list(pool.clients)
+        await pool.close()
+        return closed, remaining
+
+    closed, remaining = run(main())
+    assert remaining == PROXIES[2:]
+    assert closed == [True, True, False, False]
+
+
+def test_active_clients_are_not_evicted():
+    async def main():
+        pool = ClientPool({}, 5, size=1)
+        async with pool.client(PROXIES[0]) as active:
+            async with pool.client(PROXIES[1]):
+                pass
+            # 正在使用的客户端不会被关闭，超出上限的客户端在下次获取时关闭
+            state = active.is_closed, len(pool.clients)
+        async with pool.client(PROXIES[2]):
+            pass
+        remaining = list(pool.clients)
+        await pool.close()
+        return state, remaining
+
+    state, remaining = run(main())
+    assert state == (False, 2)
+    assert remaining == [PROXIES[2]]
+
+
+def test_idle_clients_are_closed():
+    async def main():
+        pool = ClientPool({}, 5, idle=0)
+        async with pool.client(PROXIES[0]) as idle:
+            pass
+        async with pool.client(PROXIES[1]):
+            pass
+        closed = idle.is_closed, list(pool.clients)
+        await pool.close()
+        return closed
+
+    assert run(main()) == (True, [PROXIES[1]])
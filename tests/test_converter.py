@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import pytest
+from yaml import YAMLError
+
+from legacy import LegacyConverter
+from source.expansion import Converter
+
+CORPUS = sorted(Path(__file__).parent.joinpath("data", "converter").glob("*.html"))
+# 旧实现无法解析的页面
+IMPROVED = {"unterminated"}
+
+
+@pytest.mark.parametrize("page", CORPUS, ids=lambda i: i.stem)
+def test_matches_legacy_converter(page: Path):
+    html = page.read_text(encoding="utf-8")
+    if page.stem in IMPROVED:
+        with pytest.raises(YAMLError):
+            LegacyConverter().run(html)
+        assert Converter().run(html)["noteId"]
+    else:
+        assert Converter().run(html) == LegacyConverter().run(html)
+
+
+def test_corpus_covers_notes():
+    results = {i.stem: Converter().run(i.read_text(encoding="utf-8")) for i in CORPUS}
+    assert results["image_note"]["noteId"] == "65a000000000000000000001"
+    assert results["video_note"]["type"] == "video"
+    assert results["repeated_state"]["title"] == "新"
+    assert results["non_json"]["title"] == "single"
+    assert results["missing_note"] == results["no_state"] == {}
+
+
+def test_undefined_outside_strings():
+    html = Path(__file__).parent.joinpath("data", "converter", "image_note.html")
+    note = Converter().run(html.read_text(encoding="utf-8"))
+    # JS 字面量 undefined 与 YAML 解析结果一致，字符串中的 undefined 保持不变
+    assert note["extra"] == "undefined"
+    assert "undefined 不应被替换" in note["desc"]
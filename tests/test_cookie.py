@@ -0,0 +1,140 @@
+from asyncio import run
+from time import sleep
+
+import pytest
+from httpx import AsyncClient, MockTransport, Response
+
+from source.application.app import XHS
+from source.application.request import Html
+from source.module import CookiePool
+
+URL = "https://www.xiaohongshu.com/explore/1"
+
+
+def quarantine(pool: CookiePool, *cookies: str) -> None:
+    for cookie in cookies:
+        pool.failure(cookie, trip=True)
+
+
+def test_lru_and_round_robin_selection():
+    lru = CookiePool(["a=1", "a=2", "a=3"])
+    assert [lru.select() for __ in range(4)] == ["a=1", "a=2", "a=3", "a=1"]
+    rotation = CookiePool(["a=1", "a=2", "a=3"], "round")
+    assert [rotation.select({"a=2"}) for __ in range(3)] == ["a=1", "a=3", "a=1"]
+
+
+def test_consecutive_failures_quarantine_cookie():
+    pool = CookiePool(["a=1", "a=2"])
+    assert not any(pool.failure("a=1") for __ in range(pool.THRESHOLD - 1))
+    assert pool.failure("a=1")
+    assert [pool.select() for __ in range(2)] == ["a=2", "a=2"]
+    # 成功请求清零连续失败次数
+    pool.failure("a=2")
+    pool.success("a=2")
+    assert pool.cookies["a=2"].failures == 0
+
+
+def test_probe_after_cooldown():
+    pool = CookiePool(["a=1"])
+    pool.COOLDOWN = 0.01
+    quarantine(pool, "a=1")
+    assert pool.select() is None
+    sleep(0.01)
+    assert pool.select() == "a=1"
+    # 试探失败后冷却时间加倍
+    assert pool.failure("a=1")
+    assert pool.cookies["a=1"].cooldown == 0.02
+    pool.success("a=1")
+    assert pool.statistics()[0]["status"] == "active"
+
+
+def test_statistics_hide_cookie_content():
+    pool = CookiePool(["web_session=secret"])
+    assert "secret" not in str(pool.statistics())
+
+
+@pytest.fixture
+def accounts(settings):
+    settings["cookie"] = ["a=1", "a=2"]
+    settings["rate_limit"] = {"rate": 1000, "burst": 1000}
+    return settings
+
+
+class Server:
+    def __init__(self, target: str = URL):
+        self.target = target
+        self.cookies = []
+
+    def __call__(self, request):
+        self.cookies.append(request.headers.get("cookie"))
+        if request.url.path != "/explore/1" or self.target == URL:
+            return Response(200, text="ok")
+        return Response(302, headers={"Location": self.target})
+
+
+def request(manager, server: Server) -> tuple[Html, str]:
+    html = Html(manager)
+
+    async def main():
+        # 与实际请求客户端相同，使用 Manager 提供的默认请求头
+        async with AsyncClient(
+            headers=manager.request_client.headers,
+            transport=MockTransport(server),
+            follow_redirects=True,
+        ) as html.client:
+            return await html.request_url(URL)
+
+    return html, run(main())
+
+
+def test_default_headers_do_not_carry_a_cookie(accounts, manager):
+    assert "cookie" not in manager.headers
+    assert "cookie" not in manager.request_client.headers
+    server = Server()
+    request(manager, server)
+    assert server.cookies == ["a=1"]
+
+
+def test_quarantined_cookies_are_not_sent(accounts, manager):
+    quarantine(manager.cookie_pool, "a=1", "a=2")
+    server = Server()
+    __, text = request(manager, server)
+    assert text == "ok"
+    assert server.cookies == [None]
+
+
+def test_deleted_note_does_not_count_against_cookie(accounts, manager):
+    request(manager, Server("https://www.xiaohongshu.com/404?source=note"))
+    assert manager.cookie_pool.cookies["a=1"].failures == 0
+
+
+def test_error_code_redirect_counts_against_cookie(accounts, manager):
+    request(manager, Server("https://www.xiaohongshu.com/404?errorCode=-510001"))
+    assert manager.cookie_pool.cookies["a=1"].failures == 1
+
+
+@pytest.fixture
+def merged(request, monkeypatch, settings):
+    cookies = {"chrome": "b=1", "edge": "b=2", "firefox": ""}
+    monkeypatch.setattr(
+        "source.application.app.BrowserCookie.get",
+        lambda value, domains: cookies[value],
+    )
+    settings["cookie"] = XHS.merge_cookie(*request.param)
+    return settings
+
+
+@pytest.mark.parametrize(
+    ("merged", "expected"),
+    [
+        (("chrome", "a=1"), ["b=1", "a=1"]),
+        ((["chrome", "edge"], ["a=1", "b=1"]), ["b=1", "b=2", "a=1"]),
+        # 未读取到浏览器 Cookie 时仅使用配置文件 Cookie
+        (("firefox", ["a=1", "a=2"]), ["a=1", "a=2"]),
+        ((None, "a=1"), ["a=1"]),
+        (("edge", None), ["b=2"]),
+    ],
+    indirect=["merged"],
+)
+def test_browser_cookies_merge_with_configured(merged, manager, expected):
+    assert list(manager.cookie_pool) == expected
@@ -0,0 +1,183 @@
+from asyncio import run, sleep
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient, MockTransport, Response
+
+from source.application.download import Download
+from source.translation import _
+
+MP4 = b"\x00\x00\x00\x18\x66\x74\x79\x70\x69\x73\x6f\x6d"
+
+
+class Server:
+    """按需返回文件内容的模拟服务器，支持范围请求"""
+
+    def __init__(self, body: bytes, ranges: bool = True, short: int = 0):
+        self.body = body
+        self.ranges = ranges
+        # 每个分段响应少返回的字节数，用于模拟分段不完整
+        self.short = short
+        self.requests: list[str] = []
+
+    def __call__(self, request):
+        value = request.headers.get("Range", "")
+        self.requests.append(value)
+        if not (self.ranges and value):
+            return Response(200, content=self.body)
+        start, __, end = value.removeprefix("bytes=").partition("-")
+        start, end = int(start), int(end or len(self.body) - 1)
+        if start >= len(self.body):
+            return Response(416)
+        content = self.body[start : end + 1]
+        if end - start + 1 < len(self.body):
+            content = content[: len(content) - self.short]
+        return Response(
+            206,
+            content=content,
+            headers={"Content-Range": f"bytes {start}-{end}/{len(self.body)}"},
+        )
+
+
+def download(manager, server: Server) -> Download:
+    download = Download(manager)
+    download.client = AsyncClient(transport=MockTransport(server))
+    return download
+
+
+def fetch(download: Download, name="note") -> tuple[Path, list]:
+    async def main():
+        try:
+            path, result = await download.run(
+                ["https://sns-video-bd.xhscdn.com/video"],
+                [None],
+                None,
+                "author",
+                name,
+                _("视频"),
+                0,
+            )
+            return path, result
+        finally:
+            await download.client.aclose()
+
+    return run(main())
+
+
+@pytest.fixture
+def segmented(settings):
+    settings["segment_download"] = {"count": 4, "threshold": 1024}
+    return settings
+
+
+def test_small_file_needs_single_request(manager):
+    server = Server(MP4 + b"x" * 100)
+    path, result = fetch(download(manager, server))
+    assert result == [True]
+    assert server.requests == ["bytes=0-"]
+    assert path.joinpath("note.mp4").read_bytes() == server.body
+
+
+def test_large_file_is_split_without_probe(segmented, manager):
+    server = Server(MP4 + bytes(range(256)) * 40)
+    path, result = fetch(download(manager, server))
+    assert result == [True]
+    # 首个请求的响应头提供文件大小，随后发送四个分段请求
+    assert server.requests[0] == "bytes=0-"
+    assert len(server.requests) == 5
+    assert path.joinpath("note.mp4").read_bytes() == server.body
+
+
+def test_incomplete_segment_is_rejected(segmented, manager):
+    server = Server(MP4 + bytes(range(256)) * 40, short=1)
+    path, result = fetch(download(manager, server))
+    assert result == [False]
+    assert not path.joinpath("note.mp4").exists()
+    assert not any(manager.temp.iterdir())
+
+
+def test_server_without_ranges_streams_whole_file(segmented, manager):
+    server = Server(MP4 + b"y" * 4096, ranges=False)
+    path, result = fetch(download(manager, server))
+    assert result == [True]
+    assert len(server.requests) == 1
+    assert path.joinpath("note.mp4").read_bytes() == server.body
+
+
+def test_interrupted_download_resumes_from_temp_file(manager):
+    server = Server(MP4 + b"z" * 4096)
+    # 模拟强制结束进程后残留的临时文件
+    manager.temp.joinpath("note.mp4").write_bytes(server.body[:1000])
+    path, result = fetch(download(manager, server))
+    assert result == [True]
+    assert server.requests == ["bytes=1000-"]
+    assert path.joinpath("note.mp4").read_bytes() == server.body
+
+
+@pytest.fixture
+def archived(settings):
+    settings["author_archive"] = True
+    settings["folder_mode"] = True
+    return settings
+
+
+def test_close_prunes_only_empty_folders_touched_this_session(archived, manager):
+    # 本次运行之前已存在的空文件夹不会在关闭时检查
+    unrelated = manager.folder.joinpath("unrelated")
+    unrelated.mkdir()
+    failed, __ = fetch(download(manager, lambda request: Response(404)), "failed")
+    done, result = fetch(download(manager, Server(MP4 + b"x" * 100)), "done")
+    assert result == [True]
+    assert failed.is_dir() and failed.parent == done.parent
+    run(manager.close())
+    assert not failed.exists()
+    assert done.joinpath("done.mp4").is_file()
+    assert unrelated.is_dir()
+    assert manager.directories == set()
+
+
+def test_close_prunes_nested_folders_deepest_first(archived, manager):
+    path, result = fetch(download(manager, lambda request: Response(404)))
+    assert result == [False]
+    # 作品文件夹删除后作者文件夹同样为空
+    assert path.parent.parent == manager.folder
+    run(manager.close())
+    assert not path.parent.exists()
+
+
+class WaitingPool:
+    """模拟等待代理恢复的代理池，记录等待期间占用的域名并发名额"""
+
+    def __init__(self, download: Download):
+        self.download = download
+        self.active = []
+
+    async def acquire(self, exclude=()):
+        await sleep(0.05)
+        limiter = self.download.scheduler.limiter(
+            "https://sns-video-bd.xhscdn.com/video"
+        )
+        self.active.append(limiter.active)
+        return None
+
+
+def test_proxy_wait_does_not_hold_host_slot(segmented, manager):
+    server = Server(MP4 + bytes(range(256)) * 40)
+    instance = download(manager, server)
+    instance.proxy_pool = pool = WaitingPool(instance)
+    released = []
+    limiter = instance.scheduler.limiter("https://sns-video-bd.xhscdn.com/video")
+    release = limiter.release
+
+    async def record(success, elapsed):
+        released.append(elapsed)
+        await release(success, elapsed)
+
+    limiter.release = record
+    path, result = fetch(instance)
+    assert result == [True]
+    # 完整文件请求在占用并发名额前获取代理
+    assert pool.active[0] == 0
+    assert len(pool.active) == len(released) == 5
+    # 完整文件请求与四个分段请求的耗时均不包含等待代理的时间
+    assert all(i < 0.05 for i in released)
@@ -0,0 +1,30 @@
+from source.expansion.file_folder import DirectoryIndex
+
+
+def test_index_reads_directory_once(tmp_path):
+    tmp_path.joinpath("a.mp4").touch()
+    index = DirectoryIndex()
+    assert index.exists(tmp_path, "a.mp4")
+    # 程序写入的文件通过 add 同步，无需重新读取目录
+    tmp_path.joinpath("b.mp4").touch()
+    assert not index.exists(tmp_path, "b.mp4")
+    index.add(tmp_path, "b.mp4")
+    assert index.exists(tmp_path, "b.mp4")
+
+
+def test_deleted_file_is_not_reported(tmp_path):
+    tmp_path.joinpath("a.mp4").touch()
+    index = DirectoryIndex()
+    assert index.exists(tmp_path, "a.mp4")
+    tmp_path.joinpath("a.mp4").unlink()
+    assert not index.exists(tmp_path, "a.mp4")
+    assert "a.mp4" not in index.names(tmp_path)
+
+
+def test_least_recently_used_directory_is_evicted(tmp_path):
+    index = DirectoryIndex(size=2)
+    folders = [tmp_path.joinpath(i) for i in "abc"]
+    for folder in folders:
+        folder.mkdir()
+        index.exists(folder, "file")
+    assert list(index.folders) == folders[1:]
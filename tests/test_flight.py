@@ -0,0 +1,116 @@
+from asyncio import Event, gather, run, sleep
+from types import SimpleNamespace
+
+from source.application.app import XHS
+from source.application.pipeline import Pipeline
+from source.module import SingleFlight
+
+
+class FakeCore:
+    def __init__(self, outcome: str):
+        self.flight = SingleFlight()
+        self.outcome = outcome
+        self.release = Event()
+        self.downloads = 0
+        self.records = []
+
+    async def _XHS__download_files(self, container, download, index):
+        self.downloads += 1
+        await self.release.wait()
+        return self.outcome
+
+    async def _XHS__add_record(self, id_):
+        self.records.append(id_)
+
+    async def save_data(self, data):
+        self.records.append(data["作品ID"])
+
+
+def count() -> SimpleNamespace:
+    return SimpleNamespace(all=0, success=0, fail=0, skip=0)
+
+
+def deduplicate(outcome: str):
+    async def main():
+        core = FakeCore(outcome)
+        counts = [count() for __ in range(3)]
+
+        async def caller(counter):
+            container = {"作品ID": "a"}
+            await XHS._record_files(
+                core,
+                container,
+                *await XHS._download_files(core, container, True, None, counter),
+            )
+
+        tasks = gather(*(caller(i) for i in counts))
+        await sleep(0)
+        core.release.set()
+        await tasks
+        return core, counts
+
+    return run(main())
+
+
+def test_joined_callers_share_statistics():
+    core, counts = deduplicate("success")
+    assert core.downloads == 1
+    assert all(i.success == 1 and i.fail == i.skip == 0 for i in counts)
+
+
+def test_joined_callers_record_once():
+    core, __ = deduplicate("success")
+    assert core.records == ["a", "a"]
+
+
+def test_shared_failure_and_skip():
+    for outcome in ("fail", "skip"):
+        core, counts = deduplicate(outcome)
+        assert all(getattr(i, outcome) == 1 for i in counts)
+        assert all(i.success == 0 for i in counts)
+        assert core.records == ["a"]
+
+
+class PageCore:
+    """只实现请求阶段所需方法，_fetch_page 使用真实实现"""
+
+    _fetch_page = XHS._fetch_page
+
+    def __init__(self):
+        self.flight = SingleFlight()
+        self.detail_cache = SimpleNamespace(lookup=self.lookup)
+        self.requests = 0
+
+    def logging(self, *args, **kwargs):
+        pass
+
+    async def lookup(self, id_):
+        return None
+
+    def _XHS__extract_link_id(self, url):
+        return url
+
+    async def _XHS__skip_detail(self, id_, data, count):
+        return None
+
+    async def resolve_link(self, url):
+        return url
+
+    async def _XHS__request_page(self, url, id_, cookie, proxy):
+        self.requests += 1
+        await sleep(0.01)
+        return {"message": "404", "error": "404"}
+
+
+def test_shared_page_failure_counts_every_link():
+    core = PageCore()
+    statistics = SimpleNamespace(all=3, success=0, fail=0, skip=0)
+    pipeline = Pipeline(
+        core,
+        {"resolve": 3, "fetch": 3, "parse": 1, "download": 1, "record": 1},
+    )
+    results = run(pipeline.run(["a", "a", "a"], True, None, True, statistics))
+    assert core.requests == 1
+    assert [i["error"] for i in results] == ["404"] * 3
+    assert statistics.fail == 3
+    assert statistics.all == statistics.success + statistics.fail + statistics.skip
@@ -0,0 +1,146 @@
+from asyncio import Event, run, sleep
+from types import SimpleNamespace
+
+from source.application.app import XHS
+from source.application.jobs import JobManager
+from source.module import BatchParams
+
+
+class FakeCore:
+    def __init__(self):
+        self.release = Event()
+
+    @staticmethod
+    def split_links(text: str) -> list[str]:
+        return text.split()
+
+    def logging(self, *args, **kwargs):
+        pass
+
+    async def resolve_link(self, url: str) -> str:
+        return url
+
+    async def _deal_extract(self, url, download, index, data, cookie, proxy, count):
+        await self.release.wait()
+        if url.endswith("fail"):
+            count.fail += 1
+            return {"作品ID": url}
+        if url.endswith("skip"):
+            count.skip += 1
+            return {"message": "skip"}
+        return {"作品ID": url}
+
+
+def test_job_completes_with_statistics():
+    async def main():
+        core = FakeCore()
+        manager = JobManager(core, workers=2)
+        job = manager.submit(BatchParams(urls=["a b-fail", "c-skip"]))
+        core.release.set()
+        await manager.queue.join()
+        await manager.close()
+        return job.dump()
+
+    data = run(main())
+    assert data.status == "completed"
+    assert data.statistics["success"] == 1
+    assert data.statistics["failed"] == 1
+    assert data.statistics["skipped"] == 1
+    assert data.finished
+
+
+def test_cancel_right_after_submit_counts_each_item_once():
+    async def main():
+        core = FakeCore()
+        manager = JobManager(core, workers=4)
+        job = manager.submit(BatchParams(urls=["a b c d e f"]))
+        # 后台任务已创建处理任务，但处理任务尚未开始执行
+        await sleep(0)
+        manager.cancel(job.id)
+        await manager.queue.join()
+        await manager.close()
+        return job
+
+    job = run(main())
+    assert job.remaining == 0
+    assert job.status == "cancelled"
+    assert job.dump().statistics["cancelled"] == 6
+
+
+def test_cancel_while_running():
+    async def main():
+        core = FakeCore()
+        manager = JobManager(core, workers=2)
+        job = manager.submit(BatchParams(urls=["a b c"]))
+        await sleep(0.01)
+        manager.cancel(job.id)
+        await manager.queue.join()
+        await manager.close()
+        return job
+
+    job = run(main())
+    assert job.remaining == 0
+    assert all(i.status == "cancelled" for i in job.items)
+
+
+def test_close_waits_for_running_items():
+    class SlowCore(FakeCore):
+        finished = False
+
+        async def _deal_extract(self, *args):
+            try:
+                await self.release.wait()
+            finally:
+                # 模拟任务取消时仍在写入的数据
+                await sleep(0.01)
+                self.finished = True
+
+    async def main():
+        core = SlowCore()
+        manager = JobManager(core, workers=1)
+        manager.submit(BatchParams(urls=["a"]))
+        await sleep(0.01)
+        await manager.close()
+        return core.finished
+
+    assert run(main())
+
+
+def test_core_closes_jobs_before_databases():
+    events = []
+
+    class Part:
+        def __init__(self, name):
+            self.name = name
+
+        async def close(self):
+            events.append(self.name)
+
+        async def __aexit__(self, *args):
+            events.append(self.name)
+
+    core = SimpleNamespace(
+        jobs=Part("jobs"),
+        manager=Part("manager"),
+        id_recorder=Part("id_recorder"),
+        data_recorder=Part("data_recorder"),
+        map_recorder=Part("map_recorder"),
+        detail_cache=Part("detail_cache"),
+        resolver=Part("resolver"),
+    )
+
+    async def stop_script_server():
+        events.append("script")
+
+    core.stop_script_server = stop_script_server
+    core.close_database = lambda: XHS.close_database(core)
+    run(XHS.close(core))
+    assert events[:2] == ["jobs", "script"]
+    assert events[-1] == "manager"
+    assert set(events[2:-1]) == {
+        "id_recorder",
+        "data_recorder",
+        "map_recorder",
+        "detail_cache",
+        "resolver",
+    }
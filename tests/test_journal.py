@@ -0,0 +1,141 @@
+from asyncio import run, sleep
+
+from source.application.app import XHS
+from source.application.pipeline import Pipeline
+from source.module import BatchJournal, SingleFlight
+
+URL = "https://www.xiaohongshu.com/explore/{0}"
+
+
+class FakePipeline:
+    """首次处理时链接包含 fail 的作品失败，重试时成功"""
+
+    def __init__(self):
+        self.attempts = {}
+
+    async def run(self, urls, download, index, data, count, callback, checkpoint):
+        for position, url in enumerate(urls):
+            self.attempts[url] = attempt = self.attempts.get(url, 0) + 1
+            if "fail" in url and attempt == 1:
+                count.fail += 1
+                await callback(position, {"message": "failed", "error": "404"})
+            else:
+                count.success += 1
+                await checkpoint(position, BatchJournal.DOWNLOADED)
+                await callback(position, {"作品ID": url})
+
+
+class FakeCore:
+    extract_batch = XHS.extract_batch
+    show_statistics = XHS.show_statistics
+    _XHS__read_batch = staticmethod(XHS._XHS__read_batch)
+    _XHS__deal_batch = XHS._XHS__deal_batch
+
+    def __init__(self):
+        self.pipeline = FakePipeline()
+        self.messages = []
+
+    def logging(self, text, *args, **kwargs):
+        self.messages.append(text)
+
+
+def links(tmp_path, *ids):
+    file = tmp_path.joinpath("links.txt")
+    file.write_text("\n".join(URL.format(i) for i in ids), encoding="utf-8")
+    return file
+
+
+def test_register_skips_finished_and_failed(tmp_path):
+    async def main():
+        file = links(tmp_path)
+        async with BatchJournal(file) as journal:
+            await journal.register(["a", "b", "c"])
+            await journal.update("a", journal.DOWNLOADED)
+            await journal.update("b", journal.FAILED, "error")
+            await journal.update("c", journal.PARSED)
+        async with BatchJournal(file) as journal:
+            return (
+                await journal.register(["a", "b", "c", "d"]),
+                await journal.select(journal.FAILED),
+                await journal.statistics(),
+            )
+
+    pending, failed, statistics = run(main())
+    assert pending == ["c", "d"]
+    assert failed == ["b"]
+    assert statistics["downloaded"] == statistics["failed"] == 1
+
+
+def test_batch_resumes_and_counts_retries_separately(tmp_path):
+    async def main():
+        file = links(tmp_path, "a", "b-fail", "c")
+        core = FakeCore()
+        async with BatchJournal(file) as journal:
+            await journal.register([URL.format("a")])
+            await journal.update(URL.format("a"), journal.DOWNLOADED)
+        await core.extract_batch(file)
+        async with BatchJournal(file) as journal:
+            return core, await journal.statistics()
+
+    core, progress = run(main())
+    # 上次运行已完成的作品不会再次处理
+    assert URL.format("a") not in core.pipeline.attempts
+    assert core.pipeline.attempts[URL.format("b-fail")] == 2
+    assert progress["downloaded"] == 3
+    assert progress["failed"] == 0
+    assert any("共处理 2 个作品，成功 1 个，失败 1 个" in i for i in core.messages)
+    assert any("重试 1 个作品，成功 1 个，失败 0 个" in i for i in core.messages)
+
+
+class SharedCore(FakeCore):
+    """使用真实流水线与下载去重，相同作品的不同链接共享同一次下载"""
+
+    _download_files = XHS._download_files
+    _record_files = XHS._record_files
+
+    def __init__(self):
+        super().__init__()
+        self.pipeline = Pipeline(
+            self,
+            {"resolve": 2, "fetch": 2, "parse": 2, "download": 2, "record": 2},
+        )
+        self.flight = SingleFlight()
+        self.downloads = 0
+        self.records = []
+
+    async def resolve_link(self, url):
+        return url
+
+    async def _fetch_page(self, url, data, cookie, proxy, count):
+        id_ = url.rsplit("/", 1)[-1].split("?")[0]
+        return id_, {"作品ID": id_}
+
+    async def update_author_nickname(self, data):
+        pass
+
+    async def _XHS__download_files(self, container, download, index):
+        self.downloads += 1
+        await sleep(0.01)
+        return "success"
+
+    async def _XHS__add_record(self, id_):
+        self.records.append(id_)
+
+    async def save_data(self, data):
+        pass
+
+
+def test_joined_download_is_marked_downloaded(tmp_path):
+    async def main():
+        file = links(tmp_path, "a", "a?xsec_token=x")
+        core = SharedCore()
+        await core.extract_batch(file)
+        async with BatchJournal(file) as journal:
+            return core, await journal.statistics()
+
+    core, progress = run(main())
+    assert core.downloads == 1
+    assert core.records == ["a"]
+    assert progress["downloaded"] == 2
+    assert progress["failed"] == 0
+    assert any("共处理 2 个作品，成功 2 个，失败 0 个" in i for i in core.messages)
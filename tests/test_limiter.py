@@ -0,0 +1,50 @@
+from asyncio import gather, run
+from time import monotonic
+
+from source.module import RATE_LIMIT, RateLimiter, TokenBucket
+
+
+def elapsed(function) -> float:
+    async def main():
+        start = monotonic()
+        await function()
+        return monotonic() - start
+
+    return run(main())
+
+
+def test_default_has_no_jitter():
+    assert RATE_LIMIT["jitter"] == 0
+
+
+def test_bucket_allows_burst_then_rate():
+    async def main():
+        bucket = TokenBucket(rate=20, burst=2)
+        await gather(*(bucket.acquire() for __ in range(6)))
+
+    # 前两个令牌立即可用，其余四个按每秒 20 个生成
+    assert 0.18 <= elapsed(main) < 0.4
+
+
+def test_identities_have_separate_buckets():
+    limiter = RateLimiter(rate=10, burst=1, jitter=0)
+    url = "https://www.xiaohongshu.com/explore/1"
+    duration = elapsed(
+        lambda: gather(
+            *(limiter.acquire(url, i) for i in ("a=1", "a=2", "a=3", "a=4")),
+            limiter.acquire(url, "a=1", "http://127.0.0.1:8080"),
+        )
+    )
+    assert duration < 0.05
+    assert len(limiter.buckets) == 5
+    # 以摘要代替 Cookie 原文作为键
+    assert all("a=1" not in key for key in limiter.buckets)
+
+
+def test_exempt_hosts_are_not_limited():
+    async def main():
+        limiter = RateLimiter(rate=1, burst=1, jitter=0, exempt=("xhslink.com",))
+        await gather(*(limiter.acquire("http://xhslink.com/a/b") for __ in range(5)))
+        return limiter
+
+    assert elapsed(main) < 0.05
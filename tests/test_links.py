@@ -0,0 +1,131 @@
+from asyncio import run, sleep
+from types import SimpleNamespace
+
+import pytest
+
+from source.application.app import XHS
+from source.expansion import LinkClassifier
+
+
+class FakeCore:
+    """只实现链接提取所需方法，短链接解析为 explore/{序号}，序号越小耗时越长"""
+
+    extract_links = XHS.extract_links
+
+    def __init__(self, concurrency: int):
+        self.resolver = SimpleNamespace(CONCURRENCY=concurrency)
+        self.running = 0
+        self.peak = 0
+        self.resolved = []
+
+    async def _XHS__resolve_short(self, url):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        number = int(url.rsplit("/", 1)[-1])
+        await sleep((10 - number) / 500)
+        self.running -= 1
+        self.resolved.append(url)
+        return LinkClassifier.classify(f"https://www.xiaohongshu.com/explore/{number}")
+
+
+def test_extract_links_deduplicates_in_first_seen_order():
+    core = FakeCore(8)
+    text = (
+        "https://www.xiaohongshu.com/explore/5 xhslink.com/a/1 "
+        "https://www.xiaohongshu.com/discovery/item/5?xsec_token=x "
+        "xhslink.com/a/1 xhslink.com/a/5 xhslink.com/a/2"
+    )
+    assert run(core.extract_links(text)) == [
+        "https://www.xiaohongshu.com/explore/5",
+        "https://www.xiaohongshu.com/explore/1",
+        "https://www.xiaohongshu.com/explore/2",
+    ]
+    # 重复的短链接只解析一次
+    assert sorted(core.resolved) == [
+        "https://xhslink.com/a/1",
+        "https://xhslink.com/a/2",
+        "https://xhslink.com/a/5",
+    ]
+
+
+def test_short_links_resolve_concurrently_within_limit():
+    core = FakeCore(3)
+    text = " ".join(f"xhslink.com/a/{i}" for i in range(8))
+    urls = run(core.extract_links(text))
+    assert urls == [f"https://www.xiaohongshu.com/explore/{i}" for i in range(8)]
+    assert core.peak == 3
+    # 解析完成顺序与输入顺序不同，结果仍保持输入顺序
+    assert core.resolved[0] != "https://xhslink.com/a/0"
+
+
+@pytest.mark.parametrize(
+    ("text", "kind", "url", "id_", "token"),
+    [
+        (
+            "https://www.xiaohongshu.com/explore/66a1b2c3000000000d00e1f2",
+            "link",
+            "https://www.xiaohongshu.com/explore/66a1b2c3000000000d00e1f2",
+            "66a1b2c3000000000d00e1f2",
+            "",
+        ),
+        (
+            "www.xiaohongshu.com/explore/abc?xsec_token=AB%3D&xsec_source=pc",
+            "link",
+            "https://www.xiaohongshu.com/explore/abc?xsec_token=AB%3D&xsec_source=pc",
+            "abc",
+            "AB=",
+        ),
+        (
+            "http://www.xiaohongshu.com/discovery/item/abc?app_platform=ios",
+            "share",
+            "http://www.xiaohongshu.com/discovery/item/abc?app_platform=ios",
+            "abc",
+            "",
+        ),
+        (
+            "https://www.xiaohongshu.com/user/profile/5f0e1d2c/abc?xsec_token=T",
+            "user",
+            "https://www.xiaohongshu.com/user/profile/5f0e1d2c/abc?xsec_token=T",
+            "abc",
+            "T",
+        ),
+        (
+            "xhslink.com/a/AbC123，复制本条信息",
+            "short",
+            "https://xhslink.com/a/AbC123",
+            "",
+            "",
+        ),
+        (
+            "http://xhslink.com/o/9xYz",
+            "short",
+            "http://xhslink.com/o/9xYz",
+            "",
+            "",
+        ),
+        ("https://www.xiaohongshu.com/user/profile/5f0e1d2c", None, None, None, None),
+        ("https://www.xiaohongshu.com/explore", None, None, None, None),
+        ("", None, None, None, None),
+    ],
+)
+def test_classify(text, kind, url, id_, token):
+    link = LinkClassifier.classify(text)
+    if kind is None:
+        assert link is None
+    else:
+        assert link == (kind, url, id_, token)
+
+
+def test_scan_mixed_text():
+    text = (
+        "看看这个 https://www.xiaohongshu.com/explore/a1 还有"
+        "http://xhslink.com/a/b2，以及 www.xiaohongshu.com/discovery/item/c3 "
+        "和 https://www.xiaohongshu.com/user/profile/u1/d4?xsec_token=t 结束"
+    )
+    assert [(i.kind, i.id) for i in LinkClassifier.scan(text)] == [
+        ("link", "a1"),
+        ("short", ""),
+        ("share", "c3"),
+        ("user", "d4"),
+    ]
+    assert [i.url for i in LinkClassifier.scan(text)][1] == "http://xhslink.com/a/b2"
@@ -0,0 +1,75 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from legacy import LegacyNamespace
+from source.application.explore import Explore
+from source.expansion import AccessorTree, Converter, Namespace
+
+NOTES = {
+    i.stem: note
+    for i in sorted(Path(__file__).parent.joinpath("data", "converter").glob("*.html"))
+    if (note := Converter().run(i.read_text(encoding="utf-8")))
+}
+CHAINS = (
+    *dict.fromkeys(c for f in Explore().fields for c in (*f.paths, *f.requires)),
+    "imageList",
+    "imageList[0].urlDefault",
+    "imageList[1].stream.h264[0].masterUrl",
+    "imageList[-1].width",
+    "imageList[9].urlDefault",
+    "imageList[x].urlDefault",
+    "video.consumer.originVideoKey",
+    "video.media.stream.h264[0].size",
+    "tagList[0]",
+    "interactInfo.commentCount",
+    "user",
+    "missing",
+    "missing.child",
+    "title[0]",
+    "time.value",
+)
+DEFAULTS = ("", None, [], 0)
+
+
+def plain(value):
+    """旧实现返回 SimpleNamespace，转换为字典后比较"""
+    if isinstance(value, SimpleNamespace):
+        return {k: plain(v) for k, v in vars(value).items()}
+    if isinstance(value, list):
+        return [plain(i) for i in value]
+    return value
+
+
+@pytest.mark.parametrize("name", NOTES)
+def test_safe_extract_matches_legacy(name):
+    current, legacy = Namespace(NOTES[name]), LegacyNamespace(NOTES[name])
+    for chain in CHAINS:
+        for default in DEFAULTS:
+            assert current.safe_extract(chain, default) == plain(
+                legacy.safe_extract(chain, default)
+            ), chain
+
+
+@pytest.mark.parametrize("name", NOTES)
+def test_object_extract_matches_legacy(name):
+    legacy = LegacyNamespace(NOTES[name])
+    images = Namespace(NOTES[name]).safe_extract("imageList", [])
+    legacy_images = legacy.safe_extract("imageList", [])
+    for chain in ("urlDefault", "stream.h264[0].masterUrl", "livePhoto", "x.y"):
+        assert [Namespace.object_extract(i, chain) for i in images] == [
+            plain(LegacyNamespace.object_extract(i, chain)) for i in legacy_images
+        ], chain
+
+
+def test_accessor_tree_matches_single_accessors():
+    note = NOTES["image_note"]
+    values = AccessorTree(CHAINS)(note)
+    for chain in CHAINS:
+        assert (values.get(chain) or None) == Namespace(note).safe_extract(chain, None)
+
+
+def test_does_not_copy_data():
+    note = NOTES["image_note"]
+    assert Namespace(note).safe_extract("imageList") is note["imageList"]
@@ -0,0 +1,177 @@
+from asyncio import CancelledError, all_tasks, current_task, run, sleep, wait_for
+from random import Random
+from types import SimpleNamespace
+
+from source.application.pipeline import Pipeline
+
+
+class FakeCore:
+    def __init__(self, cached=(), missing=()):
+        self.cached = set(cached)
+        self.missing = set(missing)
+        self.random = Random(0)
+        self.calls = {"fetch": [], "parse": [], "download": [], "record": []}
+
+    async def pause(self):
+        await sleep(self.random.random() / 100)
+
+    def logging(self, *args, **kwargs):
+        pass
+
+    async def resolve_link(self, url):
+        await self.pause()
+        return url
+
+    async def _fetch_page(self, url, data, cookie, proxy, count):
+        await self.pause()
+        self.calls["fetch"].append(url)
+        if url in self.missing:
+            count.fail += 1
+            return url, {"message": "missing"}
+        if url in self.cached:
+            return url, {"作品ID": url, "cached": True}
+        return url, f"<html>{url}</html>"
+
+    async def _parse_page(self, html, id_, cache, count):
+        self.calls["parse"].append(id_)
+        return {"作品ID": id_, "cached": False}
+
+    async def update_author_nickname(self, data):
+        pass
+
+    async def _download_files(self, data, download, index, count):
+        await self.pause()
+        self.calls["download"].append(data["作品ID"])
+        count.success += 1
+        return True, True
+
+    async def _record_files(self, data, downloaded, leader):
+        self.calls["record"].append(data["作品ID"])
+
+
+def count():
+    return SimpleNamespace(all=0, success=0, fail=0, skip=0)
+
+
+def test_results_keep_input_order():
+    links = [f"id{i}" for i in range(20)]
+    core = FakeCore()
+    pipeline = Pipeline(
+        core,
+        {"resolve": 4, "fetch": 3, "parse": 2, "download": 4, "record": 1},
+    )
+    results = run(pipeline.run(links, True, None, True, statistics := count()))
+    assert [i["作品ID"] for i in results] == links
+    assert sorted(core.calls["record"]) == sorted(links)
+    assert statistics.success == 20
+
+
+def test_cache_hit_skips_parse_and_failure_stops_early():
+    core = FakeCore(cached={"b"}, missing={"c"})
+    pipeline = Pipeline(
+        core,
+        {"resolve": 1, "fetch": 1, "parse": 1, "download": 1, "record": 1},
+    )
+    results = run(
+        pipeline.run(["a", "b", "c"], True, None, True, statistics := count())
+    )
+    assert results[0]["cached"] is False
+    assert results[1]["cached"] is True
+    assert results[2] == {"message": "missing"}
+    assert core.calls["parse"] == ["a"]
+    assert sorted(core.calls["download"]) == ["a", "b"]
+    assert statistics.fail == 1
+
+
+def test_checkpoint_and_callback():
+    core = FakeCore(missing={"b"})
+    pipeline = Pipeline(
+        core,
+        {"resolve": 2, "fetch": 2, "parse": 1, "download": 2, "record": 1},
+    )
+    checkpoints = []
+    received = {}
+
+    async def checkpoint(position, status):
+        checkpoints.append((position, status))
+
+    async def callback(position, result):
+        received[position] = result
+
+    results = run(
+        pipeline.run(
+            ["a", "b"],
+            True,
+            None,
+            True,
+            count(),
+            callback=callback,
+            checkpoint=checkpoint,
+        )
+    )
+    assert results == []
+    assert sorted(checkpoints) == [(0, "downloaded"), (0, "parsed")]
+    assert received[1] == {"message": "missing"}
+    assert received[0]["作品ID"] == "a"
+
+
+class SlowCore(FakeCore):
+    """按链接设置耗时的作品，记录被取消的作品"""
+
+    def __init__(self, delays):
+        super().__init__()
+        self.delays = delays
+        self.cancelled = []
+
+    async def _fetch_page(self, url, data, cookie, proxy, count):
+        try:
+            await sleep(self.delays[url])
+        except CancelledError:
+            self.cancelled.append(url)
+            raise
+        return await super()._fetch_page(url, data, cookie, proxy, count)
+
+
+def test_stream_yields_in_completion_order():
+    core = SlowCore({"a": 0.06, "b": 0.01, "c": 0.03})
+    pipeline = Pipeline(
+        core,
+        {"resolve": 3, "fetch": 3, "parse": 3, "download": 3, "record": 3},
+    )
+
+    async def collect():
+        return [
+            item
+            async for item in pipeline.stream(
+                ["a", "b", "c"], True, None, True, statistics
+            )
+        ]
+
+    statistics = count()
+    items = run(collect())
+    assert [position for position, __ in items] == [1, 2, 0]
+    assert [result["作品ID"] for __, result in items] == ["b", "c", "a"]
+    assert statistics.success == 3
+    assert core.cancelled == []
+
+
+def test_stream_early_exit_cancels_pending_items():
+    core = SlowCore({"a": 10, "b": 0.01, "c": 10})
+    pipeline = Pipeline(
+        core,
+        {"resolve": 3, "fetch": 3, "parse": 3, "download": 3, "record": 3},
+    )
+
+    async def first():
+        stream = pipeline.stream(["a", "b", "c"], True, None, True, count())
+        async for __, result in stream:
+            break
+        await stream.aclose()
+        # 让出事件循环，确认没有残留的后台任务
+        await sleep(0)
+        return result, [i for i in all_tasks() if i is not current_task()]
+
+    result, pending = run(wait_for(first(), 1))
+    assert result["作品ID"] == "b"
+    assert sorted(core.cancelled) == ["a", "c"]
+    assert pending == []
@@ -0,0 +1,173 @@
+from asyncio import gather, run, sleep
+from time import monotonic
+
+import pytest
+from httpx import AsyncClient, MockTransport, Response
+
+from source.module import ProxyPool
+
+A, B = "http://127.0.0.1:1", "http://127.0.0.1:2"
+
+
+def pool(*proxies, cooldown: float = 30) -> ProxyPool:
+    pool = ProxyPool(proxies or (A, B))
+    pool.COOLDOWN = cooldown
+    return pool
+
+
+def test_prefers_faster_proxy_and_avoids_excluded():
+    proxies = pool()
+    proxies.success(A, 0.1)
+    proxies.success(B, 0.5)
+    assert proxies.select() == A
+    assert proxies.select({A}) == B
+
+
+def test_consecutive_failures_open_the_breaker():
+    proxies = pool()
+    for __ in range(proxies.THRESHOLD - 1):
+        proxies.failure(A)
+    assert proxies.proxies[A].status == "closed"
+    proxies.failure(A)
+    assert proxies.proxies[A].status == "open"
+    assert proxies.select() == B
+    proxies.failure(B, trip=True)
+    assert proxies.select() is None
+
+
+def test_half_open_allows_single_probe():
+    async def main():
+        proxies = pool(A, cooldown=0.01)
+        proxies.failure(A, trip=True)
+        await sleep(0.02)
+        first, second = proxies.select(), proxies.select()
+        # 试探失败后冷却时间加倍
+        proxies.failure(A)
+        return proxies, first, second
+
+    proxies, first, second = run(main())
+    assert (first, second) == (A, None)
+    assert proxies.proxies[A].status == "open"
+    assert proxies.proxies[A].cooldown == 0.02
+
+
+def test_successful_probe_closes_the_breaker():
+    async def main():
+        proxies = pool(A, cooldown=0.01)
+        proxies.failure(A, trip=True)
+        await sleep(0.02)
+        proxies.success(proxies.select(), 0.1)
+        return proxies
+
+    state = run(main()).proxies[A]
+    assert state.status == "closed"
+    assert state.failures == 0
+
+
+def test_acquire_waits_instead_of_connecting_directly():
+    async def main():
+        proxies = pool(A, cooldown=0.05)
+        proxies.failure(A, trip=True)
+        start = monotonic()
+        proxy = await proxies.acquire()
+        return proxy, monotonic() - start
+
+    proxy, elapsed = run(main())
+    assert proxy == A
+    assert 0.04 <= elapsed < 0.5
+
+
+def test_waiters_resume_when_a_proxy_recovers():
+    async def main():
+        proxies = pool(cooldown=10)
+        proxies.failure(A, trip=True)
+        proxies.failure(B, trip=True)
+
+        async def recover():
+            await sleep(0.02)
+            # 例如后台代理测试成功
+            proxies.success(B, 0.1)
+
+        start = monotonic()
+        results = await gather(proxies.acquire(), proxies.acquire(), recover())
+        return results[:2], monotonic() - start
+
+    results, elapsed = run(main())
+    assert results == [B, B]
+    assert elapsed < 1
+
+
+def test_empty_pool_connects_directly():
+    assert run(ProxyPool(()).acquire()) is None
+
+
+class Checker:
+    """代替代理测试使用的客户端，healthy 控制测试结果"""
+
+    def __init__(self):
+        self.healthy = True
+        self.proxies = []
+
+    def __call__(self, proxy, **kwargs):
+        self.proxies.append(proxy)
+        return AsyncClient(transport=MockTransport(self.respond))
+
+    def respond(self, request):
+        return Response(200 if self.healthy else 503, request=request)
+
+
+@pytest.fixture
+def checker(monkeypatch, manager):
+    # Manager 创建后再替换，只影响代理测试
+    checker = Checker()
+    monkeypatch.setattr("source.module.manager.AsyncClient", checker)
+    return checker
+
+
+@pytest.fixture
+def proxied(settings):
+    settings["proxy"] = A
+    return settings
+
+
+def test_manager_init_does_not_check_proxy(proxied, manager):
+    assert manager.proxy_state == {}
+    assert manager.proxy_task is None
+    assert manager.proxy_pool.select() == A
+
+
+def test_background_check_records_state(proxied, checker, manager):
+    async def main():
+        manager.start_proxy_check()
+        # 启动测试后立即返回，测试在后台进行
+        assert manager.proxy_state == {}
+        await manager.proxy_task
+        healthy = manager.proxy_state[A]["healthy"]
+        checker.healthy = False
+        await manager.check_proxy()
+        return healthy
+
+    assert run(main()) is True
+    assert checker.proxies == [A, A]
+    assert manager.proxy_state[A]["healthy"] is False
+    # 测试失败的代理暂停使用
+    assert manager.proxy_pool.select() is None
+    statistics = manager.proxy_statistics()
+    assert statistics[0]["status"] == "open"
+    assert statistics[0]["check"]["healthy"] is False
+
+
+def test_periodic_check_stops_on_close(proxied, checker, manager):
+    async def main():
+        manager.proxy_check = 0.01
+        manager.start_proxy_check()
+        await sleep(0.05)
+        await manager.stop_proxy_check()
+        count = len(checker.proxies)
+        await sleep(0.03)
+        return count
+
+    count = run(main())
+    assert count >= 2
+    assert len(checker.proxies) == count
+    assert manager.proxy_task is None
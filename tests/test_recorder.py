@@ -0,0 +1,232 @@
+from asyncio import run, sleep
+from sqlite3 import connect
+
+import pytest
+
+from source.application.explore import Explore
+from source.module import DataRecorder, IDRecorder
+
+NOTE = {
+    "noteId": "1",
+    "title": "标题",
+    "type": "normal",
+    "imageList": [{}],
+    "tagList": [{"name": "a"}, {"name": "b"}],
+    "time": 1_700_000_000_000,
+    "user": {"nickname": "作者", "userId": "u"},
+    "ipLocation": "上海",
+    "interactInfo": {"likedCount": "10"},
+}
+
+
+def test_field_spec_and_extra_fields():
+    data = Explore({"IP归属地": "ipLocation", "话题": ["topics", "tagList"]}).run(NOTE)
+    assert data["作品ID"] == "1"
+    assert data["作品链接"] == "https://www.xiaohongshu.com/explore/1"
+    assert data["作品标签"] == "a b"
+    assert data["点赞数量"] == "10"
+    assert data["收藏数量"] == "-1"
+    assert data["时间戳"] == 1_700_000_000
+    assert data["IP归属地"] == "上海"
+    # 按顺序取第一个有效的属性链
+    assert data["话题"] == NOTE["tagList"]
+
+
+@pytest.fixture
+def reserved(settings):
+    settings["extra_fields"] = {
+        "IP归属地": "ipLocation",
+        "作品ID": "id",
+        "下载地址": "url",
+        "采集时间": "time",
+        "无效": 1,
+    }
+    return settings
+
+
+def test_reserved_extra_fields_are_rejected(reserved, manager):
+    assert manager.extra_fields == {"IP归属地": "ipLocation"}
+
+
+@pytest.fixture
+def recording(settings):
+    settings["record_data"] = True
+    settings["extra_fields"] = {"IP归属地": "ipLocation", "话题": "tagList"}
+    return settings
+
+
+def record(manager, data: dict) -> None:
+    async def main():
+        async with DataRecorder(manager) as recorder:
+            await recorder.add(**data)
+
+    run(main())
+
+
+def rows(manager) -> list[dict]:
+    with connect(manager.folder.joinpath("ExploreData.db")) as database:
+        cursor = database.execute("SELECT * FROM explore_data")
+        names = [i[0] for i in cursor.description]
+        return [dict(zip(names, i)) for i in cursor.fetchall()]
+
+
+def test_extra_fields_are_stored(recording, manager):
+    data = Explore(manager.extra_fields).run(NOTE)
+    data |= {"采集时间": "now", "下载地址": "a b", "动图地址": "NaN"}
+    record(manager, data)
+    (row,) = rows(manager)
+    assert row["IP归属地"] == "上海"
+    # 列表等非文本值以 JSON 格式保存
+    assert row["话题"] == '[{"name": "a"}, {"name": "b"}]'
+    assert row["下载地址"] == "a b"
+
+
+def test_existing_table_gains_extra_columns(recording, manager):
+    with connect(manager.folder.joinpath("ExploreData.db")) as database:
+        database.execute(
+            "CREATE TABLE explore_data ("
+            + ",".join(" ".join(i) for i in DataRecorder.DATA_TABLE)
+            + ")"
+        )
+    record(manager, {"作品ID": "1", "IP归属地": "上海"})
+    assert rows(manager)[0]["IP归属地"] == "上海"
+
+
+@pytest.fixture
+def history(settings):
+    settings["download_record"] = True
+    return settings
+
+
+def stored(manager) -> set[str]:
+    with connect(manager.root.joinpath("ExploreID.db")) as database:
+        return {i[0] for i in database.execute("SELECT ID FROM explore_id")}
+
+
+def test_rows_are_buffered_until_batch_size(history, manager):
+    async def main():
+        async with IDRecorder(manager) as recorder:
+            recorder.BATCH_SIZE = 3
+            await recorder.add("a")
+            await recorder.add("b")
+            before = stored(manager)
+            await recorder.add("c")
+            return before, stored(manager), await recorder.select("a")
+
+    before, after, selected = run(main())
+    assert before == set()
+    assert after == {"a", "b", "c"}
+    assert selected == ("a",)
+
+
+def test_rows_are_flushed_after_interval(history, manager):
+    async def main():
+        async with IDRecorder(manager) as recorder:
+            recorder.FLUSH_INTERVAL = 0.01
+            await recorder.add("a")
+            await sleep(0.05)
+            return stored(manager)
+
+    assert run(main()) == {"a"}
+
+
+def test_close_flushes_remaining_rows(history, manager):
+    async def main():
+        async with IDRecorder(manager) as recorder:
+            await recorder.add("a")
+            await recorder.add("b")
+            # 缓冲区中的记录同样视为存在
+            return stored(manager), await recorder.select("b")
+
+    before, selected = run(main())
+    assert before == set()
+    assert selected == ("b",)
+    assert stored(manager) == {"a", "b"}
+
+
+def test_database_uses_wal_and_normal_sync(history, manager):
+    async def main():
+        async with IDRecorder(manager) as recorder:
+            async with recorder.database.execute("PRAGMA journal_mode;") as cursor:
+                journal = await cursor.fetchone()
+            async with recorder.database.execute("PRAGMA synchronous;") as cursor:
+                synchronous = await cursor.fetchone()
+            return journal[0], synchronous[0]
+
+    # synchronous 为 1 表示 NORMAL
+    assert run(main()) == ("wal", 1)
+
+
+def test_add_after_close_is_refused(history, manager, capsys):
+    async def main():
+        recorder = IDRecorder(manager)
+        async with recorder:
+            pass
+        await recorder.add("a")
+        return recorder
+
+    recorder = run(main())
+    assert recorder.buffer == {}
+    assert stored(manager) == set()
+    assert "ExploreID.db" in capsys.readouterr().out
+
+
+def test_index_switches_to_bloom_filter(history, manager):
+    async def main():
+        async with IDRecorder(manager) as recorder:
+            recorder.INDEX_LIMIT = 3
+            for i in "abc":
+                await recorder.add(i)
+            exact = recorder.index is not None
+            await recorder.add("d")
+            return exact, recorder.index, recorder.bloom, await recorder.select("a")
+
+    exact, index, bloom, selected = run(main())
+    assert exact
+    assert index is None
+    assert all(i in bloom for i in "abcd")
+    assert selected == ("a",)
+
+
+def test_bloom_hit_is_confirmed_by_database(history, manager):
+    async def main():
+        async with IDRecorder(manager) as recorder:
+            recorder.INDEX_LIMIT = 1
+            await recorder.add("a")
+            await recorder.add("b")
+            await recorder.flush()
+            # 布隆过滤器无法删除元素，删除记录后需要查询数据库确认
+            await recorder.delete(["a"])
+            return (
+                "a" in recorder.bloom,
+                await recorder.select("a"),
+                await recorder.select("b"),
+                await recorder.select("z"),
+            )
+
+    assert run(main()) == (True, None, ("b",), None)
+
+
+def test_existing_records_load_into_bloom_filter(history, manager):
+    async def main():
+        async with IDRecorder(manager) as recorder:
+            for i in "abc":
+                await recorder.add(i)
+        recorder = IDRecorder(manager)
+        recorder.INDEX_LIMIT = 2
+        async with recorder:
+            return recorder.index, await recorder.select("c")
+
+    index, selected = run(main())
+    assert index is None
+    assert selected == ("c",)
+
+
+def test_delete_updates_exact_index(history, manager):
+    async def main():
+        async with IDRecorder(manager) as recorder:
+            await recorder.add("a")
+            await recorder.delete(["a"])
+            return recorder.index, await recorder.select("a")
+
+    assert run(main()) == (set(), None)
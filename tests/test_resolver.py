@@ -0,0 +1,116 @@
+from asyncio import run
+from time import time
+from contextlib import asynccontextmanager
+
+import pytest
+from httpx import AsyncClient, ConnectError, MockTransport, Response
+
+from source.application.resolver import ShortLinkResolver
+
+PROXY = "http://127.0.0.1:9"
+SHORT = "http://xhslink.com/a/b"
+TARGET = "https://www.xiaohongshu.com/explore/1"
+
+
+class FakeClientPool:
+    """记录使用的代理，返回模拟短链接重定向的客户端"""
+
+    def __init__(self, error: bool = False):
+        self.error = error
+        self.proxies = []
+
+    @asynccontextmanager
+    async def client(self, proxy: str):
+        self.proxies.append(proxy)
+        async with AsyncClient(transport=MockTransport(self.respond)) as client:
+            yield client
+
+    def respond(self, request):
+        if self.error:
+            raise ConnectError("", request=request)
+        return Response(302, headers={"Location": TARGET})
+
+
+@pytest.fixture
+def proxied(settings):
+    settings["proxy"] = PROXY
+    return settings
+
+
+def resolve(manager, client_pool: FakeClientPool) -> str:
+    resolver = ShortLinkResolver(manager)
+    resolver.client_pool = client_pool
+    return run(resolver.resolve(SHORT))
+
+
+def test_short_link_uses_proxy_pool(proxied, manager):
+    client_pool = FakeClientPool()
+    assert resolve(manager, client_pool) == TARGET
+    assert client_pool.proxies == [PROXY]
+    assert manager.proxy_pool.proxies[PROXY].latency > 0
+
+
+def test_proxy_failure_is_recorded(proxied, manager):
+    client_pool = FakeClientPool(error=True)
+    assert resolve(manager, client_pool) == ""
+    assert client_pool.proxies == [PROXY]
+    assert manager.proxy_pool.proxies[PROXY].failures == 1
+
+
+class Server:
+    """统计请求次数，location 为 None 时短链接无限重定向至新的短链接"""
+
+    def __init__(self, location: str | None = TARGET):
+        self.location = location
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(str(request.url))
+        return Response(
+            302,
+            headers={"Location": self.location or f"/{len(self.requests)}"},
+        )
+
+
+def direct(manager, server: Server, tmp_path) -> ShortLinkResolver:
+    resolver = ShortLinkResolver(manager)
+    resolver.file = tmp_path.joinpath("ShortLink.db")
+    resolver.client = AsyncClient(transport=MockTransport(server))
+    return resolver
+
+
+def test_cache_hit_within_ttl_and_refetch_after_expiry(
+    manager,
+    tmp_path,
+    monkeypatch,
+):
+    server = Server()
+
+    async def main():
+        async with direct(manager, server, tmp_path) as resolver:
+            assert await resolver.resolve(SHORT) == TARGET
+        # 新实例没有内存缓存，读取 SQLite 缓存
+        async with direct(manager, server, tmp_path) as resolver:
+            assert await resolver.resolve(SHORT) == TARGET
+            assert len(server.requests) == 1
+            now = time()
+            monkeypatch.setattr(
+                "source.application.resolver.time",
+                lambda: now + ShortLinkResolver.TTL + 1,
+            )
+            assert await resolver.resolve(SHORT) == TARGET
+            assert len(server.requests) == 2
+
+    run(main())
+
+
+def test_redirect_chain_stops_after_max_hops(manager, tmp_path):
+    server = Server(None)
+
+    async def main():
+        async with direct(manager, server, tmp_path) as resolver:
+            return await resolver.resolve(SHORT)
+
+    assert run(main()) == ""
+    assert len(server.requests) == ShortLinkResolver.HOPS
+    assert all(i.startswith("http://xhslink.com/") for i in server.requests)
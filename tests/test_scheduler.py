@@ -0,0 +1,94 @@
+from asyncio import gather, run, sleep
+
+import pytest
+from httpx import HTTPStatusError, Request, Response
+
+from source.module import AdaptiveLimiter, HostScheduler
+from source.module.scheduler import Slot
+
+
+def status_error(code: int) -> HTTPStatusError:
+    request = Request("GET", "https://example.com")
+    return HTTPStatusError(
+        "", request=request, response=Response(code, request=request)
+    )
+
+
+def test_additive_increase():
+    async def main():
+        limiter = AdaptiveLimiter(2, 1, 4, latency=5)
+        for __ in range(10):
+            await limiter.acquire()
+            await limiter.release(True, 0.1)
+        return limiter.limit
+
+    # 每次成功增加 1/limit，约 limit 次成功后并发数量加一
+    assert 3 < run(main()) <= 4
+
+
+def test_multiplicative_decrease_once_per_window():
+    async def main():
+        limiter = AdaptiveLimiter(8, 1, 16, latency=5)
+        for __ in range(3):
+            await limiter.acquire()
+            await limiter.release(False, 0.1)
+        return limiter.limit
+
+    assert run(main()) == 4
+
+
+def test_slow_response_decreases_and_limit_is_bounded():
+    async def main():
+        limiter = AdaptiveLimiter(1, 1, 2, latency=0)
+        await limiter.acquire()
+        await limiter.release(True, 0.1)
+        low = limiter.limit
+        for __ in range(10):
+            await limiter.acquire()
+            await limiter.release(True, 0)
+        return low, limiter.limit
+
+    assert run(main()) == (1, 2)
+
+
+def test_concurrency_never_exceeds_limit():
+    async def main():
+        scheduler = HostScheduler(2, 1, 2, latency=5)
+        active = peak = 0
+
+        async def task(url):
+            nonlocal active, peak
+            async with scheduler.slot(url):
+                active += 1
+                peak = max(peak, active)
+                await sleep(0.01)
+                active -= 1
+
+        await gather(*(task("https://a.example.com/file") for __ in range(8)))
+        same_host, peak = peak, 0
+        # 不同域名的并发数量互不影响
+        await gather(*(task(f"https://{i}.example.com/file") for i in "bcdefg"))
+        return same_host, peak
+
+    assert run(main()) == (2, 6)
+
+
+@pytest.mark.parametrize(
+    ("code", "success"),
+    [(404, True), (403, True), (429, False), (500, False), (503, False)],
+)
+def test_only_overload_responses_count_as_failures(code, success):
+    slot = Slot()
+    slot.fail(status_error(code))
+    assert slot.success is success
+
+
+def test_exception_inside_slot_is_a_failure():
+    async def main():
+        scheduler = HostScheduler(4, 1, 8, latency=5)
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot("https://a.example.com"):
+                raise RuntimeError
+        return scheduler.limiter("https://a.example.com").limit
+
+    assert run(main()) == 2
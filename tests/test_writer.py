@@ -0,0 +1,69 @@
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from source.module import FileWriter
+
+HEAD = b"\x00\x00\x00\x18\x66\x74\x79\x70\x69\x73\x6f\x6d"
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(1) as executor:
+        yield executor
+
+
+def write(executor, file, chunks, **kwargs) -> FileWriter:
+    async def main():
+        async with FileWriter(executor, file, 8, **kwargs) as writer:
+            for chunk in chunks:
+                await writer.write(chunk)
+        return writer
+
+    return run(main())
+
+
+def test_write_keeps_head_in_memory(executor, tmp_path):
+    file = tmp_path.joinpath("file")
+    writer = write(executor, file, [HEAD[:5], HEAD[5:], b"abc"])
+    assert file.read_bytes() == HEAD + b"abc"
+    assert writer.head.startswith(HEAD)
+    assert writer.written == len(HEAD) + 3
+
+
+def test_resume_appends_and_reads_head_from_file(executor, tmp_path):
+    file = tmp_path.joinpath("file")
+    file.write_bytes(HEAD)
+    writer = write(executor, file, [b"tail"], offset=len(HEAD))
+    assert file.read_bytes() == HEAD + b"tail"
+    assert writer.head.startswith(HEAD)
+    assert writer.written == 4
+
+
+def test_file_size_matches_received_bytes_after_interruption(executor, tmp_path):
+    file = tmp_path.joinpath("file")
+    sizes = []
+
+    async def main():
+        async with FileWriter(executor, file, 8) as writer:
+            await writer.write(b"x" * 10)
+            # 进程被强制结束时文件尚未关闭
+            sizes.append(file.stat().st_size)
+            raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        run(main())
+    # 文件大小即断点续传的起始位置，不会超过已接收的字节数
+    assert sizes[0] <= 10
+    assert file.stat().st_size == 10
+
+
+def test_segments_write_into_allocated_file(executor, tmp_path):
+    file = tmp_path.joinpath("file")
+    run(FileWriter.allocate(executor, file, 12))
+    assert file.stat().st_size == 12
+    for start, chunk in ((4, b"5678"), (0, b"1234"), (8, b"9abc")):
+        writer = write(executor, file, [chunk], offset=start, create=False)
+        assert writer.written == 4
+    assert file.read_bytes() == b"123456789abc"